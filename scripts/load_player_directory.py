@@ -1,34 +1,71 @@
 #!/usr/bin/env python3
 """
 Load NBA player directory data from nba_api and export to CSV for Postgres import.
+
+With --enrich-active, CommonPlayerInfo fills position, bio and current team
+for active players, fetched by --workers threads under one rate budget
+(shared with the service when NBA_SHARED_STATE is set). Each finished fetch
+is appended to a checkpoint file next to the output, so a run that dies
+part way resumes where it stopped; the checkpoint is removed once the CSV
+is written without failures.
+
+With --incremental, the CommonAllPlayers list is diffed against the existing
+CSV and only new players and players whose team changed are enriched; the
+rest keep their position and bio from the existing file.
 """
 
 import argparse
 import csv
-import time
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Shares the rate limiter and upstream record/replay with the service
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main", "python"))
+
+from lazy_import import lazy_module
+from rate_limiter import RateLimiter
+from shared_state import open_shared_state
+from upstream_replay import install_from_env
 
-from nba_api.stats.endpoints import commonallplayers, commonplayerinfo
+commonallplayers = lazy_module("nba_api.stats.endpoints.commonallplayers")
+commonplayerinfo = lazy_module("nba_api.stats.endpoints.commonplayerinfo")
 
 HEADSHOT_URL_TEMPLATE = "https://cdn.nba.com/headshots/nba/latest/260x190/{player_id}.png"
 MIN_REQUEST_INTERVAL = 0.6
+DEFAULT_WORKERS = 4
+ENRICH_ATTEMPTS = 3
+PROGRESS_EVERY = 50
+FIELDS = [
+    "nba_player_id",
+    "first_name",
+    "last_name",
+    "full_name",
+    "team_id",
+    "team_abbr",
+    "position",
+    "bio",
+    "headshot_url",
+    "active"
+]
 
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Export NBA player directory to CSV.")
     parser.add_argument("--season", default="2024-25", help="Season for roster status.")
     parser.add_argument("--output", default="data/player_directory.csv", help="CSV output path.")
     parser.add_argument("--include-inactive", action="store_true", help="Include inactive players.")
     parser.add_argument("--enrich-active", action="store_true",
                         help="Call commonplayerinfo for active players to fill position/bio.")
-    return parser.parse_args()
-
-
-def throttle(last_call_time):
-    now = time.time()
-    elapsed = now - last_call_time
-    if elapsed < MIN_REQUEST_INTERVAL:
-        time.sleep(MIN_REQUEST_INTERVAL - elapsed)
-    return time.time()
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only enrich active players that are new or changed team since the existing "
+                             "output; implies --enrich-active.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent commonplayerinfo calls.")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint path (default: <output>.checkpoint.jsonl).")
+    parser.add_argument("--restart", action="store_true", help="Discard an existing checkpoint.")
+    return parser.parse_args(argv)
 
 
 def build_bio(info_row, headers):
@@ -60,17 +97,8 @@ def build_bio(info_row, headers):
     return ", ".join(parts) if parts else ""
 
 
-def main():
-    args = parse_args()
-    last_call_time = 0
-
-    roster_status = 1 if not args.include_inactive else 0
-    last_call_time = throttle(last_call_time)
-    all_players = commonallplayers.CommonAllPlayers(
-        is_only_current_season=roster_status,
-        season=args.season
-    ).get_dict()
-
+def parse_players(all_players):
+    """CSV rows (dicts keyed by FIELDS) for a CommonAllPlayers response, not yet enriched."""
     headers = all_players["resultSets"][0]["headers"]
     rows = all_players["resultSets"][0]["rowSet"]
 
@@ -81,81 +109,294 @@ def main():
     idx_team_abbr = headers.index("TEAM_ABBREVIATION")
     idx_active = headers.index("ROSTERSTATUS")
 
-    with open(args.output, "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([
-            "nba_player_id",
-            "first_name",
-            "last_name",
-            "full_name",
-            "team_id",
-            "team_abbr",
-            "position",
-            "bio",
-            "headshot_url",
-            "active"
-        ])
-
-        for row in rows:
-            player_id = row[idx_id]
-            full_name = row[idx_full]
-            last_first = row[idx_last_first]
-            team_id = row[idx_team_id]
-            team_abbr = row[idx_team_abbr]
-            active_flag = row[idx_active]
-
-            if last_first and "," in last_first:
-                last_name, first_name = [part.strip() for part in last_first.split(",", 1)]
+    players = []
+    for row in rows:
+        player_id = row[idx_id]
+        full_name = row[idx_full]
+        last_first = row[idx_last_first]
+
+        if last_first and "," in last_first:
+            last_name, first_name = [part.strip() for part in last_first.split(",", 1)]
+        else:
+            parts = full_name.split()
+            first_name = parts[0] if parts else ""
+            last_name = parts[-1] if parts else ""
+
+        players.append({
+            "nba_player_id": player_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "full_name": full_name,
+            "team_id": row[idx_team_id],
+            "team_abbr": row[idx_team_abbr],
+            "position": "",
+            "bio": "",
+            "headshot_url": HEADSHOT_URL_TEMPLATE.format(player_id=player_id),
+            "active": bool(row[idx_active])
+        })
+    return players
+
+
+def fetch_player_info(player_id):
+    """Position, bio and current team of a player from CommonPlayerInfo, or None if it has no row."""
+    info = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_dict()
+    info_rs = info.get("resultSets", [{}])[0]
+    info_headers = info_rs.get("headers", [])
+    info_rows = info_rs.get("rowSet", [])
+    if not info_rows:
+        return None
+    info_row = info_rows[0]
+
+    enriched = {"bio": build_bio(info_row, info_headers)}
+    try:
+        pos_idx = info_headers.index("POSITION")
+        enriched["position"] = info_row[pos_idx]
+    except ValueError:
+        enriched["position"] = ""
+
+    try:
+        team_id_idx = info_headers.index("TEAM_ID")
+        team_abbr_idx = info_headers.index("TEAM_ABBREVIATION")
+        enriched["team_id"] = info_row[team_id_idx]
+        enriched["team_abbr"] = info_row[team_abbr_idx]
+    except ValueError:
+        pass
+    return enriched
+
+
+def _team_key(team_id):
+    """Team ids compare equal whether they came from the API or from the CSV."""
+    try:
+        return int(float(team_id or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class Checkpoint:
+    """
+    Append-only JSON lines of finished enrichments for one season. An entry
+    is reused only while the player's roster team is the one it was fetched
+    for. A torn last line (the process died mid-write) is ignored.
+    """
+
+    def __init__(self, path, season):
+        self.path = path
+        self.season = season
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return self
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        if not records or records[0].get("season") != self.season:
+            print(f"Discarding checkpoint {self.path}: not for season {self.season}")
+            self.remove()
+            return self
+        for record in records[1:]:
+            if "player_id" in record:
+                self.entries[record["player_id"]] = record
+        return self
+
+    def lookup(self, player):
+        record = self.entries.get(player["nba_player_id"])
+        if record is None or record.get("roster_team_id") != _team_key(player["team_id"]):
+            return None
+        return record
+
+    def record(self, player, enriched):
+        record = {"player_id": player["nba_player_id"], "roster_team_id": _team_key(player["team_id"]),
+                  "info": enriched}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                last = b""
+                if os.path.exists(self.path) and os.path.getsize(self.path):
+                    with open(self.path, "rb") as f:
+                        f.seek(-1, os.SEEK_END)
+                        last = f.read(1)
+                self._file = open(self.path, "a", encoding="utf-8")
+                if not last:
+                    self._file.write(json.dumps({"season": self.season}) + "\n")
+                elif last != b"\n":
+                    self._file.write("\n")  # end a torn line before appending
+            self._file.write(line)
+            self._file.flush()
+            self.entries[record["player_id"]] = record
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _apply(player, enriched):
+    if enriched:
+        player.update(enriched)
+
+
+def load_existing(path):
+    """Rows of an existing directory CSV keyed by player id, or {} if there is none."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return {int(row["nba_player_id"]): row for row in csv.DictReader(f) if row.get("nba_player_id")}
+    except FileNotFoundError:
+        return {}
+
+
+def plan_incremental(players, existing):
+    """
+    The active players to enrich: those missing from existing or listed there
+    with a different team. Players already in existing keep its position and
+    bio (until enriched again); those on the same team keep its team too.
+    """
+    to_enrich = []
+    new = moved = 0
+    for player in players:
+        previous = existing.get(player["nba_player_id"])
+        if previous is None:
+            new += 1
+        else:
+            player["position"] = previous.get("position") or ""
+            player["bio"] = previous.get("bio") or ""
+            if _team_key(previous.get("team_id")) == _team_key(player["team_id"]):
+                player["team_abbr"] = previous.get("team_abbr") or player["team_abbr"]
+                continue
+            moved += 1
+        if player["active"]:
+            to_enrich.append(player)
+    removed = len(existing.keys() - {player["nba_player_id"] for player in players})
+    print(f"Incremental: {new} new, {moved} changed team, {len(players) - new - moved} unchanged, "
+          f"{removed} no longer listed; enriching {len(to_enrich)}")
+    return to_enrich
+
+
+def enrich(players, limiter, checkpoint, workers=DEFAULT_WORKERS, fetch=fetch_player_info):
+    """
+    Fill position, bio and team of players in place, from the checkpoint
+    where it has them and otherwise from fetch() on a pool of workers under
+    limiter. Returns the players that could not be fetched.
+    """
+    pending = []
+    for player in players:
+        record = checkpoint.lookup(player)
+        if record is None:
+            pending.append(player)
+        else:
+            _apply(player, record["info"])
+    if len(pending) < len(players):
+        print(f"Resuming from {checkpoint.path}: {len(players) - len(pending)} of {len(players)} already enriched")
+
+    failed = []
+    done = [0]
+    done_lock = threading.Lock()
+
+    def fetch_one(player):
+        error = None
+        for _ in range(ENRICH_ATTEMPTS):
+            limiter.acquire("CommonPlayerInfo")
+            try:
+                enriched = fetch(player["nba_player_id"])
+                break
+            except Exception as exc:
+                error = exc
+        else:
+            print(f"Failed to enrich {player['full_name']} ({player['nba_player_id']}): {error}")
+            return False
+        checkpoint.record(player, enriched)
+        with done_lock:
+            done[0] += 1
+            if done[0] % PROGRESS_EVERY == 0:
+                print(f"Enriched {done[0]} of {len(pending)}")
+        return enriched
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="enrich")
+    try:
+        for player, enriched in zip(pending, pool.map(fetch_one, pending)):
+            if enriched is False:
+                failed.append(player)
             else:
-                parts = full_name.split()
-                first_name = parts[0] if parts else ""
-                last_name = parts[-1] if parts else ""
-
-            position = ""
-            bio = ""
-
-            if args.enrich_active and active_flag == 1:
-                last_call_time = throttle(last_call_time)
-                info = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_dict()
-                info_rs = info.get("resultSets", [{}])[0]
-                info_headers = info_rs.get("headers", [])
-                info_rows = info_rs.get("rowSet", [])
-                if info_rows:
-                    info_row = info_rows[0]
-
-                    try:
-                        pos_idx = info_headers.index("POSITION")
-                        position = info_row[pos_idx]
-                    except ValueError:
-                        position = ""
-
-                    bio = build_bio(info_row, info_headers)
-
-                    try:
-                        team_id_idx = info_headers.index("TEAM_ID")
-                        team_abbr_idx = info_headers.index("TEAM_ABBREVIATION")
-                        team_id = info_row[team_id_idx]
-                        team_abbr = info_row[team_abbr_idx]
-                    except ValueError:
-                        pass
-
-            headshot_url = HEADSHOT_URL_TEMPLATE.format(player_id=player_id)
-
-            writer.writerow([
-                player_id,
-                first_name,
-                last_name,
-                full_name,
-                team_id,
-                team_abbr,
-                position,
-                bio,
-                headshot_url,
-                bool(active_flag)
-            ])
-
-    print(f"Saved player directory to {args.output}")
+                _apply(player, enriched)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=True, cancel_futures=True)
+        checkpoint.close()
+        print(f"Interrupted; {len(checkpoint.entries)} enrichments kept in {checkpoint.path}, rerun to resume")
+        raise
+    pool.shutdown()
+    checkpoint.close()
+    return failed
+
+
+def write_csv(path, players):
+    """Write the directory to a temporary file and move it over path, so readers never see half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDS)
+        for player in players:
+            writer.writerow([player[field] for field in FIELDS])
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    limiter = RateLimiter(1.0 / MIN_REQUEST_INTERVAL, backend=open_shared_state())
+
+    roster_status = 1 if not args.include_inactive else 0
+    limiter.acquire("CommonAllPlayers")
+    all_players = commonallplayers.CommonAllPlayers(
+        is_only_current_season=roster_status,
+        season=args.season
+    ).get_dict()
+    players = parse_players(all_players)
+
+    failed = []
+    if args.enrich_active or args.incremental:
+        existing = load_existing(args.output) if args.incremental else {}
+        if args.incremental and not existing:
+            print(f"No existing {args.output}; enriching every active player")
+        if existing:
+            to_enrich = plan_incremental(players, existing)
+        else:
+            to_enrich = [player for player in players if player["active"]]
+
+        checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint.jsonl", args.season)
+        if args.restart:
+            checkpoint.remove()
+        checkpoint.load()
+        failed = enrich(to_enrich, limiter, checkpoint, workers=args.workers)
+        if failed:
+            print(f"{len(failed)} players could not be enriched; rerun to retry them "
+                  f"(checkpoint kept at {checkpoint.path})")
+        else:
+            checkpoint.remove()
+
+    write_csv(args.output, players)
+    stats = limiter.stats()
+    print(f"Saved player directory to {args.output} "
+          f"({stats['calls']} upstream calls, {stats['total_wait_seconds']}s throttled)")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    install_from_env()
+    sys.exit(main())
@@ -18,6 +18,14 @@ echo "Starting Python service..."
 python3 "$ROOT_DIR/src/main/python/nba_service.py" &
 PY_PID=$!
 
+# The service binds its port before warming caches; wait for liveness, not readiness
+for _ in $(seq 1 100); do
+  if curl -sf "http://localhost:5001/health" >/dev/null; then
+    break
+  fi
+  sleep 0.1
+done
+
 echo "Starting Spring Boot..."
 (cd "$ROOT_DIR" && ./mvnw spring-boot:run) &
 JAVA_PID=$!
@@ -3,14 +3,20 @@ package com.nba.nba_zone.playerdirectory;
 import com.fasterxml.jackson.databind.JsonNode;
 import com.fasterxml.jackson.databind.ObjectMapper;
 import org.springframework.beans.factory.annotation.Value;
+import org.springframework.http.HttpMethod;
+import org.springframework.http.MediaType;
 import org.springframework.http.ResponseEntity;
 import org.springframework.scheduling.annotation.Scheduled;
 import org.springframework.stereotype.Service;
 import org.springframework.web.client.RestTemplate;
 
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.nio.charset.StandardCharsets;
 import java.time.LocalDate;
 import java.time.format.DateTimeFormatter;
 import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.Map;
 
 @Service
@@ -48,7 +54,7 @@ public class PlayerStatsRefreshService {
                 return;
             }
 
-            boolean updated = false;
+            Map<Long, LocalDate> pendingGames = new LinkedHashMap<>();
             for (JsonNode gameNode : games) {
                 Long gameId = parseLong(gameNode.path("game_id").asText());
                 String dateText = gameNode.path("game_date").asText();
@@ -60,11 +66,10 @@ public class PlayerStatsRefreshService {
                     continue;
                 }
 
-                processGameStats(gameId, gameDate);
-                updated = true;
+                pendingGames.put(gameId, gameDate);
             }
 
-            if (updated) {
+            if (!pendingGames.isEmpty() && fetchBoxscores(pendingGames)) {
                 refreshTeamDifferentials();
             }
         } catch (Exception e) {
@@ -81,19 +86,47 @@ public class PlayerStatsRefreshService {
         }
     }
 
-    private void processGameStats(Long gameId, LocalDate gameDate) {
-        try {
-            String url = pythonServiceUrl + "/games/" + gameId + "/boxscore";
-            ResponseEntity<String> response = restTemplate.getForEntity(url, String.class);
-            if (response.getBody() == null || response.getBody().isEmpty()) {
-                return;
-            }
+    /**
+     * Fetches all pending box scores in one request. The Python service streams
+     * one JSON object per line as each game becomes available.
+     */
+    private boolean fetchBoxscores(Map<Long, LocalDate> pendingGames) {
+        String url = pythonServiceUrl + "/games/boxscores";
+        Map<String, Object> body = Map.of(
+                "game_ids", pendingGames.keySet().stream().map(String::valueOf).toList());
+        Boolean updated = restTemplate.execute(url, HttpMethod.POST,
+                request -> {
+                    request.getHeaders().setContentType(MediaType.APPLICATION_JSON);
+                    objectMapper.writeValue(request.getBody(), body);
+                },
+                response -> {
+                    boolean processed = false;
+                    try (BufferedReader reader = new BufferedReader(
+                            new InputStreamReader(response.getBody(), StandardCharsets.UTF_8))) {
+                        String line;
+                        while ((line = reader.readLine()) != null) {
+                            if (line.isBlank()) {
+                                continue;
+                            }
+                            JsonNode root = objectMapper.readTree(line);
+                            Long gameId = parseLong(root.path("game_id").asText());
+                            if (gameId == null || !pendingGames.containsKey(gameId) || root.hasNonNull("error")) {
+                                continue;
+                            }
+                            processed |= processGameStats(gameId, pendingGames.get(gameId), root);
+                        }
+                    }
+                    return processed;
+                });
+        return Boolean.TRUE.equals(updated);
+    }
 
-            JsonNode root = objectMapper.readTree(response.getBody());
+    private boolean processGameStats(Long gameId, LocalDate gameDate, JsonNode root) {
+        try {
             JsonNode players = root.path("players");
             JsonNode teams = root.path("teams");
             if (!players.isArray()) {
-                return;
+                return false;
             }
 
             Map<Long, TeamScoreInfo> teamScores = new HashMap<>();
@@ -160,8 +193,10 @@ public class PlayerStatsRefreshService {
             }
 
             gameUpdateLogRepository.save(new GameUpdateLog(gameId, gameDate));
+            return true;
         } catch (Exception e) {
             System.err.println("Failed to process game " + gameId + ": " + e.getMessage());
+            return false;
         }
     }
 
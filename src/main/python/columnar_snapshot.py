@@ -0,0 +1,356 @@
+"""
+Typed columnar snapshots of the data/*.csv files, memory-mapped on load.
+
+A snapshot is one file: a JSON header describing the columns followed by
+64-byte aligned column buffers.
+
+  numbers  NumPy arrays; integer columns use the smallest signed type that
+           holds them, float columns float32 when every value reads back
+           as written (stats with a few decimals do), else float64; NaN
+           for missing
+  bools    uint8
+  strings  dictionary encoded: int8/16/32 codes (-1 for missing, as in
+           pandas.Categorical) plus the distinct values as UTF-8 with an
+           offsets array
+
+load_snapshot() maps the file read-only and returns the columns as
+np.frombuffer views, so nothing is parsed or copied and only the pages a
+caller touches become resident. Dictionaries are decoded on first use.
+
+Snapshots are named after the SHA-256 of their source CSV, so a changed CSV
+gets a new snapshot and an unchanged one is never converted twice; see
+snapshot_for() and SnapshotSource. The service's player directory reads
+data/player_directory.csv this way.
+
+    python columnar_snapshot.py data/*.csv [--out-dir DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+
+from lazy_import import lazy_module
+from local_store import CACHE_DIR
+
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
+
+MAGIC = b'NBACOL1\0'
+ALIGNMENT = 64
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+SUFFIX = '.ncol'
+_BOOL_TEXT = {'true': True, 'false': False}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _code_dtype(size):
+    for dtype in ('i1', 'i2', 'i4'):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return 'i8'
+
+
+def _int_dtype(values):
+    low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for dtype in ('i1', 'i2', 'i4'):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return 'i8'
+
+
+def _float_dtype(values):
+    """'f4' if each value's shortest float32 form parses back to the same float64."""
+    narrow = values.astype('f4')
+    same = narrow.astype('U32').astype('f8') == values
+    return 'f4' if bool(np.all(same | np.isnan(values))) else 'f8'
+
+
+def _as_bool(series):
+    """The column as bools if every value is True/False (any case), else None."""
+    if series.dtype == bool:
+        return series.to_numpy()
+    if series.dtype != object or series.isna().any():
+        return None
+    lowered = series.astype(str).str.strip().str.lower()
+    if not lowered.isin(_BOOL_TEXT).all():
+        return None
+    return lowered.map(_BOOL_TEXT).to_numpy(dtype=bool)
+
+
+def _encode_column(series):
+    """(column header, [buffers]) for one DataFrame column."""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        values = series.to_numpy()
+        return {"kind": "number", "dtype": _int_dtype(values)}, [values.astype(_int_dtype(values))]
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy(dtype='f8')
+        dtype = _float_dtype(values)
+        return {"kind": "number", "dtype": dtype}, [values.astype(dtype)]
+    flags = _as_bool(series)
+    if flags is not None:
+        return {"kind": "bool", "dtype": "u1"}, [flags.astype('u1')]
+
+    categorical = pd.Categorical(series.astype(object).where(series.notna(), None))
+    values = [str(value).encode('utf-8') for value in categorical.categories]
+    offsets = np.zeros(len(values) + 1, dtype='u4')
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    dtype = _code_dtype(len(values))
+    header = {"kind": "dictionary", "dtype": dtype, "size": len(values)}
+    return header, [categorical.codes.astype(dtype), offsets, np.frombuffer(b''.join(values), dtype='u1')]
+
+
+def write_snapshot(csv_path, out_path, source_sha256=None):
+    """Convert csv_path into a snapshot at out_path (written atomically); returns out_path."""
+    frame = pd.read_csv(csv_path, keep_default_na=True)
+    columns, buffers = [], []
+    for name in frame.columns:
+        header, column_buffers = _encode_column(frame[name])
+        header["name"] = str(name)
+        columns.append(header)
+        buffers.append(column_buffers)
+
+    # Lay the buffers out after the header, each aligned
+    def layout(header_size):
+        offset = _align(len(MAGIC) + 4 + header_size)
+        for header, column_buffers in zip(columns, buffers):
+            header["buffers"] = []
+            for buffer in column_buffers:
+                header["buffers"].append([offset, int(buffer.nbytes)])
+                offset = _align(offset + buffer.nbytes)
+        return offset
+
+    meta = {
+        "source": os.path.basename(csv_path),
+        "source_sha256": source_sha256 or file_sha256(csv_path),
+        "rows": int(len(frame)),
+        "columns": columns
+    }
+    # Offsets are part of the header, so size it until it stops growing
+    header_size = 0
+    while True:
+        layout(header_size)
+        encoded = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+        if len(encoded) <= header_size:
+            break
+        header_size = len(encoded) + 64
+    encoded = encoded.ljust(header_size, b' ')
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(4, 'little'))
+        f.write(encoded)
+        for header, column_buffers in zip(columns, buffers):
+            for (offset, _), buffer in zip(header["buffers"], column_buffers):
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(np.ascontiguousarray(buffer).tobytes())
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class DictionaryColumn:
+    """Codes (a view into the snapshot) and their values, decoded on first use."""
+
+    __slots__ = ('codes', '_offsets', '_data', '_values')
+
+    def __init__(self, codes, offsets, data):
+        self.codes = codes
+        self._offsets = offsets
+        self._data = data
+        self._values = None
+
+    @property
+    def values(self):
+        if self._values is None:
+            data = self._data.tobytes()
+            bounds = self._offsets.tolist()
+            self._values = [data[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+        return self._values
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        code = int(self.codes[row])
+        return None if code < 0 else self.values[code]
+
+    def code_of(self, value):
+        """Code of value, or -1; compare against .codes to filter without decoding rows."""
+        try:
+            return self.values.index(value)
+        except ValueError:
+            return -1
+
+    def to_list(self):
+        values = self.values
+        return [None if code < 0 else values[code] for code in self.codes.tolist()]
+
+    def to_categorical(self):
+        return pd.Categorical.from_codes(self.codes, categories=self.values)
+
+
+class Snapshot:
+    """A mapped snapshot: snapshot[name] is an ndarray or a DictionaryColumn."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a columnar snapshot")
+        header_size = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 4], 'little')
+        start = len(MAGIC) + 4
+        meta = json.loads(self._mmap[start:start + header_size])
+        self.source = meta["source"]
+        self.source_sha256 = meta["source_sha256"]
+        self.rows = meta["rows"]
+        self._columns = {}
+        for header in meta["columns"]:
+            views = [np.frombuffer(self._mmap, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset)
+                     for (offset, size), dtype in zip(header["buffers"], self._buffer_dtypes(header))]
+            if header["kind"] == "dictionary":
+                self._columns[header["name"]] = DictionaryColumn(*views)
+            elif header["kind"] == "bool":
+                self._columns[header["name"]] = views[0].view(bool)
+            else:
+                self._columns[header["name"]] = views[0]
+
+    @staticmethod
+    def _buffer_dtypes(header):
+        if header["kind"] == "dictionary":
+            return (header["dtype"], 'u4', 'u1')
+        return (header["dtype"],)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __len__(self):
+        return self.rows
+
+    def nbytes(self):
+        return len(self._mmap)
+
+    def records(self):
+        """The rows as dicts, like csv.DictReader's but typed, with None for missing values."""
+        names = self.columns
+        columns = []
+        for name in names:
+            column = self._columns[name]
+            if isinstance(column, DictionaryColumn):
+                columns.append(column.to_list())
+            elif column.dtype.kind == 'f':
+                columns.append([None if value != value else value for value in column.tolist()])
+            else:
+                columns.append(column.tolist())
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def to_pandas(self):
+        """A DataFrame of the snapshot; number columns share memory with the mapping."""
+        data = {}
+        for name, column in self._columns.items():
+            data[name] = column.to_categorical() if isinstance(column, DictionaryColumn) else column
+        return pd.DataFrame(data, copy=False)
+
+
+def load_snapshot(path):
+    return Snapshot(path)
+
+
+def snapshot_path(csv_path, source_sha256, snapshot_dir=SNAPSHOT_DIR):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(snapshot_dir, f"{stem}-{source_sha256[:16]}{SUFFIX}")
+
+
+def snapshot_for(csv_path, snapshot_dir=SNAPSHOT_DIR, source_sha256=None):
+    """
+    The snapshot of csv_path's current contents, converting it first if no
+    snapshot of that content exists. Snapshots of older contents are removed.
+    """
+    source_sha256 = source_sha256 or file_sha256(csv_path)
+    path = snapshot_path(csv_path, source_sha256, snapshot_dir)
+    if not os.path.exists(path):
+        write_snapshot(csv_path, path, source_sha256)
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        for name in os.listdir(snapshot_dir):
+            old = os.path.join(snapshot_dir, name)
+            if name.startswith(f"{stem}-") and name.endswith(SUFFIX) and old != path:
+                try:
+                    os.remove(old)  # open mappings stay valid
+                except OSError:
+                    pass
+    return load_snapshot(path)
+
+
+class SnapshotSource:
+    """
+    The snapshot of one CSV, reloaded only when the CSV's content changes:
+    a changed size or mtime triggers a hash, and only a new hash a new
+    snapshot.
+    """
+
+    def __init__(self, csv_path, snapshot_dir=SNAPSHOT_DIR):
+        self.csv_path = csv_path
+        self.snapshot_dir = snapshot_dir
+        self._snapshot = None
+        self._stat = None
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self):
+        stat = os.stat(self.csv_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        snapshot = self._snapshot
+        if snapshot is not None and signature == self._stat:
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None and signature == self._stat:
+                return self._snapshot
+            digest = file_sha256(self.csv_path)
+            if self._snapshot is None or digest != self._snapshot.source_sha256:
+                self._snapshot = snapshot_for(self.csv_path, self.snapshot_dir, digest)
+                self.loads += 1
+            self._stat = signature
+            return self._snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert CSV files to columnar snapshots.")
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument("--out-dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args(argv)
+    for csv_path in args.csv:
+        snapshot = snapshot_for(csv_path, args.out_dir)
+        kinds = {}
+        for name in snapshot.columns:
+            column = snapshot[name]
+            kind = 'dictionary' if isinstance(column, DictionaryColumn) else str(column.dtype)
+            kinds[kind] = kinds.get(kind, 0) + 1
+        print(f"{csv_path}: {snapshot.rows} rows, {len(snapshot.columns)} columns {kinds}, "
+              f"{os.path.getsize(csv_path)} -> {snapshot.nbytes()} bytes ({snapshot.path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
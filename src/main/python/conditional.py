@@ -0,0 +1,150 @@
+"""
+Strong ETags, Last-Modified, 304 Not Modified and compression for the JSON routes.
+
+Every successful JSON GET response gets a content-hash ETag and a
+Last-Modified time (when that exact content was first served), and
+If-None-Match / If-Modified-Since are answered with 304. Bodies are then
+compressed if the client accepts it; a compressed representation carries
+its own ETag. Payloads built from cached values are wrapped in an
+EncodedPayload once per value, so serving them, or a 304 for them, costs
+no encode, no hash and no repeated compression.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from serializer import compress, dumps, negotiate_coding
+
+FIRST_SEEN_SIZE = 4096  # ETags whose first-served time is remembered
+MEMO_SIZE = 256  # cached values with a remembered EncodedPayload
+CACHE_CONTROL = 'no-cache'  # clients may store responses but must revalidate
+CONDITIONAL_HEADERS = frozenset(('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH'))
+
+
+def content_etag(body):
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class _FirstSeen:
+    """Bounded map of ETag -> when that content was first served."""
+
+    def __init__(self, size=FIRST_SEEN_SIZE):
+        self.size = size
+        self._times = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag):
+        with self._lock:
+            seen = self._times.get(etag)
+            if seen is None:
+                seen = int(time.time())
+                self._times[etag] = seen
+                if len(self._times) > self.size:
+                    self._times.popitem(last=False)
+            else:
+                self._times.move_to_end(etag)
+            return seen
+
+
+first_seen = _FirstSeen()
+
+
+class EncodedPayload:
+    """A JSON body encoded and hashed once, ready to be served repeatedly."""
+
+    __slots__ = ('body', 'etag', 'last_modified', '_compressed')
+
+    def __init__(self, value):
+        self.body = dumps(value)
+        self.etag = content_etag(self.body)
+        self.last_modified = first_seen.get(self.etag)
+        self._compressed = {}
+
+    def compressed(self, coding):
+        body = self._compressed.get(coding)
+        if body is None:
+            body = self._compressed[coding] = compress(self.body, coding)
+        return body
+
+    def response(self, status=200):
+        response = current_app.response_class(self.body, status=status, mimetype='application/json')
+        response.set_etag(self.etag)
+        response.last_modified = self.last_modified
+        response.encoded_payload = self
+        return response
+
+
+class PayloadMemo:
+    """
+    EncodedPayload per cached value (by identity), optionally of a view
+    derived from it. derive must be a module-level function so the key is
+    stable. Memoized values are kept alive until they fall out of the memo.
+    """
+
+    def __init__(self, size=MEMO_SIZE):
+        self.size = size
+        self._payloads = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encoded(self, value, derive=None):
+        key = (id(value), derive)
+        with self._lock:
+            entry = self._payloads.get(key)
+            if entry is not None and entry[0] is value:
+                self._payloads.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        payload = EncodedPayload(derive(value) if derive else value)
+        with self._lock:
+            self._payloads[key] = (value, payload)
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > self.size:
+                self._payloads.popitem(last=False)
+        return payload
+
+    def stats(self):
+        with self._lock:
+            return {"name": "payloads", "entries": len(self._payloads), "hits": self.hits, "misses": self.misses}
+
+
+payload_memo = PayloadMemo()
+
+
+def encoded(value, derive=None):
+    return payload_memo.encoded(value, derive)
+
+
+def init_conditional(app):
+    @app.after_request
+    def _conditional_get(response):
+        if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+            return response
+        if response.is_streamed or response.mimetype != 'application/json':
+            return response
+        payload = getattr(response, 'encoded_payload', None)
+        etag = response.get_etag()[0]
+        if etag is None:
+            etag = content_etag(response.get_data())
+            response.last_modified = first_seen.get(etag)
+
+        coding = negotiate_coding(request, response.content_length or 0)
+        response.set_etag(f"{etag}-{coding}" if coding else etag)
+        response.vary.add('Accept-Encoding')
+        if 'Cache-Control' not in response.headers:
+            response.headers['Cache-Control'] = CACHE_CONTROL
+
+        # make_conditional costs more than the rest of this hook; most requests carry no validator
+        if not CONDITIONAL_HEADERS.isdisjoint(request.environ):
+            response = response.make_conditional(request)
+        if coding and response.status_code == 200:
+            body = payload.compressed(coding) if payload is not None else compress(response.get_data(), coding)
+            response.set_data(body)
+            response.headers['Content-Encoding'] = coding
+        return response
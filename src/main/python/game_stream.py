@@ -0,0 +1,145 @@
+"""
+Server-Sent Events fan-out of live score changes.
+
+The broker keeps the last published state of every game and turns each new
+scoreboard snapshot into one event: a full snapshot when the set of games
+changes, otherwise only the fields that changed per game. Every event is
+encoded once and the same bytes are handed to all subscribers, so the cost
+of an update does not grow with the number of connected clients beyond
+waking them. Recent events are kept so reconnecting clients can resume from
+their Last-Event-ID instead of starting over.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import deque
+
+TRACKED_FIELDS = ('home_team_score', 'visitor_team_score', 'period', 'status')
+HISTORY_SIZE = 512  # events kept for Last-Event-ID resume
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+
+def _encode(event, event_id, payload):
+    data = json.dumps(payload, separators=(',', ':'))
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+
+class _Event:
+    """One published event; subscribers follow the next links without locking."""
+
+    __slots__ = ("seq", "chunk", "next", "ready")
+
+    def __init__(self, seq, chunk):
+        self.seq = seq
+        self.chunk = chunk
+        self.next = None
+        self.ready = threading.Event()  # set once next is linked
+
+
+class GameStream:
+    def __init__(self, history_size=HISTORY_SIZE, heartbeat=HEARTBEAT_SECONDS):
+        # Event ids are "<epoch>-<seq>" so ids from before a restart, or from another
+        # worker behind the same load balancer, are not mistaken for this stream's own.
+        # The random part keeps workers started in the same second apart.
+        self.epoch = f"{int(time.time())}{secrets.token_hex(4)}"
+        self.heartbeat = heartbeat
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=history_size)  # recent _Event nodes, oldest first
+        self._head = _Event(0, None)
+        self._games = None  # game_id -> game dict, in scoreboard order
+        self._snapshot_chunk = None
+        self.subscribers = 0
+        self.events = 0
+        self.publish_seconds = 0.0
+
+    def _event_id(self, seq):
+        return f"{self.epoch}-{seq}"
+
+    def publish(self, games):
+        """Record a new list of /games objects and emit what changed."""
+        started = time.perf_counter()
+        games_by_id = {g['id']: g for g in games}
+        with self._lock:
+            if self._games is None or list(games_by_id) != list(self._games):
+                event, payload = 'snapshot', {"games": games}
+            else:
+                changes = []
+                for game_id, game in games_by_id.items():
+                    previous = self._games[game_id]
+                    changed = {field: game.get(field) for field in TRACKED_FIELDS if game.get(field) != previous.get(field)}
+                    if changed:
+                        changed['id'] = game_id
+                        changes.append(changed)
+                if not changes:
+                    return None
+                event, payload = 'delta', {"games": changes}
+
+            previous = self._head
+            node = _Event(previous.seq + 1, _encode(event, self._event_id(previous.seq + 1), payload))
+            previous.next = node
+            self._head = node
+            self._games = games_by_id
+            self._snapshot_chunk = None
+            self._history.append(node)
+            self.events += 1
+            self.publish_seconds += time.perf_counter() - started
+        previous.ready.set()
+        return node.seq
+
+    def _snapshot_locked(self):
+        if self._snapshot_chunk is None:
+            self._snapshot_chunk = _encode(
+                'snapshot', self._event_id(self._head.seq), {"games": list((self._games or {}).values())}
+            )
+        return self._snapshot_chunk
+
+    def _resume_locked(self, seq):
+        """Encoded events after seq, or the full snapshot if they are no longer kept."""
+        head = self._head.seq
+        if seq == head:
+            return []
+        if seq is None or seq > head or not self._history or self._history[0].seq > seq + 1:
+            return [self._snapshot_locked()]
+        return [node.chunk for node in self._history if node.seq > seq]
+
+    def _parse_event_id(self, event_id):
+        if not event_id:
+            return None
+        epoch, _, seq = str(event_id).partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, last_event_id=None):
+        """Generator of SSE chunks for one client."""
+        with self._lock:
+            self.subscribers += 1
+            pending = self._resume_locked(self._parse_event_id(last_event_id))
+            node = self._head
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            for chunk in pending:
+                yield chunk
+            while True:
+                if node.next is None and not node.ready.wait(self.heartbeat):
+                    yield ": keepalive\n\n"
+                    continue
+                while node.next is not None:
+                    node = node.next
+                    yield node.chunk
+        finally:
+            with self._lock:
+                self.subscribers -= 1
+
+    def stats(self):
+        with self._lock:
+            seq = self._head.seq
+            return {
+                "subscribers": self.subscribers,
+                "events": self.events,
+                "last_event_id": self._event_id(seq) if seq else None,
+                "avg_publish_ms": round(self.publish_seconds / self.events * 1000, 3) if self.events else 0.0
+            }
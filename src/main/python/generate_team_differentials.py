@@ -2,19 +2,37 @@
 """
 Generate recent team point differentials (last N games) for My Team page.
 Uses NBA stats once during generation and writes static JSON for the frontend.
+
+Modes:
+  full         fetch every team's game log concurrently under a shared rate limiter
+  incremental  refetch only teams that played since the existing file was written
+  league       one league-wide LeagueGameFinder call, grouped per team in pandas;
+               teams it fails to cover are fetched as in full mode
 """
 
-from nba_api.stats.endpoints import leaguegamefinder, teamgamelog
-from nba_api.stats.static import teams
+from concurrent.futures import ThreadPoolExecutor
+from lazy_import import lazy_module
+from rate_limiter import RateLimiter
+from upstream_replay import install_from_env
+import argparse
 import json
 import os
 from datetime import datetime, timedelta
 
+# nba_service imports this module at startup; the heavy imports wait until a refresh runs
+leaguegamefinder = lazy_module('nba_api.stats.endpoints.leaguegamefinder')
+teamgamelog = lazy_module('nba_api.stats.endpoints.teamgamelog')
+teams = lazy_module('nba_api.stats.static.teams')
+np = lazy_module('numpy')
+
 SEASON = "2025-26"
 SEASON_TYPE = "Regular Season"
 GAMES_PER_TEAM = 10
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "resources", "static", "data")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "team_differentials.json")
+MIN_REQUEST_INTERVAL = 0.6
+DEFAULT_WORKERS = 4
+MODES = ("full", "incremental", "league")
 
 def _build_opponent_label(matchup):
     if not matchup:
@@ -63,7 +81,135 @@ def _build_games_from_frame(df):
         })
     return games
 
-def generate_team_differentials():
+def _build_games_by_team(df):
+    """
+    Vectorized _build_games_from_frame for a league-wide frame: the last
+    GAMES_PER_TEAM games of every team, keyed by TEAM_ID.
+    """
+    if df is None or df.empty or "TEAM_ID" not in df.columns or "PTS" not in df.columns:
+        return {}
+    if "GAME_DATE" in df.columns:
+        df = df.sort_values("GAME_DATE", ascending=False, kind="stable")
+    recent = df.groupby("TEAM_ID", sort=False).head(GAMES_PER_TEAM)
+
+    pts = recent["PTS"].to_numpy(dtype=float)
+    if "OPP_PTS" in recent.columns:
+        opp_pts = recent["OPP_PTS"].to_numpy(dtype=float)
+    elif "PLUS_MINUS" in recent.columns:
+        opp_pts = pts - recent["PLUS_MINUS"].to_numpy(dtype=float)
+    else:
+        return {}
+    valid = ~(np.isnan(pts) | np.isnan(opp_pts))
+    recent = recent[valid]
+    pts = pts[valid]
+    opp_pts = opp_pts[valid]
+
+    matchups = recent["MATCHUP"] if "MATCHUP" in recent.columns else None
+    labels = {m: _build_opponent_label(m) for m in matchups.unique()} if matchups is not None else {}
+    games = {
+        "date": recent["GAME_DATE"].tolist() if "GAME_DATE" in recent.columns else [None] * len(recent),
+        "opponent": matchups.map(labels).tolist() if matchups is not None else [""] * len(recent),
+        "diff": np.round(pts - opp_pts).astype(int).tolist(),
+        "pointsFor": np.round(pts).astype(int).tolist(),
+        "pointsAgainst": np.round(opp_pts).astype(int).tolist(),
+        "win": (recent["WL"] == "W").tolist() if "WL" in recent.columns else [False] * len(recent)
+    }
+
+    by_team = {}
+    keys = list(games)
+    for team_id, *values in zip(recent["TEAM_ID"].tolist(), *(games[k] for k in keys)):
+        by_team.setdefault(int(team_id), []).append(dict(zip(keys, values)))
+    return by_team
+
+def _fetch_league_games(limiter):
+    limiter.acquire("LeagueGameFinder")
+    finder = leaguegamefinder.LeagueGameFinder(
+        season_nullable=SEASON,
+        season_type_nullable=SEASON_TYPE,
+        league_id_nullable="00"
+    )
+    return _build_games_by_team(finder.get_data_frames()[0])
+
+def _fetch_team_games(team, start_date, end_date, limiter):
+    team_id = team.get("id")
+    abbr = team.get("abbreviation")
+
+    games = []
+    try:
+        limiter.acquire("TeamGameLog")
+        log = teamgamelog.TeamGameLog(
+            team_id=team_id,
+            season=SEASON,
+            season_type_all_star=SEASON_TYPE
+        )
+        df = log.get_data_frames()[0]
+        games = _build_games_from_frame(df)
+    except Exception as exc:
+        print(f"Failed to fetch game log for {abbr}: {exc}")
+
+    if not games:
+        try:
+            limiter.acquire("LeagueGameFinder")
+            finder = leaguegamefinder.LeagueGameFinder(
+                team_id_nullable=team_id,
+                season_nullable=SEASON,
+                season_type_nullable=SEASON_TYPE,
+                league_id_nullable="00",
+                date_from_nullable=start_date.strftime('%m/%d/%Y'),
+                date_to_nullable=end_date.strftime('%m/%d/%Y')
+            )
+            df = finder.get_data_frames()[0]
+            games = _build_games_from_frame(df)
+        except Exception as exc:
+            print(f"Failed to fetch league game finder data for {abbr}: {exc}")
+
+    return {
+        "teamId": team_id,
+        "teamName": team.get("full_name"),
+        "games": games
+    }
+
+def _load_existing():
+    try:
+        with open(OUTPUT_FILE) as f:
+            existing = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if existing.get("season") != SEASON or existing.get("gamesPerTeam") != GAMES_PER_TEAM:
+        return None
+    return existing
+
+def _existing_timestamp(existing):
+    last_updated = existing.get("lastUpdated")
+    if last_updated:
+        try:
+            return datetime.fromisoformat(last_updated)
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(OUTPUT_FILE))
+
+def _teams_played_since(since, limiter):
+    """Team ids with a game on or after since's date, from one league-wide call."""
+    limiter.acquire("LeagueGameFinder")
+    finder = leaguegamefinder.LeagueGameFinder(
+        season_nullable=SEASON,
+        season_type_nullable=SEASON_TYPE,
+        league_id_nullable="00",
+        date_from_nullable=since.strftime('%m/%d/%Y')
+    )
+    df = finder.get_data_frames()[0]
+    if df.empty or "TEAM_ID" not in df.columns:
+        return set()
+    return {int(team_id) for team_id in df["TEAM_ID"].unique()}
+
+def generate_team_differentials(mode="full", workers=DEFAULT_WORKERS, limiter=None):
+    """
+    Write team_differentials.json and return its path. See the module
+    docstring for the available modes.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+    limiter = limiter or RateLimiter(1.0 / MIN_REQUEST_INTERVAL)
     all_teams = teams.get_teams()
     end_date = datetime.now()
     start_date = end_date - timedelta(days=60)
@@ -71,46 +217,47 @@ def generate_team_differentials():
         "season": SEASON,
         "seasonType": SEASON_TYPE,
         "gamesPerTeam": GAMES_PER_TEAM,
+        "lastUpdated": end_date.isoformat(timespec="seconds"),
         "teams": {}
     }
 
-    for team in all_teams:
-        team_id = team.get("id")
-        abbr = team.get("abbreviation")
-        name = team.get("full_name")
-
-        games = []
+    to_fetch = all_teams
+    existing = _load_existing() if mode == "incremental" else None
+    if mode == "league":
         try:
-            log = teamgamelog.TeamGameLog(
-                team_id=team_id,
-                season=SEASON,
-                season_type_all_star=SEASON_TYPE
-            )
-            df = log.get_data_frames()[0]
-            games = _build_games_from_frame(df)
+            by_team = _fetch_league_games(limiter)
         except Exception as exc:
-            print(f"Failed to fetch game log for {abbr}: {exc}")
-
-        if not games:
-            try:
-                finder = leaguegamefinder.LeagueGameFinder(
-                    team_id_nullable=team_id,
-                    season_nullable=SEASON,
-                    season_type_nullable=SEASON_TYPE,
-                    league_id_nullable="00",
-                    date_from_nullable=start_date.strftime('%m/%d/%Y'),
-                    date_to_nullable=end_date.strftime('%m/%d/%Y')
-                )
-                df = finder.get_data_frames()[0]
-                games = _build_games_from_frame(df)
-            except Exception as exc:
-                print(f"Failed to fetch league game finder data for {abbr}: {exc}")
-
-        output["teams"][abbr] = {
-            "teamId": team_id,
-            "teamName": name,
-            "games": games
-        }
+            print(f"League-wide game finder failed, fetching teams one by one: {exc}")
+            by_team = {}
+        # Teams the league-wide call did not cover fall back to the per-team fetch
+        to_fetch = [team for team in all_teams if not by_team.get(team.get("id"))]
+        for team in all_teams:
+            if team not in to_fetch:
+                output["teams"][team.get("abbreviation")] = {
+                    "teamId": team.get("id"),
+                    "teamName": team.get("full_name"),
+                    "games": by_team[team.get("id")]
+                }
+    elif existing:
+        played = _teams_played_since(_existing_timestamp(existing), limiter)
+        to_fetch = []
+        for team in all_teams:
+            previous = existing["teams"].get(team.get("abbreviation"))
+            if previous is None or team.get("id") in played:
+                to_fetch.append(team)
+            else:
+                output["teams"][team.get("abbreviation")] = previous
+        print(f"Incremental refresh: {len(to_fetch)} of {len(all_teams)} teams played since last update")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(lambda team: _fetch_team_games(team, start_date, end_date, limiter), to_fetch)
+        for team, team_data in zip(to_fetch, results):
+            output["teams"][team.get("abbreviation")] = team_data
+
+    # Keep the file in the league's team order regardless of which teams were refreshed
+    output["teams"] = {
+        team.get("abbreviation"): output["teams"][team.get("abbreviation")] for team in all_teams
+    }
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
@@ -119,5 +266,15 @@ def generate_team_differentials():
     print(f"Saved differentials to {OUTPUT_FILE}")
     return OUTPUT_FILE
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate recent team point differentials.")
+    parser.add_argument("--mode", choices=MODES, default="full",
+                        help="full: every team; incremental: teams that played since the last run; "
+                             "league: one league-wide call.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent team fetches.")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    generate_team_differentials()
+    install_from_env()
+    args = parse_args()
+    generate_team_differentials(mode=args.mode, workers=args.workers)
@@ -2,11 +2,24 @@
 """
 Generate NBA team stats JSON data for the My Team page.
 This script fetches live data from the NBA API and saves it as static JSON.
+
+Teams are processed by a small worker pool sharing one rate limiter. Each
+finished team is checkpointed, so an interrupted run picks up where it
+stopped; checkpoints are cleared once the output file has been written and
+ignored once older than CHECKPOINT_MAX_AGE. A team whose games, roster or
+player stats could not be fetched is written with what did load, is not
+checkpointed and fails the run, so a rerun retries it.
 """
 
 from nba_api.stats.endpoints import leaguegamefinder, commonteamroster, teamplayerdashboard
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from local_store import CACHE_DIR
+from rate_limiter import RateLimiter
+from upstream_replay import install_from_env
+import argparse
 import json
 import os
+import threading
 import time
 
 # All 30 NBA teams with their IDs
@@ -22,153 +35,159 @@ NBA_TEAMS = {
 }
 
 SEASON = '2024-25'
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources', 'static', 'data')
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, 'team_stats_checkpoint')
+CHECKPOINT_MAX_AGE = 12 * 60 * 60  # resume the same nightly run, never an older one
+MIN_REQUEST_INTERVAL = 0.5
+DEFAULT_WORKERS = 4
+STAGES = ('games', 'roster', 'player_stats', 'merge')
 
-def get_recent_games(team_id, limit=5):
+def get_recent_games(team_id, limiter, limit=5):
     """Fetch recent games for a team."""
-    try:
-        finder = leaguegamefinder.LeagueGameFinder(
-            team_id_nullable=team_id, 
-            season_nullable=SEASON
-        )
-        data = finder.get_dict()
-        result_sets = data.get('resultSets', [])
+    limiter.acquire('LeagueGameFinder')
+    finder = leaguegamefinder.LeagueGameFinder(
+        team_id_nullable=team_id, 
+        season_nullable=SEASON
+    )
+    data = finder.get_dict()
+    result_sets = data.get('resultSets', [])
+    
+    if not result_sets:
+        return []
         
-        if not result_sets:
-            return []
-            
-        headers = result_sets[0].get('headers', [])
-        rows = result_sets[0].get('rowSet', [])[:limit]
+    headers = result_sets[0].get('headers', [])
+    rows = result_sets[0].get('rowSet', [])[:limit]
+    
+    # Get column indices
+    date_idx = headers.index('GAME_DATE') if 'GAME_DATE' in headers else -1
+    matchup_idx = headers.index('MATCHUP') if 'MATCHUP' in headers else -1
+    wl_idx = headers.index('WL') if 'WL' in headers else -1
+    pts_idx = headers.index('PTS') if 'PTS' in headers else -1
+    
+    games = []
+    for row in rows:
+        game_date = row[date_idx] if date_idx >= 0 else ''
+        matchup = row[matchup_idx] if matchup_idx >= 0 else ''
+        wl = row[wl_idx] if wl_idx >= 0 else ''
+        pts = row[pts_idx] if pts_idx >= 0 else 0
         
-        # Get column indices
-        date_idx = headers.index('GAME_DATE') if 'GAME_DATE' in headers else -1
-        matchup_idx = headers.index('MATCHUP') if 'MATCHUP' in headers else -1
-        wl_idx = headers.index('WL') if 'WL' in headers else -1
-        pts_idx = headers.index('PTS') if 'PTS' in headers else -1
+        # Parse matchup to get opponent and home/away
+        is_home = 'vs.' in matchup
+        opp_abbr = matchup.split(' ')[-1] if matchup else 'OPP'
         
-        games = []
-        for row in rows:
-            game_date = row[date_idx] if date_idx >= 0 else ''
-            matchup = row[matchup_idx] if matchup_idx >= 0 else ''
-            wl = row[wl_idx] if wl_idx >= 0 else ''
-            pts = row[pts_idx] if pts_idx >= 0 else 0
-            
-            # Parse matchup to get opponent and home/away
-            is_home = 'vs.' in matchup
-            opp_abbr = matchup.split(' ')[-1] if matchup else 'OPP'
-            
-            games.append({
-                'date': game_date,
-                'opponent': f"{'vs' if is_home else 'at'} {opp_abbr}",
-                'result': f"{'W' if wl == 'W' else 'L'} {pts}",
-                'win': wl == 'W'
-            })
-        
-        return games
-    except Exception as e:
-        print(f"Error fetching games for team {team_id}: {e}")
-        return []
+        games.append({
+            'date': game_date,
+            'opponent': f"{'vs' if is_home else 'at'} {opp_abbr}",
+            'result': f"{'W' if wl == 'W' else 'L'} {pts}",
+            'win': wl == 'W'
+        })
+    
+    return games
 
-def get_roster(team_id):
+def get_roster(team_id, limiter):
     """Fetch roster for a team."""
-    try:
-        roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=SEASON)
-        data = roster.get_dict()
-        result_sets = data.get('resultSets', [])
-        
-        if not result_sets:
-            return []
-            
-        headers = result_sets[0].get('headers', [])
-        rows = result_sets[0].get('rowSet', [])[:10]  # Top 10 players
-        
-        # Get column indices
-        player_idx = headers.index('PLAYER') if 'PLAYER' in headers else -1
-        pos_idx = headers.index('POSITION') if 'POSITION' in headers else -1
+    limiter.acquire('CommonTeamRoster')
+    roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=SEASON)
+    data = roster.get_dict()
+    result_sets = data.get('resultSets', [])
+    
+    if not result_sets:
+        return []
         
-        players = []
-        for row in rows:
-            player_name = row[player_idx] if player_idx >= 0 else 'Unknown'
-            position = row[pos_idx] if pos_idx >= 0 else 'N/A'
-            
-            players.append({
-                'name': player_name,
-                'pos': position[:2] if position else 'N/A',  # Shorten position
-                'ppg': 0,  # Will be filled by player stats
-                'rpg': 0,
-                'apg': 0
-            })
+    headers = result_sets[0].get('headers', [])
+    rows = result_sets[0].get('rowSet', [])[:10]  # Top 10 players
+    
+    # Get column indices
+    player_idx = headers.index('PLAYER') if 'PLAYER' in headers else -1
+    pos_idx = headers.index('POSITION') if 'POSITION' in headers else -1
+    
+    players = []
+    for row in rows:
+        player_name = row[player_idx] if player_idx >= 0 else 'Unknown'
+        position = row[pos_idx] if pos_idx >= 0 else 'N/A'
         
-        return players
-    except Exception as e:
-        print(f"Error fetching roster for team {team_id}: {e}")
-        return []
+        players.append({
+            'name': player_name,
+            'pos': position[:2] if position else 'N/A',  # Shorten position
+            'ppg': 0,  # Will be filled by player stats
+            'rpg': 0,
+            'apg': 0
+        })
+    
+    return players
 
-def get_player_stats(team_id):
+def get_player_stats(team_id, limiter):
     """Fetch player stats for a team."""
-    try:
-        dashboard = teamplayerdashboard.TeamPlayerDashboard(team_id=team_id, season=SEASON)
-        data = dashboard.get_dict()
-        result_sets = data.get('resultSets', [])
-        
-        stats = {}
-        for rs in result_sets:
-            name = rs.get('name', '')
-            if 'Player' in name:
-                headers = rs.get('headers', [])
-                rows = rs.get('rowSet', [])
+    limiter.acquire('TeamPlayerDashboard')
+    dashboard = teamplayerdashboard.TeamPlayerDashboard(team_id=team_id, season=SEASON)
+    data = dashboard.get_dict()
+    result_sets = data.get('resultSets', [])
+    
+    stats = {}
+    for rs in result_sets:
+        name = rs.get('name', '')
+        if 'Player' in name:
+            headers = rs.get('headers', [])
+            rows = rs.get('rowSet', [])
+            
+            # Get column indices
+            name_idx = headers.index('PLAYER_NAME') if 'PLAYER_NAME' in headers else -1
+            gp_idx = headers.index('GP') if 'GP' in headers else -1
+            pts_idx = headers.index('PTS') if 'PTS' in headers else -1
+            reb_idx = headers.index('REB') if 'REB' in headers else -1
+            ast_idx = headers.index('AST') if 'AST' in headers else -1
+            stl_idx = headers.index('STL') if 'STL' in headers else -1
+            blk_idx = headers.index('BLK') if 'BLK' in headers else -1
+            
+            for row in rows:
+                player_name = row[name_idx] if name_idx >= 0 else ''
+                gp = row[gp_idx] if gp_idx >= 0 else 1
+                if gp == 0:
+                    gp = 1
                 
-                # Get column indices
-                name_idx = headers.index('PLAYER_NAME') if 'PLAYER_NAME' in headers else -1
-                gp_idx = headers.index('GP') if 'GP' in headers else -1
-                pts_idx = headers.index('PTS') if 'PTS' in headers else -1
-                reb_idx = headers.index('REB') if 'REB' in headers else -1
-                ast_idx = headers.index('AST') if 'AST' in headers else -1
-                stl_idx = headers.index('STL') if 'STL' in headers else -1
-                blk_idx = headers.index('BLK') if 'BLK' in headers else -1
+                # Calculate per-game stats
+                pts_total = row[pts_idx] if pts_idx >= 0 else 0
+                reb_total = row[reb_idx] if reb_idx >= 0 else 0
+                ast_total = row[ast_idx] if ast_idx >= 0 else 0
+                stl_total = row[stl_idx] if stl_idx >= 0 else 0
+                blk_total = row[blk_idx] if blk_idx >= 0 else 0
                 
-                for row in rows:
-                    player_name = row[name_idx] if name_idx >= 0 else ''
-                    gp = row[gp_idx] if gp_idx >= 0 else 1
-                    if gp == 0:
-                        gp = 1
-                    
-                    # Calculate per-game stats
-                    pts_total = row[pts_idx] if pts_idx >= 0 else 0
-                    reb_total = row[reb_idx] if reb_idx >= 0 else 0
-                    ast_total = row[ast_idx] if ast_idx >= 0 else 0
-                    stl_total = row[stl_idx] if stl_idx >= 0 else 0
-                    blk_total = row[blk_idx] if blk_idx >= 0 else 0
-                    
-                    stats[player_name] = {
-                        'ppg': round(pts_total / gp, 1),
-                        'rpg': round(reb_total / gp, 1),
-                        'apg': round(ast_total / gp, 1),
-                        'spg': round(stl_total / gp, 1),
-                        'bpg': round(blk_total / gp, 1)
-                    }
-                break
-        
-        return stats
-    except Exception as e:
-        print(f"Error fetching player stats for team {team_id}: {e}")
-        return {}
+                stats[player_name] = {
+                    'ppg': round(pts_total / gp, 1),
+                    'rpg': round(reb_total / gp, 1),
+                    'apg': round(ast_total / gp, 1),
+                    'spg': round(stl_total / gp, 1),
+                    'bpg': round(blk_total / gp, 1)
+                }
+            break
+    
+    return stats
 
-def generate_team_data(abbr, team_id):
-    """Generate complete data for a single team."""
+def generate_team_data(abbr, team_id, limiter, timings):
+    """
+    Generate complete data for a single team, adding per-stage seconds to
+    timings. Returns (team_data, stages that failed); a failed stage
+    contributes no data and the rest of the team is still built.
+    """
     print(f"Fetching data for {abbr}...")
+    failed = []
+
+    def fetch(stage, getter, default):
+        started = time.perf_counter()
+        try:
+            return getter(team_id, limiter)
+        except Exception as e:
+            print(f"Error fetching {stage} for team {team_id}: {e}")
+            failed.append(stage)
+            return default
+        finally:
+            timings[stage] += time.perf_counter() - started
+
+    games = fetch('games', get_recent_games, [])
+    roster = fetch('roster', get_roster, [])
+    player_stats = fetch('player_stats', get_player_stats, {})
     
-    # Get recent games
-    games = get_recent_games(team_id)
-    time.sleep(0.5)  # Rate limiting
-    
-    # Get roster
-    roster = get_roster(team_id)
-    time.sleep(0.5)
-    
-    # Get player stats
-    player_stats = get_player_stats(team_id)
-    time.sleep(0.5)
-    
+    started = time.perf_counter()
     # Merge stats into roster
     for player in roster:
         if player['name'] in player_stats:
@@ -207,34 +226,140 @@ def generate_team_data(abbr, team_id):
             'value': f"{ast_leader['apg']} APG"
         })
     
-    return {
+    team_data = {
         'lastGames': games[:5],
         'leaders': leaders,
         'roster': roster[:5]  # Top 5 players by PPG
     }
+    timings['merge'] += time.perf_counter() - started
+    return team_data, failed
+
+def _checkpoint_path(checkpoint_dir, abbr):
+    return os.path.join(checkpoint_dir, f"{abbr}.json")
+
+def load_checkpoints(checkpoint_dir, abbrs, max_age=CHECKPOINT_MAX_AGE, now=None):
+    """Return already finished teams from a recent interrupted run of this season."""
+    now = time.time() if now is None else now
+    done = {}
+    for abbr in abbrs:
+        try:
+            with open(_checkpoint_path(checkpoint_dir, abbr)) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if checkpoint.get('season') == SEASON and now - checkpoint.get('created_at', 0) <= max_age:
+            done[abbr] = checkpoint['data']
+    return done
+
+def save_checkpoint(checkpoint_dir, abbr, team_data):
+    path = _checkpoint_path(checkpoint_dir, abbr)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'season': SEASON, 'created_at': time.time(), 'data': team_data}, f)
+    os.replace(tmp_path, path)
+
+def clear_checkpoints(checkpoint_dir, abbrs):
+    for abbr in abbrs:
+        try:
+            os.remove(_checkpoint_path(checkpoint_dir, abbr))
+        except FileNotFoundError:
+            pass
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate team stats JSON for the My Team page.")
+    parser.add_argument('--teams', help="Comma-separated team abbreviations to refresh (default: all 30).")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Teams processed concurrently.")
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR, help="Where finished teams are checkpointed.")
+    parser.add_argument('--fresh', action='store_true', help="Ignore checkpoints from an interrupted run.")
+    return parser.parse_args()
+
+def report_timings(timings, wall_time, limiter, team_count):
+    print(f"\nStage timings for {team_count} teams ({wall_time:.1f}s wall clock):")
+    for stage in STAGES:
+        total = timings[stage]
+        avg = total / team_count if team_count else 0.0
+        print(f"  {stage:<13} {total:8.1f}s total  {avg:6.2f}s/team")
+    throttle = limiter.stats()
+    print(f"  {'throttle wait':<13} {throttle['total_wait_seconds']:8.1f}s total  "
+          f"({throttle['throttled']} of {throttle['calls']} calls waited)")
 
 def main():
-    output_dir = 'src/main/resources/static/data'
+    install_from_env()
+    args = parse_args()
+    output_dir = OUTPUT_DIR
     os.makedirs(output_dir, exist_ok=True)
-    
+    os.makedirs(args.checkpoint_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, 'team_stats.json')
+
+    selected = NBA_TEAMS
+    if args.teams:
+        wanted = [abbr.strip().upper() for abbr in args.teams.split(',') if abbr.strip()]
+        unknown = [abbr for abbr in wanted if abbr not in NBA_TEAMS]
+        if unknown:
+            raise SystemExit(f"Unknown team abbreviations: {', '.join(unknown)}")
+        selected = {abbr: NBA_TEAMS[abbr] for abbr in wanted}
+
+    # Teams that are not refreshed (or fail) keep their existing data
     all_team_stats = {}
-    
-    # Generate data for all teams (or just a subset for testing)
-    for abbr, team_id in NBA_TEAMS.items():
+    if os.path.exists(output_file):
+        with open(output_file) as f:
+            all_team_stats = json.load(f)
+
+    done = {} if args.fresh else load_checkpoints(args.checkpoint_dir, selected)
+    if done:
+        print(f"Resuming: {len(done)} teams already checkpointed ({', '.join(sorted(done))})")
+    all_team_stats.update(done)
+    pending = {abbr: team_id for abbr, team_id in selected.items() if abbr not in done}
+
+    limiter = RateLimiter(1.0 / MIN_REQUEST_INTERVAL)
+    timings = {stage: 0.0 for stage in STAGES}
+    timings_lock = threading.Lock()
+    failed = []
+
+    def run_team(abbr, team_id):
+        team_timings = {stage: 0.0 for stage in STAGES}
         try:
-            team_data = generate_team_data(abbr, team_id)
-            all_team_stats[abbr] = team_data
-            print(f"  ✓ {abbr}: {len(team_data['lastGames'])} games, {len(team_data['roster'])} players")
-        except Exception as e:
-            print(f"  ✗ {abbr}: Error - {e}")
-            all_team_stats[abbr] = {'lastGames': [], 'leaders': [], 'roster': []}
-    
-    # Save to JSON file
-    output_file = os.path.join(output_dir, 'team_stats.json')
+            return generate_team_data(abbr, team_id, limiter, team_timings)
+        finally:
+            with timings_lock:
+                for stage, seconds in team_timings.items():
+                    timings[stage] += seconds
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(run_team, abbr, team_id): abbr for abbr, team_id in pending.items()}
+        for future in as_completed(futures):
+            abbr = futures[future]
+            try:
+                team_data, failed_stages = future.result()
+                all_team_stats[abbr] = team_data
+                if failed_stages:
+                    # Keep the partial data but leave the team to be retried
+                    print(f"  ✗ {abbr}: partial data, failed {', '.join(failed_stages)}")
+                    failed.append(abbr)
+                    continue
+                save_checkpoint(args.checkpoint_dir, abbr, team_data)
+                print(f"  ✓ {abbr}: {len(team_data['lastGames'])} games, {len(team_data['roster'])} players")
+            except Exception as e:
+                print(f"  ✗ {abbr}: Error - {e}")
+                failed.append(abbr)
+                all_team_stats.setdefault(abbr, {'lastGames': [], 'leaders': [], 'roster': []})
+    wall_time = time.perf_counter() - started
+
+    # Save to JSON file in league order
+    ordered = {abbr: all_team_stats[abbr] for abbr in NBA_TEAMS if abbr in all_team_stats}
     with open(output_file, 'w') as f:
-        json.dump(all_team_stats, f, indent=2)
+        json.dump(ordered, f, indent=2)
     
     print(f"\nSaved team stats to {output_file}")
+    report_timings(timings, wall_time, limiter, len(pending))
+
+    if failed:
+        # Keep checkpoints so a rerun only retries the failed teams
+        print(f"{len(failed)} teams failed ({', '.join(sorted(failed))}); rerun to retry them.")
+        return 1
+    clear_checkpoints(args.checkpoint_dir, selected)
+    return 0
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
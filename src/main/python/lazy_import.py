@@ -0,0 +1,57 @@
+"""
+Deferred module imports.
+
+pandas, NumPy and nba_api's endpoint package (which imports every endpoint
+module) account for most of the service's import time but are only needed
+once a request reaches the upstream or the data crunching. lazy_module()
+returns a stand-in that imports the real module on first attribute access,
+so `pd = lazy_module('pandas')` keeps call sites unchanged.
+"""
+
+import importlib
+import sys
+
+
+class LazyModule:
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)  # the import lock makes this thread-safe
+            object.__setattr__(self, '_module', module)
+        return module
+
+    @property
+    def loaded(self):
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+def preload(*modules):
+    """Import the given lazy modules now (e.g. from a warmup thread)."""
+    for module in modules:
+        module._load()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Durable on-disk storage for NBA data that never changes once it is final.
+
+Box scores of finished games are kept in a local SQLite database keyed by
+game_id, and player totals of completed seasons keyed by player and season,
+so they survive restarts and are never fetched from the upstream again.
+Run this module directly to inspect or evict stored entries.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_DIR = os.environ.get(
+    "NBA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "cache")
+)
+BOXSCORE_DB = os.path.join(CACHE_DIR, "boxscores.sqlite3")
+CAREER_DB = os.path.join(CACHE_DIR, "careers.sqlite3")
+
+
+class SqliteStore:
+    """Base class holding one SQLite connection per thread."""
+
+    schema = ""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(self.schema)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # A connection opened before a fork (gunicorn --preload) must not be used by the child
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+
+class BoxscoreStore(SqliteStore):
+    """Immutable parsed box scores of final games, keyed by game_id."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS boxscores (
+            game_id TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            stored_at REAL NOT NULL
+        );
+    """
+
+    def get(self, game_id):
+        row = self._conn().execute(
+            "SELECT payload FROM boxscores WHERE game_id = ?", (str(game_id),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, game_id, payload):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO boxscores (game_id, payload, stored_at) VALUES (?, ?, ?)",
+            (str(game_id), json.dumps(payload, separators=(",", ":")), time.time())
+        )
+        conn.commit()
+
+    def delete(self, game_id):
+        conn = self._conn()
+        deleted = conn.execute("DELETE FROM boxscores WHERE game_id = ?", (str(game_id),)).rowcount
+        conn.commit()
+        return deleted > 0
+
+    def clear(self):
+        conn = self._conn()
+        deleted = conn.execute("DELETE FROM boxscores").rowcount
+        conn.commit()
+        return deleted
+
+    def entries(self, limit=None):
+        query = "SELECT game_id, stored_at, length(payload) FROM boxscores ORDER BY stored_at DESC"
+        params = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+        return self._conn().execute(query, params).fetchall()
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM boxscores").fetchone()[0]
+
+
+class CareerStore(SqliteStore):
+    """Regular-season totals of completed seasons, keyed by (player_id, season_id)."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS career_seasons (
+            player_id INTEGER NOT NULL,
+            season_id TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            PRIMARY KEY (player_id, season_id)
+        );
+    """
+
+    def get(self, player_id, season_id):
+        row = self._conn().execute(
+            "SELECT payload FROM career_seasons WHERE player_id = ? AND season_id = ?",
+            (int(player_id), str(season_id))
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_seasons(self, player_id, seasons):
+        """Store {season_id: totals} for one player in a single transaction."""
+        now = time.time()
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO career_seasons (player_id, season_id, payload, stored_at) VALUES (?, ?, ?, ?)",
+            [(int(player_id), str(season_id), json.dumps(totals, separators=(",", ":")), now)
+             for season_id, totals in seasons.items()]
+        )
+        conn.commit()
+
+    def delete(self, player_id):
+        conn = self._conn()
+        deleted = conn.execute("DELETE FROM career_seasons WHERE player_id = ?", (int(player_id),)).rowcount
+        conn.commit()
+        return deleted
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM career_seasons").fetchone()[0]
+
+
+def _format_time(ts):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inspect or evict locally stored NBA data.")
+    parser.add_argument("--db", default=BOXSCORE_DB, help="Box score database path.")
+    parser.add_argument("--career-db", default=CAREER_DB, help="Career totals database path.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = commands.add_parser("list", help="List stored box scores, newest first.")
+    list_cmd.add_argument("--limit", type=int, default=50)
+
+    show_cmd = commands.add_parser("show", help="Print a stored box score as JSON.")
+    show_cmd.add_argument("game_id")
+
+    evict_cmd = commands.add_parser("evict", help="Remove stored box scores.")
+    evict_cmd.add_argument("game_ids", nargs="*")
+    evict_cmd.add_argument("--all", action="store_true", help="Remove every stored box score.")
+
+    career_cmd = commands.add_parser("evict-career", help="Remove stored season totals of players.")
+    career_cmd.add_argument("player_ids", nargs="+", type=int)
+
+    commands.add_parser("stats", help="Show entry counts and database sizes.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    store = BoxscoreStore(args.db)
+
+    if args.command == "list":
+        for game_id, stored_at, size in store.entries(args.limit):
+            print(f"{game_id}  {_format_time(stored_at)}  {size} bytes")
+    elif args.command == "show":
+        payload = store.get(args.game_id)
+        if payload is None:
+            print(f"No stored box score for game {args.game_id}")
+            return 1
+        print(json.dumps(payload, indent=2))
+    elif args.command == "evict":
+        if args.all:
+            print(f"Evicted {store.clear()} box scores")
+        elif not args.game_ids:
+            print("Nothing to evict: pass game ids or --all")
+            return 1
+        for game_id in args.game_ids:
+            print(f"{game_id}: {'evicted' if store.delete(game_id) else 'not stored'}")
+    elif args.command == "evict-career":
+        careers = CareerStore(args.career_db)
+        for player_id in args.player_ids:
+            print(f"{player_id}: evicted {careers.delete(player_id)} seasons")
+    elif args.command == "stats":
+        size = os.path.getsize(args.db) if os.path.exists(args.db) else 0
+        print(f"{store.count()} box scores in {args.db} ({size} bytes)")
+        careers = CareerStore(args.career_db)
+        size = os.path.getsize(args.career_db) if os.path.exists(args.career_db) else 0
+        print(f"{careers.count()} player seasons in {args.career_db} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+"""
+Prometheus text-format metrics for the service.
+
+Counters and histograms are updated in place under a short per-metric lock
+(a dict lookup and a bisect per observation), and collectors read the
+counters the caches, throttle and poller already keep only when /metrics is
+scraped, so leaving this on costs a few microseconds per request.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from flask import Response, g, request
+
+from request_timing import log_error
+from response_cache import all_caches
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Seconds; spans a cached hit (sub-millisecond) to a throttled upstream call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labelvalues -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 3)
+            series[index] += 1  # index == len(buckets) is the +Inf bucket
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labelvalues):
+        series = self._series.get(labelvalues)
+        return series[-1] if series else 0
+
+    def samples(self):
+        with self._lock:
+            snapshot = {labelvalues: list(series) for labelvalues, series in self._series.items()}
+        bounds = self.buckets + (float('inf'),)
+        for labelvalues, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, hits in zip(bounds, series):
+                cumulative += hits
+                le = f'le="{_number(float(bound))}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labelvalues)} {series[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect):
+        """
+        collect() is called on every scrape and yields
+        (name, kind, help, [(labels dict, value), ...]) families.
+        """
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collect in self._collectors:
+            try:
+                families = list(collect())
+            except Exception as e:
+                log_error("Metrics collector failed", e)
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+request_duration = registry.histogram(
+    'nba_http_request_duration_seconds', 'Time to produce a response, by route template.', ('route', 'method'))
+requests_total = registry.counter(
+    'nba_http_requests_total', 'Responses sent, by route template and status code.', ('route', 'method', 'status'))
+upstream_duration = registry.histogram(
+    'nba_upstream_request_duration_seconds', 'nba_api call latency (network and parsing), by endpoint class.',
+    ('endpoint',))
+upstream_requests = registry.counter(
+    'nba_upstream_requests_total', 'nba_api calls, by endpoint class and outcome.', ('endpoint', 'outcome'))
+throttle_wait = registry.histogram(
+    'nba_upstream_throttle_wait_seconds', 'Time spent waiting for the upstream rate limiter, by endpoint class.',
+    ('endpoint',))
+job_duration = registry.histogram(
+    'nba_job_duration_seconds', 'Scheduled job run time, including the run at startup.', ('job',),
+    buckets=JOB_BUCKETS)
+job_runs = registry.counter('nba_job_runs_total', 'Scheduled job runs, by outcome.', ('job', 'outcome'))
+
+
+# (ResponseCache.stats() field, metric suffix, type, help)
+CACHE_FIELDS = (
+    ('hits', 'hits_total', 'counter', 'Fresh cache hits.'),
+    ('stale_hits', 'stale_hits_total', 'counter', 'Expired entries served while refreshing.'),
+    ('misses', 'misses_total', 'counter', 'Cache misses.'),
+    ('shared_hits', 'shared_hits_total', 'counter', 'Misses served from the host-wide shared cache.'),
+    ('evictions', 'evictions_total', 'counter', 'Entries evicted to stay under the memory budget.'),
+    ('refresh_errors', 'refresh_errors_total', 'counter', 'Failed background refreshes.'),
+    ('entries', 'entries', 'gauge', 'Entries currently held.'),
+    ('bytes', 'bytes', 'gauge', 'Estimated size of the held entries.'),
+)
+
+
+def collect_caches():
+    """Counters of every ResponseCache, including ones created later."""
+    stats = [cache.stats() for cache in all_caches()]
+    for field, suffix, kind, help_text in CACHE_FIELDS:
+        yield f"nba_cache_{suffix}", kind, help_text, [({"cache": s["name"]}, s[field]) for s in stats]
+
+
+registry.add_collector(collect_caches)
+
+
+def track_job(name):
+    """Decorator recording run time and outcome; a False return counts as a failure."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                result = fn(*args, **kwargs)
+                outcome = 'failure' if result is False else 'success'
+                return result
+            finally:
+                job_duration.observe(time.perf_counter() - started, name)
+                job_runs.inc(name, outcome)
+        return wrapper
+    return decorate
+
+
+def observe_upstream(endpoint, waited, seconds, ok):
+    throttle_wait.observe(waited, endpoint)
+    upstream_duration.observe(seconds, endpoint)
+    upstream_requests.inc(endpoint, 'success' if ok else 'error')
+
+
+def init_metrics(app):
+    """
+    Time every request and serve /metrics. The time includes the
+    after_request hooks registered after this call (Flask runs them in
+    reverse order), not those registered before it; nba_service calls it
+    right after init_request_timing, which stays outermost.
+    """
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            rule = request.url_rule
+            route = rule.rule if rule is not None else 'unmatched'
+            request_duration.observe(time.perf_counter() - started, route, request.method)
+            requests_total.inc(route, request.method, str(response.status_code))
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -1,66 +1,155 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from generate_team_differentials import generate_team_differentials
-from nba_api.live.nba.endpoints import scoreboard
-from nba_api.stats.endpoints import leaguedashteamstats, leaguestandings, teamgamelog, leaguegamefinder, teamplayerdashboard, boxscoretraditionalv2, playergamelog, playercareerstats, teamdashboardbygeneralsplits
-from nba_api.stats.static import teams
+from conditional import encoded, init_conditional, payload_memo
+from game_stream import GameStream
+from generate_team_differentials import generate_team_differentials, MODES as DIFFERENTIALS_MODES
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-import time
 import json
 import os
 import atexit
-import pandas as pd
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from lazy_import import lazy_module, preload
+from request_timing import init_request_timing, log_error, log_event, span
+from metrics import init_metrics, observe_upstream, registry, track_job
+from player_directory import PlayerDirectory, DEFAULT_LIMIT as PLAYER_SEARCH_LIMIT
+from columnar_snapshot import SNAPSHOT_DIR
+from local_store import BoxscoreStore, CareerStore, BOXSCORE_DB, CAREER_DB
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache, make_cache_key
+from result_projector import Field, compile_projector, find_result_set, project_result_set
+from scoreboard_poller import STATUS_FINAL, ScoreboardPoller
+from shared_state import open_shared_state
+from serializer import FastJSONProvider, dumps
+from single_flight import SingleFlight
+from team_rankings import build_team_rankings
+from upstream_replay import install_from_env
+from warmup import Warmup
+from werkzeug.serving import make_server
+
+# Imported on first use (or by the warmup job) so the service binds its port quickly
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
+scoreboard = lazy_module('nba_api.live.nba.endpoints.scoreboard')
+boxscoresummaryv2 = lazy_module('nba_api.stats.endpoints.boxscoresummaryv2')
+boxscoretraditionalv2 = lazy_module('nba_api.stats.endpoints.boxscoretraditionalv2')
+leaguedashplayerstats = lazy_module('nba_api.stats.endpoints.leaguedashplayerstats')
+leaguedashteamstats = lazy_module('nba_api.stats.endpoints.leaguedashteamstats')
+leaguegamefinder = lazy_module('nba_api.stats.endpoints.leaguegamefinder')
+leaguestandings = lazy_module('nba_api.stats.endpoints.leaguestandings')
+playercareerstats = lazy_module('nba_api.stats.endpoints.playercareerstats')
+playergamelog = lazy_module('nba_api.stats.endpoints.playergamelog')
+teamdashboardbygeneralsplits = lazy_module('nba_api.stats.endpoints.teamdashboardbygeneralsplits')
+teamgamelog = lazy_module('nba_api.stats.endpoints.teamgamelog')
+teamplayerdashboard = lazy_module('nba_api.stats.endpoints.teamplayerdashboard')
+
+PROCESS_STARTED = time.time()
+install_from_env()  # NBA_UPSTREAM_MODE=record|replay: run against recorded nba_api fixtures
+PORT = int(os.environ.get('NBA_SERVICE_PORT', 5001))
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson when installed, stdlib json otherwise
 CORS(app)  # Enable CORS for all routes
+# Flask runs after_request hooks in reverse order, so the first registered wraps the rest:
+# request timing is outermost and its log line includes the metrics hook; the request
+# duration histogram covers every hook registered after init_metrics
+init_request_timing(app)  # Server-Timing header and one JSON log line per request
+init_metrics(app)  # /metrics and per-route request duration
+init_conditional(app)  # ETag / Last-Modified / 304 on JSON GET routes
 
 # Cache / Rate Limiting prevention
-last_request_time = 0
 MIN_REQUEST_INTERVAL = 1.0  # 1 second between calls to be safe
+UPSTREAM_BURST = 1
+# Optional tighter budgets for individual endpoints: {'EndpointClass': (calls_per_sec, burst)}
+UPSTREAM_ENDPOINT_BUDGETS = {}
 TEAM_RANKINGS_TTL = 60 * 30  # 30 minutes
 TEAM_TOTALS_TTL = 60 * 30  # 30 minutes for team totals cache
+USAGE_RATES_TTL = 60 * 30  # League-wide usage rates, per season
+CAREER_CURRENT_SEASON_TTL = 60 * 5  # Completed seasons are stored permanently
 DEFAULT_SEASON = "2025-26"
-team_rankings_cache = {}
-team_totals_cache = {}  # Cache for team season totals (usage rates)
-
-def _format_rank(rank):
-    if rank is None:
-        return "-"
-    rank = int(rank)
-    if rank <= 0:
-        return "-"
-    if rank == 1:
-        return "1st"
-    if rank == 2:
-        return "2nd"
-    if rank == 3:
-        return "3rd"
-    return f"{rank}th"
-
-def _pick_column(columns, candidates):
-    for col in candidates:
-        if col in columns:
-            return col
-    return None
-
-def _normalize_team_name(value):
-    if not value:
-        return ""
-    return str(value).strip().lower().replace(".", "")
-
-def _build_team_abbr_map():
-    mapping = {}
-    for team in teams.get_teams():
-        full_name = team.get("full_name")
-        abbr = team.get("abbreviation")
-        if full_name and abbr:
-            mapping[_normalize_team_name(full_name)] = abbr
-    return mapping
-
-def _extract_team_stats_frame(stats):
-    frames = stats.get_data_frames()
+UPSTREAM_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64 MB of parsed upstream responses
+
+# Per-endpoint freshness (seconds). Entries past their TTL are still served for
+# the stale window while a background refresh fetches the new value.
+UPSTREAM_TTLS = {
+    'BoxScoreTraditionalV2': 60,
+    'PlayerGameLog': 60 * 10,
+    'LeagueGameFinder': 60 * 10,
+    'TeamPlayerDashboard': 60 * 30,
+    'TeamDashboardByGeneralSplits': TEAM_TOTALS_TTL,
+    'LeagueDashPlayerStats': USAGE_RATES_TTL,
+    'LeagueDashTeamStats': TEAM_RANKINGS_TTL,
+    'LeagueStandings': 60 * 5
+}
+UPSTREAM_STALE_TTLS = {
+    'BoxScoreTraditionalV2': 60 * 5,
+    'LeagueStandings': 60 * 5
+}
+DEFAULT_UPSTREAM_TTL = 60
+DEFAULT_UPSTREAM_STALE_TTL = 60 * 10
+
+# Set NBA_SHARED_STATE when running several worker processes (gunicorn) so the
+# upstream budget and the caches below are shared host-wide; None otherwise
+shared_state = open_shared_state()
+upstream_limiter = RateLimiter(1.0 / MIN_REQUEST_INTERVAL, burst=UPSTREAM_BURST, endpoint_budgets=UPSTREAM_ENDPOINT_BUDGETS, backend=shared_state)
+upstream_flight = SingleFlight('upstream')
+upstream_cache = ResponseCache('upstream', max_bytes=UPSTREAM_CACHE_MAX_BYTES, default_ttl=DEFAULT_UPSTREAM_TTL, backend=shared_state)
+team_rankings_cache = ResponseCache('team_rankings', max_bytes=4 * 1024 * 1024, default_ttl=TEAM_RANKINGS_TTL, stale_ttl=TEAM_RANKINGS_TTL, backend=shared_state)
+boxscore_store = BoxscoreStore(BOXSCORE_DB)  # Parsed box scores of final games
+boxscore_cache = ResponseCache('boxscores', max_bytes=8 * 1024 * 1024, default_ttl=60 * 60 * 6)  # Hot final box scores from the store
+career_store = CareerStore(CAREER_DB)  # Player totals of completed seasons
+career_cache = ResponseCache('career', max_bytes=4 * 1024 * 1024, default_ttl=CAREER_CURRENT_SEASON_TTL, backend=shared_state)  # Full careers incl. the current season
+BOXSCORE_BATCH_LIMIT = 100
+BOXSCORE_BATCH_WORKERS = 8  # Upstream pacing is still enforced by upstream_limiter
+boxscore_executor = ThreadPoolExecutor(max_workers=BOXSCORE_BATCH_WORKERS, thread_name_prefix='boxscore')
+team_totals_cache = ResponseCache('team_totals', max_bytes=1024 * 1024, default_ttl=TEAM_TOTALS_TTL, backend=shared_state)  # Team season totals (usage rates)
+player_directory = PlayerDirectory(snapshot_dir=SNAPSHOT_DIR)  # Search index over data/player_directory.csv, read from its columnar snapshot
+usage_rates_cache = ResponseCache('usage_rates', max_bytes=8 * 1024 * 1024, default_ttl=USAGE_RATES_TTL, stale_ttl=USAGE_RATES_TTL, backend=shared_state)  # League-wide usage rates per season
+
+def _call_upstream(endpoint_cls, **params):
+    name = endpoint_cls.__name__
+    with span('throttle'):
+        waited = upstream_limiter.acquire(name)
+    started = time.perf_counter()
+    ok = False
+    try:
+        with span('upstream'):
+            data = endpoint_cls(**params).get_dict()
+        ok = True
+        return data
+    finally:
+        observe_upstream(name, waited, time.perf_counter() - started, ok)
+
+def _fetch_upstream(endpoint_cls, **params):
+    """
+    Return the response dict for an nba_api endpoint, served from the shared
+    upstream cache when possible. Concurrent misses for the same key share a
+    single upstream call. Callers must treat the result as read-only.
+    """
+    name = endpoint_cls.__name__
+    key = make_cache_key(name, params)
+    # Covers cache lookups and waiting on another caller's in-flight request too
+    with span('upstream'):
+        return upstream_cache.get_or_load(
+            key,
+            lambda: upstream_flight.do(key, lambda: _call_upstream(endpoint_cls, **params)),
+            ttl=UPSTREAM_TTLS.get(name, DEFAULT_UPSTREAM_TTL),
+            stale_ttl=UPSTREAM_STALE_TTLS.get(name, DEFAULT_UPSTREAM_STALE_TTL)
+        )
+
+@span('parse')
+def _result_set_frames(data):
+    frames = []
+    for rs in data.get('resultSets', []):
+        frames.append(pd.DataFrame(rs.get('rowSet', []), columns=rs.get('headers', [])))
+    return frames
+
+def _extract_team_stats_frame(data):
+    frames = _result_set_frames(data)
     if not frames:
         return pd.DataFrame()
     for frame in frames:
@@ -70,16 +159,76 @@ def _extract_team_stats_frame(stats):
     return frames[0]
 
 def get_live_scoreboard():
-    global last_request_time
-    now = time.time()
-    if now - last_request_time < MIN_REQUEST_INTERVAL:
-        time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-    
-    last_request_time = time.time()
-    
-    # This endpoint gets today's live scores
-    board = scoreboard.ScoreBoard()
-    return board.get_dict()
+    # This endpoint gets today's live scores, kept fresh by the background poller
+    return scoreboard_poller.current().data
+
+def _map_scoreboard_games(data):
+    games_list = []
+
+    # Structure from nba_api look like:
+    # 'scoreboard': { 'gameDate': '...', 'games': [ ... ] }
+
+    if 'scoreboard' in data and 'games' in data['scoreboard']:
+        for g in data['scoreboard']['games']:
+            # Map to format expected by Java Game class
+            # Java Game class fields: id, date, season, status, period, time, postseason,
+            # homeTeamScore, visitorTeamScore, homeTeam, visitorTeam
+
+            game_obj = {
+                "id": g['gameId'],
+                "date": data['scoreboard']['gameDate'], # YYYY-MM-DD
+                "season": 2024, # Hardcoded or derived
+                "status": g['gameStatusText'],
+                "period": g['period'],
+                "time": g['gameStatusText'], # repeated for now
+                "postseason": False,
+                "home_team_score": g['homeTeam']['score'],
+                "visitor_team_score": g['awayTeam']['score'],
+                "home_team": {
+                    "id": g['homeTeam']['teamId'],
+                    "full_name": g['homeTeam']['teamName'] + " " + g['homeTeam']['teamCity'], # Approximation
+                    "name": g['homeTeam']['teamName'],
+                    "abbreviation": g['homeTeam']['teamTricode'],
+                    "city": g['homeTeam']['teamCity']
+                },
+                "visitor_team": {
+                    "id": g['awayTeam']['teamId'],
+                    "full_name": g['awayTeam']['teamName'] + " " + g['awayTeam']['teamCity'],
+                    "name": g['awayTeam']['teamName'],
+                    "abbreviation": g['awayTeam']['teamTricode'],
+                    "city": g['awayTeam']['teamCity']
+                }
+            }
+            games_list.append(game_obj)
+    return games_list
+
+def _map_final_games(data):
+    games_list = []
+    game_date = None
+
+    if 'scoreboard' in data:
+        game_date = data['scoreboard'].get('gameDate')
+        for g in data['scoreboard'].get('games', []):
+            status_text = g.get('gameStatusText', '')
+            if 'Final' in status_text:
+                games_list.append({
+                    "game_id": g.get('gameId'),
+                    "game_date": game_date,
+                    "status": status_text
+                })
+
+    return {"games": games_list, "count": len(games_list), "game_date": game_date}
+
+def _scoreboard_views(data):
+    """Route payloads derived once per scoreboard poll."""
+    return {
+        'games': {"data": _map_scoreboard_games(data)},
+        'finals': _map_final_games(data)
+    }
+
+scoreboard_poller = ScoreboardPoller(lambda: _call_upstream(scoreboard.ScoreBoard), _scoreboard_views)
+game_stream = GameStream()
+scoreboard_poller.add_listener(lambda snapshot: game_stream.publish(snapshot.views['games']['data']))
 
 @app.route('/games', methods=['GET'])
 def get_games():
@@ -99,74 +248,40 @@ def get_games():
     # For now, let's implement the live/today view which seems to be the priority.
     
     try:
-        data = get_live_scoreboard()
-        games_list = []
-        
-        # Structure from nba_api look like:
-        # 'scoreboard': { 'gameDate': '...', 'games': [ ... ] }
-        
-        if 'scoreboard' in data and 'games' in data['scoreboard']:
-            for g in data['scoreboard']['games']:
-                # Map to format expected by Java Game class
-                # Java Game class fields: id, date, season, status, period, time, postseason,
-                # homeTeamScore, visitorTeamScore, homeTeam, visitorTeam
-                
-                game_obj = {
-                    "id": g['gameId'],
-                    "date": data['scoreboard']['gameDate'], # YYYY-MM-DD
-                    "season": 2024, # Hardcoded or derived
-                    "status": g['gameStatusText'],
-                    "period": g['period'],
-                    "time": g['gameStatusText'], # repeated for now
-                    "postseason": False,
-                    "home_team_score": g['homeTeam']['score'],
-                    "visitor_team_score": g['awayTeam']['score'],
-                    "home_team": {
-                        "id": g['homeTeam']['teamId'],
-                        "full_name": g['homeTeam']['teamName'] + " " + g['homeTeam']['teamCity'], # Approximation
-                        "name": g['homeTeam']['teamName'],
-                        "abbreviation": g['homeTeam']['teamTricode'],
-                        "city": g['homeTeam']['teamCity']
-                    },
-                    "visitor_team": {
-                        "id": g['awayTeam']['teamId'],
-                        "full_name": g['awayTeam']['teamName'] + " " + g['awayTeam']['teamCity'],
-                        "name": g['awayTeam']['teamName'],
-                        "abbreviation": g['awayTeam']['teamTricode'],
-                        "city": g['awayTeam']['teamCity']
-                    }
-                }
-                games_list.append(game_obj)
-                
-        return jsonify({"data": games_list})
+        # Served from the poller's latest snapshot; requests never wait on the upstream
+        return encoded(scoreboard_poller.current().views['games']).response()
         
     except Exception as e:
-        print(f"Error: {e}")
+        log_error("Error fetching games", e)
         return jsonify({"data": [], "error": str(e)}), 500
 
 @app.route('/games/finals', methods=['GET'])
 def get_final_games():
     try:
-        data = get_live_scoreboard()
-        games_list = []
-        game_date = None
-
-        if 'scoreboard' in data:
-            game_date = data['scoreboard'].get('gameDate')
-            for g in data['scoreboard'].get('games', []):
-                status_text = g.get('gameStatusText', '')
-                if 'Final' in status_text:
-                    games_list.append({
-                        "game_id": g.get('gameId'),
-                        "game_date": game_date,
-                        "status": status_text
-                    })
-
-        return jsonify({"games": games_list, "count": len(games_list), "game_date": game_date})
+        return encoded(scoreboard_poller.current().views['finals']).response()
     except Exception as e:
-        print(f"Error fetching final games: {e}")
+        log_error("Error fetching final games", e)
         return jsonify({"games": [], "error": str(e)}), 500
 
+@app.route('/games/stream', methods=['GET'])
+def stream_games():
+    """
+    Server-Sent Events of today's games: a "snapshot" event with every game
+    on connect, then "delta" events carrying only the changed score, period
+    and status fields per game. Reconnecting clients resume via Last-Event-ID.
+    """
+    try:
+        scoreboard_poller.current()
+    except Exception as e:
+        log_error("Error starting game stream", e)
+        return jsonify({"error": str(e)}), 503
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return Response(
+        game_stream.subscribe(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 def _parse_minutes(value):
     if value is None:
         return None
@@ -185,108 +300,151 @@ def _parse_minutes(value):
     except ValueError:
         return None
 
+GAME_SUMMARY_SCHEMA = (
+    Field('game_id', 'GAME_ID'),
+    Field('status', 'GAME_STATUS_ID'),
+    Field('status_text', 'GAME_STATUS_TEXT')
+)
+
+def _is_game_final(game_id):
+    """
+    Whether the game has finished, by today's scoreboard when the game is on
+    it and otherwise by its own status in BoxScoreSummaryV2. A game whose
+    status cannot be read counts as not final, so nothing is stored for it.
+    """
+    try:
+        games = get_live_scoreboard().get('scoreboard', {}).get('games', [])
+    except Exception as e:
+        log_error(f"Scoreboard unavailable; not storing box score for game {game_id}", e)
+        return False
+    for g in games:
+        if g.get('gameId') == game_id:
+            return g.get('gameStatus') == STATUS_FINAL
+    try:
+        data = _fetch_upstream(boxscoresummaryv2.BoxScoreSummaryV2, game_id=game_id)
+        summary = project_result_set(data, GAME_SUMMARY_SCHEMA, name='GameSummary')
+    except Exception as e:
+        log_error(f"Error fetching game status for game {game_id}", e)
+        return False
+    return bool(summary) and summary[0]['status'] == STATUS_FINAL
+
+BOXSCORE_PLAYER_SCHEMA = (
+    Field('player_id', 'PLAYER_ID'),
+    Field('player_name', 'PLAYER_NAME'),
+    Field('team_id', 'TEAM_ID'),
+    Field('team_abbr', 'TEAM_ABBREVIATION'),
+    Field('min', 'MIN', _parse_minutes),
+    Field('pts', 'PTS'),
+    Field('reb', 'REB'),
+    Field('ast', 'AST'),
+    Field('stl', 'STL'),
+    Field('blk', 'BLK'),
+    Field('tov', 'TO'),
+    Field('fgm', 'FGM'),
+    Field('fga', 'FGA'),
+    Field('fg_pct', 'FG_PCT'),
+    Field('fg3m', 'FG3M'),
+    Field('fg3a', 'FG3A'),
+    Field('fg3_pct', 'FG3_PCT'),
+    Field('ftm', 'FTM'),
+    Field('fta', 'FTA'),
+    Field('ft_pct', 'FT_PCT')
+)
+BOXSCORE_TEAM_SCHEMA = (
+    Field('team_id', 'TEAM_ID'),
+    Field('team_abbr', 'TEAM_ABBREVIATION'),
+    Field('pts', 'PTS')
+)
+
+def _parse_boxscore(game_id, data):
+    players = project_result_set(data, BOXSCORE_PLAYER_SCHEMA, name='PlayerStats')
+    teams = project_result_set(data, BOXSCORE_TEAM_SCHEMA, name='TeamStats')
+    return {"game_id": game_id, "players": players, "teams": teams, "count": len(players)}
+
+def _stored_boxscore(game_id):
+    """A final game's box score from memory or the local store, else None."""
+    payload = boxscore_cache.get(game_id)
+    if payload is None:
+        payload = boxscore_store.get(game_id)
+        if payload is not None:
+            boxscore_cache.set(game_id, payload)
+    return payload
+
+def _load_boxscore(game_id):
+    stored = _stored_boxscore(game_id)
+    if stored is not None:
+        return stored
+
+    requested_at = time.time()
+    data = _fetch_upstream(boxscoretraditionalv2.BoxScoreTraditionalV2, game_id=game_id)
+    payload = _parse_boxscore(game_id, data)
+    if payload['players'] and _is_game_final(game_id):
+        key = make_cache_key('BoxScoreTraditionalV2', {'game_id': game_id})
+        stored_at = upstream_cache.stored_at(key)
+        if stored_at is not None and stored_at < requested_at:
+            # Served from a cache entry that may predate the final buzzer (fresh or
+            # stale-while-revalidate); what is stored for good is fetched again
+            upstream_cache.invalidate(key)
+            data = _fetch_upstream(boxscoretraditionalv2.BoxScoreTraditionalV2, game_id=game_id)
+            payload = _parse_boxscore(game_id, data)
+        if payload['players']:
+            boxscore_store.put(game_id, payload)
+    return payload
+
 @app.route('/games/<game_id>/boxscore', methods=['GET'])
 def get_game_boxscore(game_id):
     try:
-        global last_request_time
-        now = time.time()
-        if now - last_request_time < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-        last_request_time = time.time()
-
-        box = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id)
-        data = box.get_dict()
-
-        players = []
-        teams = []
-        for rs in data.get('resultSets', []):
-            if rs.get('name') == 'PlayerStats':
-                headers = rs.get('headers', [])
-                rows = rs.get('rowSet', [])
-
-                def idx(col):
-                    try:
-                        return headers.index(col)
-                    except ValueError:
-                        return -1
-
-                player_id_idx = idx('PLAYER_ID')
-                player_name_idx = idx('PLAYER_NAME')
-                team_id_idx = idx('TEAM_ID')
-                team_abbr_idx = idx('TEAM_ABBREVIATION')
-                min_idx = idx('MIN')
-                pts_idx = idx('PTS')
-                reb_idx = idx('REB')
-                ast_idx = idx('AST')
-                stl_idx = idx('STL')
-                blk_idx = idx('BLK')
-                tov_idx = idx('TO')
-                fgm_idx = idx('FGM')
-                fga_idx = idx('FGA')
-                fg_pct_idx = idx('FG_PCT')
-                fg3m_idx = idx('FG3M')
-                fg3a_idx = idx('FG3A')
-                fg3_pct_idx = idx('FG3_PCT')
-                ftm_idx = idx('FTM')
-                fta_idx = idx('FTA')
-                ft_pct_idx = idx('FT_PCT')
-
-                for row in rows:
-                    players.append({
-                        "player_id": row[player_id_idx] if player_id_idx >= 0 else None,
-                        "player_name": row[player_name_idx] if player_name_idx >= 0 else None,
-                        "team_id": row[team_id_idx] if team_id_idx >= 0 else None,
-                        "team_abbr": row[team_abbr_idx] if team_abbr_idx >= 0 else None,
-                        "min": _parse_minutes(row[min_idx]) if min_idx >= 0 else None,
-                        "pts": row[pts_idx] if pts_idx >= 0 else None,
-                        "reb": row[reb_idx] if reb_idx >= 0 else None,
-                        "ast": row[ast_idx] if ast_idx >= 0 else None,
-                        "stl": row[stl_idx] if stl_idx >= 0 else None,
-                        "blk": row[blk_idx] if blk_idx >= 0 else None,
-                        "tov": row[tov_idx] if tov_idx >= 0 else None,
-                        "fgm": row[fgm_idx] if fgm_idx >= 0 else None,
-                        "fga": row[fga_idx] if fga_idx >= 0 else None,
-                        "fg_pct": row[fg_pct_idx] if fg_pct_idx >= 0 else None,
-                        "fg3m": row[fg3m_idx] if fg3m_idx >= 0 else None,
-                        "fg3a": row[fg3a_idx] if fg3a_idx >= 0 else None,
-                        "fg3_pct": row[fg3_pct_idx] if fg3_pct_idx >= 0 else None,
-                        "ftm": row[ftm_idx] if ftm_idx >= 0 else None,
-                        "fta": row[fta_idx] if fta_idx >= 0 else None,
-                        "ft_pct": row[ft_pct_idx] if ft_pct_idx >= 0 else None
-                    })
-                break
-            if rs.get('name') == 'TeamStats':
-                headers = rs.get('headers', [])
-                rows = rs.get('rowSet', [])
-
-                def idx(col):
-                    try:
-                        return headers.index(col)
-                    except ValueError:
-                        return -1
-
-                team_id_idx = idx('TEAM_ID')
-                team_abbr_idx = idx('TEAM_ABBREVIATION')
-                pts_idx = idx('PTS')
-
-                for row in rows:
-                    teams.append({
-                        "team_id": row[team_id_idx] if team_id_idx >= 0 else None,
-                        "team_abbr": row[team_abbr_idx] if team_abbr_idx >= 0 else None,
-                        "pts": row[pts_idx] if pts_idx >= 0 else None
-                    })
-
-        return jsonify({"game_id": game_id, "players": players, "teams": teams, "count": len(players)})
+        stored = _stored_boxscore(game_id)
+        if stored is not None:
+            return encoded(stored).response()
+        return jsonify(_load_boxscore(game_id))
     except Exception as e:
-        print(f"Error fetching boxscore for game {game_id}: {e}")
+        log_error(f"Error fetching boxscore for game {game_id}", e)
         return jsonify({"game_id": game_id, "players": [], "error": str(e)}), 500
 
+def _load_boxscore_line(game_id):
+    try:
+        payload = _load_boxscore(game_id)
+    except Exception as e:
+        log_error(f"Error fetching boxscore for game {game_id}", e)
+        payload = {"game_id": game_id, "players": [], "error": str(e)}
+    return dumps(payload)
+
+@app.route('/games/boxscores', methods=['POST'])
+def get_game_boxscores():
+    """
+    Stream box scores for a list of games as NDJSON, one object per line in
+    request order (duplicates dropped). Body: {"game_ids": ["0022500001", ...]}.
+    Games missing from the local store are fetched concurrently; a game that
+    fails becomes an error line and the stream goes on.
+    """
+    body = request.get_json(silent=True) or {}
+    game_ids = body.get('game_ids') if isinstance(body, dict) else body
+    if not isinstance(game_ids, list) or not game_ids:
+        return jsonify({"error": "Request body must contain a non-empty 'game_ids' list"}), 400
+    game_ids = list(dict.fromkeys(str(game_id) for game_id in game_ids))
+    if len(game_ids) > BOXSCORE_BATCH_LIMIT:
+        return jsonify({"error": f"At most {BOXSCORE_BATCH_LIMIT} game ids per request"}), 400
+
+    def generate():
+        stored = {game_id: _stored_boxscore(game_id) for game_id in game_ids}
+        futures = {
+            game_id: boxscore_executor.submit(_load_boxscore_line, game_id)
+            for game_id, payload in stored.items() if payload is None
+        }
+        for game_id in game_ids:
+            if stored[game_id] is not None:
+                yield dumps(stored[game_id])
+            else:
+                yield futures[game_id].result()
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/standings', methods=['GET'])
 def get_standings():
     try:
         # Fetch current 2025-26 standings
-        standings = leaguestandings.LeagueStandings(season='2025-26')
-        data = standings.get_dict()
+        data = _fetch_upstream(leaguestandings.LeagueStandings, season='2025-26')
         
         # Current 'standings.js' expects: { east: [], west: [] }
         # nba_api returns a 'Standings' result set with 'Conference' column
@@ -337,13 +495,68 @@ def get_standings():
         return jsonify({"east": east, "west": west})
 
     except Exception as e:
-        print(f"Error fetching standings: {e}")
+        log_error("Error fetching standings", e)
         return jsonify({"east": [], "west": [], "error": str(e)}), 500
 
 @app.route('/health', methods=['GET'])
 def health():
+    # Liveness only: answers as soon as the port is bound, whatever the upstream is doing
     return jsonify({"status": "up"})
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    status = warmup.status()
+    # A failed job (retried until its retries run out) keeps the worker out of rotation
+    if status["ready"]:
+        status["status"] = "ready"
+    else:
+        status["status"] = "failed" if status["finished"] and status["failed"] else "warming"
+    status["caches"] = {
+        "scoreboard": scoreboard_poller.stats()["snapshot_version"] is not None,
+        "team_rankings": len(team_rankings_cache) > 0,
+        "usage_rates": len(usage_rates_cache) > 0,
+        "upstream": len(upstream_cache) > 0
+    }
+    status["uptime_seconds"] = round(time.time() - PROCESS_STARTED, 1)
+    return jsonify(status), 200 if status["ready"] else 503
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        "caches": [cache.stats() for cache in (upstream_cache, team_rankings_cache, team_totals_cache, usage_rates_cache, career_cache, boxscore_cache)],
+        "payloads": payload_memo.stats(),
+        "throttle": upstream_limiter.stats(),
+        "scoreboard": scoreboard_poller.stats(),
+        "game_stream": game_stream.stats(),
+        "single_flight": upstream_flight.stats(),
+        "shared_state": shared_state.stats() if shared_state is not None else None,
+        "player_directory": player_directory.stats()
+    })
+
+def _collect_service_metrics():
+    throttle = upstream_limiter.stats()
+    flight = upstream_flight.stats()
+    payloads = payload_memo.stats()
+    poller = scoreboard_poller.stats()
+    stream = game_stream.stats()
+    yield 'nba_upstream_throttle_waiting', 'gauge', 'Callers currently sleeping in the rate limiter.', [({}, throttle['waiting'])]
+    yield 'nba_upstream_throttle_rejected_total', 'counter', 'Calls refused by the rate limiter.', [({}, throttle['rejected'])]
+    yield 'nba_upstream_coalesced_total', 'counter', 'Upstream calls shared with an identical in-flight call.', [({}, flight['coalesced'])]
+    yield 'nba_payload_memo_hits_total', 'counter', 'Responses served from an already encoded payload.', [({}, payloads['hits'])]
+    yield 'nba_payload_memo_misses_total', 'counter', 'Payloads encoded for a new cached value.', [({}, payloads['misses'])]
+    yield 'nba_scoreboard_polls_total', 'counter', 'Successful scoreboard polls.', [({}, poller['polls'])]
+    yield 'nba_scoreboard_poll_errors_total', 'counter', 'Failed scoreboard polls.', [({}, poller['errors'])]
+    if poller['snapshot_age_seconds'] is not None:
+        yield 'nba_scoreboard_snapshot_age_seconds', 'gauge', 'Age of the scoreboard snapshot being served.', [({}, poller['snapshot_age_seconds'])]
+    yield 'nba_game_stream_subscribers', 'gauge', 'Connected /games/stream clients.', [({}, stream['subscribers'])]
+    yield 'nba_game_stream_events_total', 'counter', 'Events published to /games/stream.', [({}, stream['events'])]
+    jobs = warmup.status()['jobs']
+    yield 'nba_warmup_job_seconds', 'gauge', 'Run time of each startup warmup job (0 until it finishes).', [
+        ({"job": name, "state": job['state']}, job['seconds'] or 0) for name, job in jobs.items()
+    ]
+
+registry.add_collector(_collect_service_metrics)
+
 # NBA Team abbreviation to ID mapping
 NBA_TEAM_IDS = {
     'ATL': 1610612737, 'BOS': 1610612738, 'BKN': 1610612751, 'CHA': 1610612766,
@@ -359,6 +572,15 @@ NBA_TEAM_IDS = {
 # Reverse mapping: ID to abbreviation
 NBA_ID_TO_ABBREV = {v: k for k, v in NBA_TEAM_IDS.items()}
 
+TEAM_GAME_SCHEMA = (
+    Field('id', 'GAME_ID'),
+    Field('game_date', 'GAME_DATE', default=''),
+    Field('matchup', 'MATCHUP', default=''),
+    Field('wl', 'WL', default=''),
+    Field('pts', 'PTS', default=0),
+    Field('plus_minus', 'PLUS_MINUS')
+)
+
 @app.route('/teams/<int:team_id>/games', methods=['GET'])
 def get_team_games(team_id):
     """
@@ -368,101 +590,79 @@ def get_team_games(team_id):
     try:
         limit = request.args.get('limit', 5, type=int)
         
-        # Rate limiting
-        global last_request_time
-        now = time.time()
-        if now - last_request_time < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-        last_request_time = time.time()
-        
         # Get games from the last 60 days using LeagueGameFinder (has current season data)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=60)
         
-        finder = leaguegamefinder.LeagueGameFinder(
+        data = _fetch_upstream(
+            leaguegamefinder.LeagueGameFinder,
             team_id_nullable=team_id,
             date_from_nullable=start_date.strftime('%m/%d/%Y'),
             date_to_nullable=end_date.strftime('%m/%d/%Y')
         )
-        
-        data = finder.get_dict()
         games_list = []
         
-        if 'resultSets' in data and len(data['resultSets']) > 0:
-            headers = data['resultSets'][0]['headers']
-            rows = data['resultSets'][0]['rowSet']
-            
-            # Get column indices
-            def get_idx(col):
-                try:
-                    return headers.index(col)
-                except ValueError:
-                    return -1
+        # Process last N games (rows are already in reverse chronological order)
+        for i, game in enumerate(project_result_set(data, TEAM_GAME_SCHEMA, limit=limit)):
+            game_date = game['game_date']
+            matchup = game['matchup']
+            wl = game['wl']
+            pts = game['pts']
+
+            # Parse matchup to get opponent and home/away
+            # Format is like "OKC vs. MIN" (home) or "OKC @ DAL" (away)
+            is_home = ' vs. ' in matchup
+            if is_home:
+                parts = matchup.split(' vs. ')
+                opponent_abbrev = parts[1] if len(parts) > 1 else 'UNK'
+            else:
+                parts = matchup.split(' @ ')
+                opponent_abbrev = parts[1] if len(parts) > 1 else 'UNK'
             
-            game_id_idx = get_idx('GAME_ID')
-            game_date_idx = get_idx('GAME_DATE')
-            matchup_idx = get_idx('MATCHUP')
-            wl_idx = get_idx('WL')
-            pts_idx = get_idx('PTS')
-            plus_minus_idx = get_idx('PLUS_MINUS')
+            # Calculate opponent score using plus/minus
+            opp_pts = 0
+            if game['plus_minus'] is not None:
+                opp_pts = pts - game['plus_minus']
             
-            # Get the team's abbreviation
-            team_abbrev = NBA_ID_TO_ABBREV.get(team_id, 'UNK')
+            # Format date nicely
+            try:
+                date_obj = datetime.strptime(game_date, '%Y-%m-%d')
+                formatted_date = date_obj.strftime('%b %d')
+            except:
+                formatted_date = game_date
             
-            # Process last N games (rows are already in reverse chronological order)
-            for i, row in enumerate(rows[:limit]):
-                game_date = row[game_date_idx] if game_date_idx >= 0 else ''
-                matchup = row[matchup_idx] if matchup_idx >= 0 else ''
-                wl = row[wl_idx] if wl_idx >= 0 else ''
-                pts = row[pts_idx] if pts_idx >= 0 else 0
-                
-                # Parse matchup to get opponent and home/away
-                # Format is like "OKC vs. MIN" (home) or "OKC @ DAL" (away)
-                is_home = ' vs. ' in matchup
-                if is_home:
-                    parts = matchup.split(' vs. ')
-                    opponent_abbrev = parts[1] if len(parts) > 1 else 'UNK'
-                else:
-                    parts = matchup.split(' @ ')
-                    opponent_abbrev = parts[1] if len(parts) > 1 else 'UNK'
-                
-                # Calculate opponent score using plus/minus
-                opp_pts = 0
-                if plus_minus_idx >= 0 and row[plus_minus_idx] is not None:
-                    plus_minus = row[plus_minus_idx]
-                    opp_pts = pts - plus_minus
-                
-                # Format date nicely
-                try:
-                    date_obj = datetime.strptime(game_date, '%Y-%m-%d')
-                    formatted_date = date_obj.strftime('%b %d')
-                except:
-                    formatted_date = game_date
-                
-                game_obj = {
-                    "id": row[game_id_idx] if game_id_idx >= 0 else i,
-                    "date": game_date,
-                    "formatted_date": formatted_date,
-                    "matchup": matchup,
-                    "result": wl,
-                    "win": wl == 'W',
-                    "team_score": pts,
-                    "opponent_score": int(opp_pts) if opp_pts else 0,
-                    "opponent": opponent_abbrev,
-                    "is_home": is_home,
-                    "display_opponent": f"{'vs' if is_home else 'at'} {opponent_abbrev}",
-                    "display_result": f"{'W' if wl == 'W' else 'L'} {pts}-{int(opp_pts) if opp_pts else '?'}"
-                }
-                games_list.append(game_obj)
+            game_obj = {
+                "id": game['id'] if game['id'] is not None else i,
+                "date": game_date,
+                "formatted_date": formatted_date,
+                "matchup": matchup,
+                "result": wl,
+                "win": wl == 'W',
+                "team_score": pts,
+                "opponent_score": int(opp_pts) if opp_pts else 0,
+                "opponent": opponent_abbrev,
+                "is_home": is_home,
+                "display_opponent": f"{'vs' if is_home else 'at'} {opponent_abbrev}",
+                "display_result": f"{'W' if wl == 'W' else 'L'} {pts}-{int(opp_pts) if opp_pts else '?'}"
+            }
+            games_list.append(game_obj)
         
         return jsonify({"data": games_list, "team_id": team_id})
         
     except Exception as e:
-        print(f"Error fetching team games: {e}")
-        import traceback
-        traceback.print_exc()
+        log_error("Error fetching team games", e)
         return jsonify({"data": [], "error": str(e)}), 500
 
+TEAM_LEADER_SCHEMA = (
+    Field('name', 'PLAYER_NAME', default='Unknown'),
+    Field('gp', 'GP', default=1),
+    Field('pts', 'PTS', default=0),
+    Field('reb', 'REB', default=0),
+    Field('ast', 'AST', default=0),
+    Field('stl', 'STL', default=0),
+    Field('blk', 'BLK', default=0)
+)
+
 @app.route('/teams/<int:team_id>/leaders', methods=['GET'])
 def get_team_leaders(team_id):
     """
@@ -470,87 +670,65 @@ def get_team_leaders(team_id):
     Returns the top scorer, rebounder, and assists leader with current season stats.
     """
     try:
-        # Rate limiting
-        global last_request_time
-        now = time.time()
-        if now - last_request_time < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-        last_request_time = time.time()
-        
         # Fetch team player stats for current season (2025-26)
-        dashboard = teamplayerdashboard.TeamPlayerDashboard(
+        data = _fetch_upstream(
+            teamplayerdashboard.TeamPlayerDashboard,
             team_id=team_id,
             season='2025-26'
         )
         
-        data = dashboard.get_dict()
-        
-        # Find the PlayersSeasonTotals result set
-        players = []
-        for rs in data.get('resultSets', []):
-            if 'Player' in rs.get('name', ''):
-                headers = rs['headers']
-                rows = rs.get('rowSet', [])
-                
-                # Get column indices
-                name_idx = headers.index('PLAYER_NAME') if 'PLAYER_NAME' in headers else -1
-                gp_idx = headers.index('GP') if 'GP' in headers else -1
-                pts_idx = headers.index('PTS') if 'PTS' in headers else -1
-                reb_idx = headers.index('REB') if 'REB' in headers else -1
-                ast_idx = headers.index('AST') if 'AST' in headers else -1
-                stl_idx = headers.index('STL') if 'STL' in headers else -1
-                blk_idx = headers.index('BLK') if 'BLK' in headers else -1
-                
-                for row in rows:
-                    gp = row[gp_idx] if gp_idx >= 0 else 1
-                    if gp > 0:
-                        players.append({
-                            'name': row[name_idx] if name_idx >= 0 else 'Unknown',
-                            'ppg': round(row[pts_idx] / gp, 1) if pts_idx >= 0 else 0,
-                            'rpg': round(row[reb_idx] / gp, 1) if reb_idx >= 0 else 0,
-                            'apg': round(row[ast_idx] / gp, 1) if ast_idx >= 0 else 0,
-                            'spg': round(row[stl_idx] / gp, 1) if stl_idx >= 0 else 0,
-                            'bpg': round(row[blk_idx] / gp, 1) if blk_idx >= 0 else 0,
-                            'gp': gp
-                        })
-                break
+        with span('compute'):
+            # Find the PlayersSeasonTotals result set
+            players = []
+            for row in project_result_set(data, TEAM_LEADER_SCHEMA, contains='Player'):
+                gp = row['gp']
+                if gp > 0:
+                    players.append({
+                        'name': row['name'],
+                        'ppg': round(row['pts'] / gp, 1),
+                        'rpg': round(row['reb'] / gp, 1),
+                        'apg': round(row['ast'] / gp, 1),
+                        'spg': round(row['stl'] / gp, 1),
+                        'bpg': round(row['blk'] / gp, 1),
+                        'gp': gp
+                    })
         
-        if not players:
-            return jsonify({"leaders": [], "roster": [], "error": "No player data found"}), 404
+            if not players:
+                return jsonify({"leaders": [], "roster": [], "error": "No player data found"}), 404
         
-        # Find leaders in each category
-        pts_leader = max(players, key=lambda x: x['ppg'])
-        reb_leader = max(players, key=lambda x: x['rpg'])
-        ast_leader = max(players, key=lambda x: x['apg'])
+            # Find leaders in each category
+            pts_leader = max(players, key=lambda x: x['ppg'])
+            reb_leader = max(players, key=lambda x: x['rpg'])
+            ast_leader = max(players, key=lambda x: x['apg'])
         
-        # Format leader's name (just last name for display)
-        def get_last_name(full_name):
-            parts = full_name.split()
-            return parts[-1] if parts else full_name
+            # Format leader's name (just last name for display)
+            def get_last_name(full_name):
+                parts = full_name.split()
+                return parts[-1] if parts else full_name
         
-        leaders = [
-            {
-                "category": "Points",
-                "name": get_last_name(pts_leader['name']),
-                "full_name": pts_leader['name'],
-                "value": f"{pts_leader['ppg']} PPG"
-            },
-            {
-                "category": "Rebounds",
-                "name": get_last_name(reb_leader['name']),
-                "full_name": reb_leader['name'],
-                "value": f"{reb_leader['rpg']} RPG"
-            },
-            {
-                "category": "Assists",
-                "name": get_last_name(ast_leader['name']),
-                "full_name": ast_leader['name'],
-                "value": f"{ast_leader['apg']} APG"
-            }
-        ]
+            leaders = [
+                {
+                    "category": "Points",
+                    "name": get_last_name(pts_leader['name']),
+                    "full_name": pts_leader['name'],
+                    "value": f"{pts_leader['ppg']} PPG"
+                },
+                {
+                    "category": "Rebounds",
+                    "name": get_last_name(reb_leader['name']),
+                    "full_name": reb_leader['name'],
+                    "value": f"{reb_leader['rpg']} RPG"
+                },
+                {
+                    "category": "Assists",
+                    "name": get_last_name(ast_leader['name']),
+                    "full_name": ast_leader['name'],
+                    "value": f"{ast_leader['apg']} APG"
+                }
+            ]
         
-        # Sort roster by PPG for the top 5 players
-        roster = sorted(players, key=lambda x: x['ppg'], reverse=True)[:5]
+            # Sort roster by PPG for the top 5 players
+            roster = sorted(players, key=lambda x: x['ppg'], reverse=True)[:5]
         
         return jsonify({
             "leaders": leaders,
@@ -559,39 +737,21 @@ def get_team_leaders(team_id):
         })
         
     except Exception as e:
-        print(f"Error fetching team leaders: {e}")
-        import traceback
-        traceback.print_exc()
+        log_error("Error fetching team leaders", e)
         return jsonify({"leaders": [], "roster": [], "error": str(e)}), 500
 
-def _format_pct(value):
-    if value is None:
-        return 0.0
-    if value <= 1.1:
-        return round(value * 100, 1)
-    return round(value, 1)
-
-def _get_numeric(source, col, default=0.0):
-    if not col:
-        return default
-    value = source.get(col) if isinstance(source, dict) else source[col]
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return default
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return default
-
+@span('compute')
 def _build_team_rankings(season):
-    name_to_abbr = _build_team_abbr_map()
-    base_stats = leaguedashteamstats.LeagueDashTeamStats(
+    base_stats = _fetch_upstream(
+        leaguedashteamstats.LeagueDashTeamStats,
         season=season,
         per_mode_detailed='PerGame',
         measure_type_detailed_defense='Base',
         season_type_all_star='Regular Season',
         league_id_nullable='00'
     )
-    opp_stats = leaguedashteamstats.LeagueDashTeamStats(
+    opp_stats = _fetch_upstream(
+        leaguedashteamstats.LeagueDashTeamStats,
         season=season,
         per_mode_detailed='PerGame',
         measure_type_detailed_defense='Opponent',
@@ -601,109 +761,7 @@ def _build_team_rankings(season):
 
     df_base = _extract_team_stats_frame(base_stats)
     df_opp = _extract_team_stats_frame(opp_stats)
-
-    base_cols = df_base.columns
-    opp_cols = df_opp.columns
-
-    team_id_col = _pick_column(base_cols, ['TEAM_ID'])
-    team_abbr_col = _pick_column(base_cols, ['TEAM_ABBREVIATION'])
-    team_name_col = _pick_column(base_cols, ['TEAM_NAME'])
-    wins_col = _pick_column(base_cols, ['W'])
-    losses_col = _pick_column(base_cols, ['L'])
-
-    pts_col = _pick_column(base_cols, ['PTS', 'PTS_PG'])
-    fg_pct_col = _pick_column(base_cols, ['FG_PCT'])
-    fg3_pct_col = _pick_column(base_cols, ['FG3_PCT'])
-    ft_pct_col = _pick_column(base_cols, ['FT_PCT'])
-    ast_col = _pick_column(base_cols, ['AST'])
-    tov_col = _pick_column(base_cols, ['TOV'])
-    blk_col = _pick_column(base_cols, ['BLK'])
-    stl_col = _pick_column(base_cols, ['STL'])
-    reb_col = _pick_column(base_cols, ['REB'])
-
-    opp_team_id_col = _pick_column(opp_cols, ['TEAM_ID'])
-    opp_team_abbr_col = _pick_column(opp_cols, ['TEAM_ABBREVIATION'])
-    opp_pts_col = _pick_column(opp_cols, ['OPP_PTS', 'PTS', 'PTS_PG'])
-    opp_fg_pct_col = _pick_column(opp_cols, ['OPP_FG_PCT', 'FG_PCT'])
-    opp_fg3_pct_col = _pick_column(opp_cols, ['OPP_FG3_PCT', 'FG3_PCT'])
-
-    if not all([pts_col, fg_pct_col, fg3_pct_col, ft_pct_col, ast_col, tov_col, blk_col, stl_col, reb_col]):
-        raise ValueError(f"Missing required base stat columns from NBA stats response. Columns: {list(base_cols)}")
-    if not all([opp_pts_col, opp_fg_pct_col, opp_fg3_pct_col]):
-        raise ValueError(f"Missing required opponent stat columns from NBA stats response. Columns: {list(opp_cols)}")
-
-    df_base['PTS_RANK'] = df_base[pts_col].rank(ascending=False, method='min').astype(int)
-    df_base['FG_PCT_RANK'] = df_base[fg_pct_col].rank(ascending=False, method='min').astype(int)
-    df_base['FG3_PCT_RANK'] = df_base[fg3_pct_col].rank(ascending=False, method='min').astype(int)
-    df_base['FT_PCT_RANK'] = df_base[ft_pct_col].rank(ascending=False, method='min').astype(int)
-    df_base['AST_RANK'] = df_base[ast_col].rank(ascending=False, method='min').astype(int)
-    df_base['TOV_RANK'] = df_base[tov_col].rank(ascending=True, method='min').astype(int)
-    df_base['BLK_RANK'] = df_base[blk_col].rank(ascending=False, method='min').astype(int)
-    df_base['STL_RANK'] = df_base[stl_col].rank(ascending=False, method='min').astype(int)
-    df_base['REB_RANK'] = df_base[reb_col].rank(ascending=False, method='min').astype(int)
-
-    df_opp['OPP_PTS_RANK'] = df_opp[opp_pts_col].rank(ascending=True, method='min').astype(int)
-    df_opp['OPP_FG_PCT_RANK'] = df_opp[opp_fg_pct_col].rank(ascending=True, method='min').astype(int)
-    df_opp['OPP_FG3_PCT_RANK'] = df_opp[opp_fg3_pct_col].rank(ascending=True, method='min').astype(int)
-
-    opp_by_team_id = {}
-    opp_by_team_abbr = {}
-    if opp_team_id_col:
-        opp_by_team_id = df_opp.set_index(opp_team_id_col).to_dict(orient='index')
-    if opp_team_abbr_col:
-        opp_by_team_abbr = df_opp.set_index(opp_team_abbr_col).to_dict(orient='index')
-
-    teams_data = {}
-    for _, row in df_base.iterrows():
-        team_id = int(row[team_id_col]) if team_id_col and not pd.isna(row[team_id_col]) else None
-        team_name = row[team_name_col] if team_name_col else None
-        if team_abbr_col:
-            team_abbr = row[team_abbr_col]
-        else:
-            team_abbr = name_to_abbr.get(_normalize_team_name(team_name), team_name)
-        opp_row = None
-        if team_id is not None and team_id in opp_by_team_id:
-            opp_row = opp_by_team_id[team_id]
-        elif team_abbr in opp_by_team_abbr:
-            opp_row = opp_by_team_abbr[team_abbr]
-        else:
-            opp_row = {}
-
-        teams_data[team_abbr] = {
-            'teamId': team_id,
-            'teamName': team_name if team_name else team_abbr,
-            'teamAbbr': team_abbr,
-            'wins': int(row[wins_col]) if wins_col else 0,
-            'losses': int(row[losses_col]) if losses_col else 0,
-            'offense': {
-                'ppg': round(_get_numeric(row, pts_col), 1),
-                'ppgRank': _format_rank(row['PTS_RANK']),
-                'fgPct': _format_pct(_get_numeric(row, fg_pct_col)),
-                'fgPctRank': _format_rank(row['FG_PCT_RANK']),
-                'fg3Pct': _format_pct(_get_numeric(row, fg3_pct_col)),
-                'fg3PctRank': _format_rank(row['FG3_PCT_RANK']),
-                'ftPct': _format_pct(_get_numeric(row, ft_pct_col)),
-                'ftPctRank': _format_rank(row['FT_PCT_RANK']),
-                'ast': round(_get_numeric(row, ast_col), 1),
-                'astRank': _format_rank(row['AST_RANK']),
-                'to': round(_get_numeric(row, tov_col), 1),
-                'toRank': _format_rank(row['TOV_RANK'])
-            },
-            'defense': {
-                'oppg': round(_get_numeric(opp_row, opp_pts_col), 1),
-                'oppgRank': _format_rank(opp_row.get('OPP_PTS_RANK', 0)),
-                'ofgPct': _format_pct(_get_numeric(opp_row, opp_fg_pct_col)),
-                'ofgPctRank': _format_rank(opp_row.get('OPP_FG_PCT_RANK', 0)),
-                'o3fgPct': _format_pct(_get_numeric(opp_row, opp_fg3_pct_col)),
-                'o3fgPctRank': _format_rank(opp_row.get('OPP_FG3_PCT_RANK', 0)),
-                'blk': round(_get_numeric(row, blk_col), 1),
-                'blkRank': _format_rank(row['BLK_RANK']),
-                'stl': round(_get_numeric(row, stl_col), 1),
-                'stlRank': _format_rank(row['STL_RANK']),
-                'reb': round(_get_numeric(row, reb_col), 1),
-                'rebRank': _format_rank(row['REB_RANK'])
-            }
-        }
+    teams_data = build_team_rankings(df_base, df_opp)
 
     return {
         'lastUpdated': datetime.utcnow().isoformat() + 'Z',
@@ -714,223 +772,176 @@ def _build_team_rankings(season):
 @app.route('/team-rankings', methods=['GET'])
 def get_team_rankings():
     season = request.args.get('season', DEFAULT_SEASON)
-    now = time.time()
-    cached = team_rankings_cache.get(season)
-    if cached and now - cached['timestamp'] < TEAM_RANKINGS_TTL:
-        return jsonify(cached['data'])
-
     try:
-        data = _build_team_rankings(season)
-        team_rankings_cache[season] = {"timestamp": now, "data": data}
-        return jsonify(data)
+        data = team_rankings_cache.get_or_load(season, lambda: _build_team_rankings(season))
+        return encoded(data).response()
     except Exception as e:
-        print(f"Error fetching team rankings: {e}")
-        import traceback
-        traceback.print_exc()
+        log_error("Error fetching team rankings", e)
         return jsonify({"teams": {}, "error": str(e)}), 500
 
 @app.route('/team-differentials/refresh', methods=['POST'])
 def refresh_team_differentials():
     try:
-        output = generate_team_differentials()
+        # League-wide by default: one upstream call covers all 30 teams
+        mode = request.args.get('mode', 'league')
+        if mode not in DIFFERENTIALS_MODES:
+            return jsonify({"status": "error", "error": f"mode must be one of {list(DIFFERENTIALS_MODES)}"}), 400
+        output = generate_team_differentials(mode=mode, limiter=upstream_limiter)
         return jsonify({"status": "ok", "output": output})
     except Exception as e:
-        print(f"Error refreshing team differentials: {e}")
-        import traceback
-        traceback.print_exc()
+        log_error("Error refreshing team differentials", e)
         return jsonify({"status": "error", "error": str(e)}), 500
 
+PLAYER_GAMELOG_SCHEMA = (
+    Field('game_id', 'Game_ID'),
+    Field('game_date', 'GAME_DATE'),
+    Field('matchup', 'MATCHUP'),
+    Field('wl', 'WL'),
+    Field('min', 'MIN'),
+    Field('pts', 'PTS'),
+    Field('reb', 'REB'),
+    Field('ast', 'AST'),
+    Field('stl', 'STL'),
+    Field('blk', 'BLK'),
+    Field('fgm', 'FGM'),
+    Field('fga', 'FGA'),
+    Field('fg_pct', 'FG_PCT')
+)
+
 @app.route('/players/<int:player_id>/gamelog', methods=['GET'])
 def get_player_gamelog(player_id):
     try:
         limit = request.args.get('limit', 5, type=int)
 
-        global last_request_time
-        now = time.time()
-        if now - last_request_time < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-        last_request_time = time.time()
-
-        log = playergamelog.PlayerGameLog(player_id=player_id)
-        data = log.get_dict()
-
-        games = []
-        if 'resultSets' in data and len(data['resultSets']) > 0:
-            headers = data['resultSets'][0]['headers']
-            rows = data['resultSets'][0]['rowSet']
-
-            def idx(col):
-                try:
-                    return headers.index(col)
-                except ValueError:
-                    return -1
-
-            game_id_idx = idx('Game_ID')
-            game_date_idx = idx('GAME_DATE')
-            matchup_idx = idx('MATCHUP')
-            wl_idx = idx('WL')
-            min_idx = idx('MIN')
-            pts_idx = idx('PTS')
-            reb_idx = idx('REB')
-            ast_idx = idx('AST')
-            stl_idx = idx('STL')
-            blk_idx = idx('BLK')
-            fgm_idx = idx('FGM')
-            fga_idx = idx('FGA')
-            fg_pct_idx = idx('FG_PCT')
-
-            for row in rows[:limit]:
-                games.append({
-                    "game_id": row[game_id_idx] if game_id_idx >= 0 else None,
-                    "game_date": row[game_date_idx] if game_date_idx >= 0 else None,
-                    "matchup": row[matchup_idx] if matchup_idx >= 0 else None,
-                    "wl": row[wl_idx] if wl_idx >= 0 else None,
-                    "min": row[min_idx] if min_idx >= 0 else None,
-                    "pts": row[pts_idx] if pts_idx >= 0 else None,
-                    "reb": row[reb_idx] if reb_idx >= 0 else None,
-                    "ast": row[ast_idx] if ast_idx >= 0 else None,
-                    "stl": row[stl_idx] if stl_idx >= 0 else None,
-                    "blk": row[blk_idx] if blk_idx >= 0 else None,
-                    "fgm": row[fgm_idx] if fgm_idx >= 0 else None,
-                    "fga": row[fga_idx] if fga_idx >= 0 else None,
-                    "fg_pct": row[fg_pct_idx] if fg_pct_idx >= 0 else None
-                })
+        data = _fetch_upstream(playergamelog.PlayerGameLog, player_id=player_id)
+
+        games = project_result_set(data, PLAYER_GAMELOG_SCHEMA, limit=limit)
 
         return jsonify({"player_id": player_id, "games": games, "count": len(games)})
     except Exception as e:
-        print(f"Error fetching player gamelog: {e}")
+        log_error("Error fetching player gamelog", e)
         return jsonify({"player_id": player_id, "games": [], "error": str(e)}), 500
 
 # Constants for usage rate calculations
 FTA_FACTOR = 0.44  # Standard NBA free throw possession factor
 
+TEAM_TOTALS_SCHEMA = (
+    Field('team_min', 'MIN', default=0),
+    Field('team_fga', 'FGA', default=0),
+    Field('team_fta', 'FTA', default=0),
+    Field('team_tov', 'TOV', default=0),
+    Field('team_fgm', 'FGM', default=0),
+    Field('team_reb', 'REB', default=0),
+    Field('team_oreb', 'OREB', default=0),
+    Field('team_dreb', 'DREB', default=0),
+    Field('games_played', 'GP', default=0)
+)
+PLAYER_TOTALS_SCHEMA = (
+    Field('season_id', 'SEASON_ID'),
+    Field('team_id', 'TEAM_ID'),
+    Field('min', 'MIN', default=0),
+    Field('fga', 'FGA', default=0),
+    Field('fta', 'FTA', default=0),
+    Field('tov', 'TOV', default=0),
+    Field('ast', 'AST', default=0),
+    Field('reb', 'REB', default=0),
+    Field('fgm', 'FGM', default=0),
+    Field('gp', 'GP', default=0)
+)
+
 def _get_team_season_totals(team_id, season):
     """
     Fetch team season totals for usage rate calculations.
     Uses caching to avoid rate limiting.
     """
     cache_key = f"{team_id}_{season}"
-    now = time.time()
-    
+
     # Check cache first
-    if cache_key in team_totals_cache:
-        cached = team_totals_cache[cache_key]
-        if now - cached['timestamp'] < TEAM_TOTALS_TTL:
-            return cached['data']
-    
-    # Rate limiting
-    global last_request_time
-    if now - last_request_time < MIN_REQUEST_INTERVAL:
-        time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-    last_request_time = time.time()
-    
+    cached = team_totals_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         # Fetch team dashboard stats
-        dashboard = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(
+        data = _fetch_upstream(
+            teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits,
             team_id=team_id,
             season=season,
             per_mode_detailed='Totals',
             season_type_all_star='Regular Season'
         )
-        data = dashboard.get_dict()
         
         # Find Overall team stats
-        for rs in data.get('resultSets', []):
-            if rs.get('name') == 'OverallTeamDashboard':
-                headers = rs.get('headers', [])
-                rows = rs.get('rowSet', [])
-                
-                if rows:
-                    row = rows[0]
-                    
-                    def get_idx(col):
-                        try:
-                            return headers.index(col)
-                        except ValueError:
-                            return -1
-                    
-                    totals = {
-                        'team_min': row[get_idx('MIN')] if get_idx('MIN') >= 0 else 0,
-                        'team_fga': row[get_idx('FGA')] if get_idx('FGA') >= 0 else 0,
-                        'team_fta': row[get_idx('FTA')] if get_idx('FTA') >= 0 else 0,
-                        'team_tov': row[get_idx('TOV')] if get_idx('TOV') >= 0 else 0,
-                        'team_fgm': row[get_idx('FGM')] if get_idx('FGM') >= 0 else 0,
-                        'team_reb': row[get_idx('REB')] if get_idx('REB') >= 0 else 0,
-                        'team_oreb': row[get_idx('OREB')] if get_idx('OREB') >= 0 else 0,
-                        'team_dreb': row[get_idx('DREB')] if get_idx('DREB') >= 0 else 0,
-                        'games_played': row[get_idx('GP')] if get_idx('GP') >= 0 else 0
-                    }
-                    
-                    # Cache the result
-                    team_totals_cache[cache_key] = {'timestamp': now, 'data': totals}
-                    return totals
+        rows = project_result_set(data, TEAM_TOTALS_SCHEMA, name='OverallTeamDashboard', limit=1)
+        if rows:
+            totals = rows[0]
+            # Cache the result
+            team_totals_cache.set(cache_key, totals)
+            return totals
         
         return None
     except Exception as e:
-        print(f"Error fetching team totals for {team_id}: {e}")
+        log_error(f"Error fetching team totals for {team_id}", e)
         return None
 
+def _season_start_year(season):
+    return int(str(season)[:4])
+
+def _current_season_start_year(today=None):
+    today = today or datetime.now()
+    # A season starts in October and is not complete until the next one starts
+    return today.year if today.month >= 10 else today.year - 1
+
+def _is_completed_season(season, today=None):
+    try:
+        return _season_start_year(season) < _current_season_start_year(today)
+    except ValueError:
+        return False
+
+def _load_career_seasons(player_id):
+    """
+    Fetch a player's regular-season totals as {season_id: totals} and store
+    the completed seasons permanently.
+    """
+    params = {'player_id': player_id, 'per_mode36': 'Totals'}
+    data = upstream_flight.do(
+        make_cache_key('PlayerCareerStats', params),
+        lambda: _call_upstream(playercareerstats.PlayerCareerStats, **params)
+    )
+    seasons = {}
+    for row in project_result_set(data, PLAYER_TOTALS_SCHEMA, name='SeasonTotalsRegularSeason'):
+        # Season format in API is like "2025-26"; a traded player's last row for a season wins
+        seasons[row.pop('season_id')] = row
+    completed = {season_id: row for season_id, row in seasons.items() if _is_completed_season(season_id)}
+    if completed:
+        career_store.put_seasons(player_id, completed)
+    return seasons
+
 def _get_player_season_totals(player_id, season):
     """
     Fetch player season totals for usage rate calculations.
+    Completed seasons come from the local career store; otherwise the career
+    is fetched at most once per CAREER_CURRENT_SEASON_TTL.
     """
-    global last_request_time
-    now = time.time()
-    if now - last_request_time < MIN_REQUEST_INTERVAL:
-        time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-    last_request_time = time.time()
-    
     try:
-        career = playercareerstats.PlayerCareerStats(player_id=player_id, per_mode36='Totals')
-        data = career.get_dict()
-        
-        # Find current season stats
-        for rs in data.get('resultSets', []):
-            if rs.get('name') == 'SeasonTotalsRegularSeason':
-                headers = rs.get('headers', [])
-                rows = rs.get('rowSet', [])
-                
-                def get_idx(col):
-                    try:
-                        return headers.index(col)
-                    except ValueError:
-                        return -1
-                
-                season_idx = get_idx('SEASON_ID')
-                team_id_idx = get_idx('TEAM_ID')
-                
-                # Find the matching season (most recent if not exact match)
-                target_row = None
-                for row in reversed(rows):  # Most recent seasons are at the end
-                    if season_idx >= 0:
-                        row_season = row[season_idx]
-                        # Season format in API is like "2025-26" or "2024-25"
-                        if row_season == season or row_season.replace('-', '-') == season:
-                            target_row = row
-                            break
-                
-                # Fallback to most recent season
-                if not target_row and rows:
-                    target_row = rows[-1]
-                
-                if target_row:
-                    return {
-                        'team_id': target_row[team_id_idx] if team_id_idx >= 0 else None,
-                        'min': target_row[get_idx('MIN')] if get_idx('MIN') >= 0 else 0,
-                        'fga': target_row[get_idx('FGA')] if get_idx('FGA') >= 0 else 0,
-                        'fta': target_row[get_idx('FTA')] if get_idx('FTA') >= 0 else 0,
-                        'tov': target_row[get_idx('TOV')] if get_idx('TOV') >= 0 else 0,
-                        'ast': target_row[get_idx('AST')] if get_idx('AST') >= 0 else 0,
-                        'reb': target_row[get_idx('REB')] if get_idx('REB') >= 0 else 0,
-                        'fgm': target_row[get_idx('FGM')] if get_idx('FGM') >= 0 else 0,
-                        'gp': target_row[get_idx('GP')] if get_idx('GP') >= 0 else 0
-                    }
-        
-        return None
+        if _is_completed_season(season):
+            stored = career_store.get(player_id, season)
+            if stored is not None:
+                return stored
+
+        seasons = career_cache.get_or_load(player_id, lambda: _load_career_seasons(player_id))
+        target_row = seasons.get(season)
+
+        # Fallback to most recent season
+        if target_row is None and seasons:
+            target_row = seasons[next(reversed(seasons))]
+
+        return dict(target_row) if target_row else None
     except Exception as e:
-        print(f"Error fetching player season totals for {player_id}: {e}")
+        log_error(f"Error fetching player season totals for {player_id}", e)
         return None
 
+@span('compute')
 def _calculate_usage_rates(player_stats, team_stats):
     """
     Calculate NBA-standard usage rates.
@@ -1007,6 +1018,169 @@ def _calculate_usage_rates(player_stats, team_stats):
     
     return result
 
+# League average per-game team totals, used when a player's team totals are unavailable
+ESTIMATED_TEAM_PER_GAME = {
+    'team_min': 240,  # 48 min * 5 players
+    'team_fga': 88,
+    'team_fta': 22,
+    'team_tov': 14,
+    'team_fgm': 41,
+    'team_reb': 44
+}
+USAGE_STAT_KEYS = ('min', 'fga', 'fta', 'tov', 'ast', 'reb', 'fgm')
+
+LEAGUE_PLAYER_TOTALS_SCHEMA = (
+    Field('player_id', 'PLAYER_ID'),
+    Field('player_name', 'PLAYER_NAME'),
+    Field('team_id', 'TEAM_ID'),
+    Field('team_abbr', 'TEAM_ABBREVIATION'),
+    Field('gp', 'GP', default=0),
+    Field('min', 'MIN', default=0),
+    Field('fga', 'FGA', default=0),
+    Field('fta', 'FTA', default=0),
+    Field('tov', 'TOV', default=0),
+    Field('ast', 'AST', default=0),
+    Field('reb', 'REB', default=0),
+    Field('fgm', 'FGM', default=0)
+)
+LEAGUE_TEAM_TOTALS_SCHEMA = (Field('team_id', 'TEAM_ID'),) + TEAM_TOTALS_SCHEMA
+
+def _numeric_column(values):
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').fillna(0).to_numpy(dtype=float)
+
+@span('compute')
+def _calculate_usage_rates_columns(player, team):
+    """
+    Column-wise _calculate_usage_rates: player and team map the same keys to
+    equal-length arrays. Returns arrays of percentages with NaN where the
+    scalar version returns None.
+    """
+    mp, fga, fta, tov = player['min'], player['fga'], player['fta'], player['tov']
+    ast, reb, fgm = player['ast'], player['reb'], player['fgm']
+    tm, tfga, tfta = team['team_min'], team['team_fga'], team['team_fta']
+    ttov, tfgm, treb = team['team_tov'], team['team_fgm'], team['team_reb']
+
+    played = mp > 0
+    team_factor = np.where(tm > 0, tm / 5.0, 0.0)
+    player_possessions = fga + FTA_FACTOR * fta + tov
+    team_possessions = tfga + FTA_FACTOR * tfta + ttov
+    total_available_reb = treb + treb * 0.79  # Same opponent rebound estimate as the scalar version
+
+    def pct(numerator, denominator, valid):
+        valid = valid & played & (denominator > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.round(np.clip(100 * numerator / denominator, 0, 100), 1)
+        return np.where(valid, values, np.nan)
+
+    usg_denom = mp * team_possessions
+    with np.errstate(divide='ignore', invalid='ignore'):
+        teammate_fgm = np.where(team_factor > 0, (mp / team_factor) * tfgm - fgm, 0.0)
+    return {
+        'usg_pct': pct(player_possessions * team_factor, usg_denom, team_possessions > 0),
+        'ast_pct': pct(ast, teammate_fgm, team_factor > 0),
+        'reb_pct': pct(reb * team_factor, mp * total_available_reb, total_available_reb > 0),
+        'tov_pct': pct(tov, player_possessions, player_possessions > 0)
+    }
+
+@span('compute')
+def _build_league_usage_rates(season):
+    """Usage rates for every player in the league from two league-wide calls."""
+    player_data = _fetch_upstream(
+        leaguedashplayerstats.LeagueDashPlayerStats,
+        season=season,
+        per_mode_detailed='Totals',
+        measure_type_detailed_defense='Base',
+        season_type_all_star='Regular Season'
+    )
+    team_data = _fetch_upstream(
+        leaguedashteamstats.LeagueDashTeamStats,
+        season=season,
+        per_mode_detailed='Totals',
+        measure_type_detailed_defense='Base',
+        season_type_all_star='Regular Season',
+        league_id_nullable='00'
+    )
+
+    player_rs = find_result_set(player_data) or {}
+    team_rs = find_result_set(team_data) or {}
+    players = compile_projector(LEAGUE_PLAYER_TOTALS_SCHEMA, player_rs.get('headers', [])).columns(player_rs.get('rowSet', []))
+    team_cols = compile_projector(LEAGUE_TEAM_TOTALS_SCHEMA, team_rs.get('headers', [])).columns(team_rs.get('rowSet', []))
+
+    player = {key: _numeric_column(players[key]) for key in USAGE_STAT_KEYS + ('gp',)}
+    team_index = pd.Index(team_cols['team_id']).get_indexer(players['team_id'])
+    has_team = team_index >= 0
+    team = {}
+    for key, per_game in ESTIMATED_TEAM_PER_GAME.items():
+        totals = _numeric_column(team_cols[key])
+        matched = totals[np.where(has_team, team_index, 0)] if len(totals) else np.zeros(len(has_team))
+        team[key] = np.where(has_team, matched, per_game * np.maximum(player['gp'], 1))
+    rates = _calculate_usage_rates_columns(player, team)
+
+    rate_lists = {key: [None if np.isnan(v) else v for v in values.tolist()] for key, values in rates.items()}
+    stat_lists = [players[key] for key in USAGE_STAT_KEYS]
+    by_player = {}
+    for i, player_id in enumerate(players['player_id']):
+        by_player[player_id] = {
+            "player_id": player_id,
+            "player_name": players['player_name'][i],
+            "team_id": players['team_id'][i],
+            "team_abbr": players['team_abbr'][i],
+            "gp": players['gp'][i],
+            "usg_pct": rate_lists['usg_pct'][i],
+            "ast_pct": rate_lists['ast_pct'][i],
+            "reb_pct": rate_lists['reb_pct'][i],
+            "tov_pct": rate_lists['tov_pct'][i],
+            "data_source": "season_totals" if has_team[i] else "estimated",
+            "estimated": not has_team[i],
+            "player_stats": {key: values[i] for key, values in zip(USAGE_STAT_KEYS, stat_lists)}
+        }
+    return {"season": season, "by_player": by_player}
+
+def _get_league_usage_rates(season):
+    """{"season", "by_player": {player_id: usage rates}}, cached per season."""
+    return usage_rates_cache.get_or_load(season, lambda: _build_league_usage_rates(season))
+
+def _league_usage_response(rates):
+    players = list(rates['by_player'].values())
+    return {"season": rates['season'], "players": players, "count": len(players)}
+
+@app.route('/players/search', methods=['GET'])
+def search_players():
+    """
+    Search the player directory by name: prefix matches on first and last
+    name (accents ignored), then fuzzy matches for misspellings.
+    ?q=doncic&active=true&team=DAL&limit=10; team is an abbreviation or id.
+    """
+    query = request.args.get('q', '').strip()
+    active = request.args.get('active')
+    team = request.args.get('team', '').strip() or None
+    if not query and active is None and team is None:
+        return jsonify({"error": "Pass a query (?q=) or a filter (active, team)"}), 400
+    if active is not None:
+        active = active.strip().lower() in ('true', '1', 'yes')
+    limit = request.args.get('limit', PLAYER_SEARCH_LIMIT, type=int)
+    fuzzy = request.args.get('fuzzy', 'true').strip().lower() not in ('false', '0', 'no')
+    try:
+        with span('compute'):
+            results = player_directory.search(query, limit=limit, active=active, team=team, fuzzy=fuzzy)
+    except Exception as e:
+        log_error("Error searching the player directory", e)
+        return jsonify({"query": query, "players": [], "error": str(e)}), 503
+    players = [dict(player, match=match, score=score) for player, match, score in results]
+    return jsonify({"query": query, "count": len(players), "players": players})
+
+@app.route('/players/usage-rates', methods=['GET'])
+def get_league_usage_rates():
+    """
+    Get usage rates (USG%, AST%, REB%, TOV%) for every player in the league.
+    """
+    season = request.args.get('season', DEFAULT_SEASON)
+    try:
+        return encoded(_get_league_usage_rates(season), _league_usage_response).response()
+    except Exception as e:
+        log_error(f"Error calculating league usage rates for {season}", e)
+        return jsonify({"season": season, "players": [], "error": str(e)}), 500
+
 @app.route('/players/<int:player_id>/usage-rates', methods=['GET'])
 def get_player_usage_rates(player_id):
     """
@@ -1015,8 +1189,28 @@ def get_player_usage_rates(player_id):
     """
     try:
         season = request.args.get('season', DEFAULT_SEASON)
+
+        # Players in the league-wide table are a dictionary hit
+        try:
+            league_rates = _get_league_usage_rates(season)['by_player']
+        except Exception as e:
+            log_error(f"League usage rates unavailable for {season}, falling back to per-player lookup", e)
+            league_rates = {}
+        rates = league_rates.get(player_id)
+        if rates is not None:
+            return jsonify({
+                "player_id": player_id,
+                "season": season,
+                "usg_pct": rates['usg_pct'],
+                "ast_pct": rates['ast_pct'],
+                "reb_pct": rates['reb_pct'],
+                "tov_pct": rates['tov_pct'],
+                "data_source": rates['data_source'],
+                "estimated": rates['estimated'],
+                "player_stats": rates['player_stats']
+            })
         
-        # Fetch player season totals
+        # Not in this season's league table: fetch player season totals
         player_stats = _get_player_season_totals(player_id, season)
         
         if not player_stats:
@@ -1079,9 +1273,7 @@ def get_player_usage_rates(player_id):
         })
         
     except Exception as e:
-        print(f"Error calculating usage rates for player {player_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        log_error(f"Error calculating usage rates for player {player_id}", e)
         return jsonify({
             "player_id": player_id,
             "error": str(e),
@@ -1101,24 +1293,17 @@ def get_player_usage_rates(player_id):
 # Path to static data files (relative to this script)
 STATIC_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources', 'static', 'data')
 
+@track_job('standings_refresh')
 def refresh_standings_data():
     """
     Fetch current standings from NBA API and update the static JSON file.
     This runs on startup and is scheduled for midnight daily.
     """
-    print(f"[{datetime.now()}] Starting standings data refresh...")
+    log_event('standings_refresh', status='started')
     
     try:
-        # Rate limiting
-        global last_request_time
-        now = time.time()
-        if now - last_request_time < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - (now - last_request_time))
-        last_request_time = time.time()
-        
         # Fetch current standings
-        standings = leaguestandings.LeagueStandings(season='2025-26')
-        data = standings.get_dict()
+        data = _fetch_upstream(leaguestandings.LeagueStandings, season='2025-26')
         
         east = []
         west = []
@@ -1174,24 +1359,32 @@ def refresh_standings_data():
         with open(standings_file, 'w') as f:
             json.dump(standings_data, f, indent=2)
         
-        print(f"[{datetime.now()}] ✓ Standings refreshed successfully! ({len(east)} East, {len(west)} West teams)")
+        log_event('standings_refresh', status='success', east=len(east), west=len(west))
         return True
         
     except Exception as e:
-        print(f"[{datetime.now()}] ✗ Error refreshing standings: {e}")
+        log_error("Error refreshing standings", e)
         return False
 
 
 def run_startup_refresh():
     """Run data refresh tasks on startup."""
-    print("\n" + "="*60)
-    print("RUNNING STARTUP DATA REFRESH")
-    print("="*60)
-    
     # Refresh standings
-    refresh_standings_data()
-    
-    print("="*60 + "\n")
+    if not refresh_standings_data():
+        raise RuntimeError("standings refresh failed")
+
+
+# Started once the port is bound; /ready reports progress
+warmup = Warmup()
+warmup.add('imports', lambda: preload(
+    np, pd, scoreboard, boxscoresummaryv2, boxscoretraditionalv2, leaguedashplayerstats, leaguedashteamstats, leaguegamefinder,
+    leaguestandings, playercareerstats, playergamelog, teamdashboardbygeneralsplits, teamgamelog, teamplayerdashboard
+))
+warmup.add('scoreboard', lambda: scoreboard_poller.start())
+warmup.add('standings', run_startup_refresh)
+warmup.add('team_rankings', lambda: team_rankings_cache.get_or_load(DEFAULT_SEASON, lambda: _build_team_rankings(DEFAULT_SEASON)))
+warmup.add('usage_rates', lambda: _get_league_usage_rates(DEFAULT_SEASON))
+warmup.add('player_directory', player_directory.load)
 
 
 # Initialize scheduler for nightly refresh
@@ -1215,14 +1408,41 @@ def init_scheduler():
     atexit.register(lambda: scheduler.shutdown())
 
 
-if __name__ == '__main__':
-    print("Starting NBA Python Service on port 5001...")
-    
-    # Run startup data refresh
-    run_startup_refresh()
-    
-    # Initialize nightly scheduler
+# Warmup and the scheduler run once per process. `python nba_service.py` starts
+# them after binding its port; under gunicorn (nba_service:app, imported by
+# every worker) the first request each worker receives does, /ready included.
+# NBA_WARMUP=off leaves both to the caller (the tests).
+START_ON_FIRST_REQUEST = os.environ.get('NBA_WARMUP', 'on').strip().lower() not in ('0', 'off', 'false')
+_background_pid = None
+_background_lock = threading.Lock()
+
+def start_background():
+    """Start warmup and the nightly scheduler unless this process already has."""
+    global _background_pid
+    with _background_lock:
+        if _background_pid == os.getpid():
+            return
+        _background_pid = os.getpid()
+    warmup.start()
     init_scheduler()
-    
-    # Start Flask app
-    app.run(host='0.0.0.0', port=5001)
+
+@app.before_request
+def _start_background_on_first_request():
+    if START_ON_FIRST_REQUEST and _background_pid != os.getpid():
+        start_background()
+
+
+if __name__ == '__main__':
+    print(f"Starting NBA Python Service on port {PORT}...")
+
+    # Requests are logged as JSON lines by request_timing; drop werkzeug's access log
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    # Bind first so /health answers while the caches warm up
+    server = make_server('0.0.0.0', PORT, app, threaded=True)
+    print(f"Listening on port {PORT} after {time.time() - PROCESS_STARTED:.2f}s")
+
+    # Imports, scoreboard poller, standings and hot caches in the background, and the nightly scheduler
+    start_background()
+
+    server.serve_forever()
@@ -0,0 +1,166 @@
+"""
+Thread-safe token-bucket rate limiter for upstream NBA stats calls.
+
+Each caller reserves the next free slot under a short lock and then sleeps
+outside of it, so slots are handed out first-come first-served and no two
+threads can claim the same one. An optional per-endpoint budget is enforced
+on top of the shared budget.
+
+With a backend (shared_state.SharedState) the bucket state lives in a
+database every worker process on the host uses, so the budget is host-wide
+rather than per process.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket expressed as a theoretical arrival time (GCRA): `rate` calls
+    per second on average with up to `burst` calls back to back.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.interval = 1.0 / rate
+        self._tolerance = (burst - 1) * self.interval
+        self._tat = 0.0
+
+    def next_allowed(self, at):
+        """Earliest time >= at when a call conforms to the bucket."""
+        return max(at, self._tat - self._tolerance)
+
+    def consume(self, at):
+        self._tat = max(self._tat, at) + self.interval
+
+    def reserve(self, clock, timeout=None):
+        """Claim the next slot; returns the seconds until it, or None if that exceeds timeout."""
+        now = clock()
+        wait = self.next_allowed(now) - now
+        if timeout is not None and wait > timeout:
+            return None
+        self.consume(now + wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    Shared upstream budget with optional per-endpoint budgets.
+
+    acquire() blocks only the calling thread, only for as long as its own
+    reserved slot is in the future, and returns the seconds it waited.
+    Processes passing the same backend and name share their budgets; the
+    counters in stats() stay per process.
+    """
+
+    def __init__(self, rate, burst=1, endpoint_budgets=None, clock=None, sleep=time.sleep, backend=None,
+                 name='upstream'):
+        def make_bucket(bucket_rate, bucket_burst, key=None):
+            if backend is None:
+                return TokenBucket(bucket_rate, bucket_burst)
+            return backend.token_bucket(name if key is None else f"{name}:{key}", bucket_rate, bucket_burst)
+
+        self._bucket = make_bucket(rate, burst)
+        self._budgets = {
+            key: make_bucket(budget_rate, budget_burst, key)
+            for key, (budget_rate, budget_burst) in (endpoint_budgets or {}).items()
+        }
+        if clock is None:
+            clock = time.monotonic if backend is None else backend.clock
+        self.shared = backend is not None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._wait_by_key = {}
+
+    def _reserve(self, bucket, timeout):
+        with self._lock:
+            wait = bucket.reserve(self._clock, timeout)
+            if wait is None:
+                self.rejected += 1
+                return None
+            if wait > 0:
+                self.waiting += 1
+            return wait
+
+    def _wait(self, wait):
+        if wait <= 0:
+            return
+        try:
+            self._sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def acquire(self, key=None, timeout=None):
+        """
+        Wait for a slot. Returns the seconds waited, or None (without waiting
+        further) if no slot is available within timeout.
+
+        An endpoint budget is claimed first so a caller held back by its own
+        endpoint does not sit on a slot of the shared budget meanwhile.
+        """
+        waited = 0.0
+        bucket = self._budgets.get(key)
+        if bucket is not None:
+            wait = self._reserve(bucket, timeout)
+            if wait is None:
+                return None
+            self._wait(wait)
+            waited += wait
+            if timeout is not None:
+                timeout = max(0.0, timeout - wait)
+
+        wait = self._reserve(self._bucket, timeout)
+        if wait is None:
+            return None
+        self._wait(wait)
+        waited += wait
+        self._record(key, waited)
+        return waited
+
+    def _record(self, key, waited):
+        with self._lock:
+            self.calls += 1
+            if waited > 0:
+                self.throttled += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            key_stats = self._wait_by_key.setdefault(key or "*", [0, 0.0])
+            key_stats[0] += 1
+            key_stats[1] += waited
+
+    def try_acquire(self, key=None):
+        """Take a slot only if one is free right now."""
+        return self.acquire(key, timeout=0) is not None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate": self._bucket.rate,
+                "burst": self._bucket.burst,
+                "shared": self.shared,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "waiting": self.waiting,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "max_wait_seconds": round(self.max_wait, 3),
+                "avg_wait_seconds": round(self.total_wait / self.calls, 3) if self.calls else 0.0,
+                "by_endpoint": {
+                    key: {"calls": count, "total_wait_seconds": round(total, 3)}
+                    for key, (count, total) in self._wait_by_key.items()
+                }
+            }
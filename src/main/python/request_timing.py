@@ -0,0 +1,165 @@
+"""
+Per-request phase timing and structured request logs.
+
+Code paths mark their phases with span('throttle' | 'upstream' | 'parse' |
+'compute' | 'serialize'), as a context manager or decorator. Each span
+records its own time only: time spent in a nested span is counted there and
+not again in the enclosing one, so a compute span around a builder that
+fetches and parses reports just the computation. The totals go out as a
+Server-Timing header and in one JSON log line per request, which also carries
+any errors the handlers logged.
+
+Outside a request (scheduler, warmup, worker threads) spans cost a context
+variable lookup and record nothing.
+"""
+
+import json
+import logging
+import sys
+import time
+import traceback
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request
+
+PHASES = ('throttle', 'upstream', 'parse', 'compute', 'serialize')  # Server-Timing order
+QUIET_ROUTES = ('/health', '/ready', '/metrics')  # probes and scrapes are timed but not logged
+
+logger = logging.getLogger('nba_service')
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    __slots__ = ('started', 'phases', 'errors', 'stack')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}  # phase -> seconds
+        self.errors = []
+        self.stack = []  # open spans, innermost last
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        names = [name for name in PHASES if name in self.phases]
+        names += sorted(name for name in self.phases if name not in PHASES)
+        parts = [f"{name};dur={self.phases[name] * 1000:.2f}" for name in names]
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ', '.join(parts)
+
+
+class span:
+    """Time a phase of the current request (no-op outside one)."""
+
+    __slots__ = ('name', 'timing', 'started', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.timing = None
+
+    def __enter__(self):
+        timing = _current.get()
+        self.timing = timing
+        if timing is not None:
+            self.children = 0.0
+            timing.stack.append(self)
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        timing = self.timing
+        if timing is None:
+            return False
+        elapsed = time.perf_counter() - self.started
+        stack = timing.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        timing.phases[self.name] = timing.phases.get(self.name, 0.0) + elapsed - self.children
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def current_timing():
+    return _current.get()
+
+
+def _emit(record):
+    logger.info(json.dumps(record, default=str, separators=(',', ':')))
+
+
+def log_error(message, exc=None):
+    """
+    Record a handled error. Inside a request it is added to that request's log
+    line; elsewhere it is logged on its own line.
+    """
+    error = {"message": message}
+    if exc is not None:
+        error["error"] = f"{type(exc).__name__}: {exc}"
+        error["traceback"] = traceback.format_exc() if sys.exc_info()[1] is exc else None
+    timing = _current.get()
+    if timing is not None:
+        timing.errors.append(error)
+    else:
+        _emit({"ts": datetime.now(timezone.utc).isoformat(), "level": "error", **error})
+
+
+def log_event(event, **fields):
+    """One structured log line for something that is not a request (jobs, warmup)."""
+    _emit({"ts": datetime.now(timezone.utc).isoformat(), "level": "info", "event": event, **fields})
+
+
+def init_request_timing(app):
+    """
+    Register before any other after_request hook so the header and log line
+    include the work those hooks do (Flask runs them in reverse order).
+    """
+    @app.before_request
+    def _start_request_timing():
+        _current.set(RequestTiming())
+
+    @app.after_request
+    def _finish_request_timing(response):
+        timing = _current.get()
+        if timing is None:
+            return response
+        response.headers['Server-Timing'] = timing.server_timing()
+        rule = request.url_rule
+        route = rule.rule if rule is not None else None
+        if route not in QUIET_ROUTES or timing.errors:
+            record = {
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "level": "error" if timing.errors or response.status_code >= 500 else "info",
+                "method": request.method,
+                "path": request.full_path.rstrip('?'),
+                "route": route,
+                "status": response.status_code,
+                "duration_ms": round(timing.elapsed() * 1000, 2),
+                "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in timing.phases.items()}
+            }
+            if timing.errors:
+                record["errors"] = timing.errors
+            _emit(record)
+        return response
+
+    @app.teardown_request
+    def _clear_request_timing(exc):
+        _current.set(None)
@@ -0,0 +1,312 @@
+"""
+Bounded in-memory cache for upstream NBA stats responses.
+
+Entries expire after a per-key TTL and the least recently used entries are
+evicted once the cache grows past its memory budget. An expired entry can
+still be served for a short grace window while a background thread refreshes
+it, so a hot key never makes a caller wait on the upstream.
+
+With a backend (shared_state.SharedState) the cache also writes through to
+a store every worker process on the host shares and reads from it on a local
+miss, and only one process loads a missing key while the others wait for its
+value.
+"""
+
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from request_timing import log_error
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+DEFAULT_TTL = 60
+LEASE_TTL = 60  # longest a process may hold another process waiting for a shared load
+LEASE_POLL = 0.05
+SIZE_SAMPLE = 32  # items of a long list encoded to estimate its size
+
+_caches = weakref.WeakSet()  # every live ResponseCache, for /metrics
+
+
+def _estimate_size(value):
+    """
+    Approximate JSON size of value. A long list (a rowSet) is sized from an
+    evenly spaced sample of its items, so a league-wide response costs about
+    as much to size as a box score instead of a full encode.
+    """
+    try:
+        if isinstance(value, dict):
+            return 2 + sum(len(str(k)) + 4 + _estimate_size(v) for k, v in value.items())
+        if isinstance(value, list) and len(value) > SIZE_SAMPLE:
+            step = len(value) / SIZE_SAMPLE
+            sample = [value[int(i * step)] for i in range(SIZE_SAMPLE)]
+            return len(json.dumps(sample, default=str)) * len(value) // SIZE_SAMPLE
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return 2 + sum(_estimate_size(v) + 2 for v in value)
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+def _normalize_param(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).strip()
+
+
+def make_cache_key(name, params=None):
+    """Build a hashable key from an endpoint name and its request parameters."""
+    items = []
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        items.append((key, _normalize_param(value)))
+    return (name, tuple(sorted(items)))
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored_at", "expires_at", "stale_until", "refreshing")
+
+    def __init__(self, value, size, now, ttl, stale_ttl):
+        self.value = value
+        self.size = size
+        self.stored_at = now
+        self.expires_at = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+        self.refreshing = False
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache with LRU eviction and stale-while-revalidate.
+    """
+
+    def __init__(self, name, max_bytes=DEFAULT_MAX_BYTES, default_ttl=DEFAULT_TTL,
+                 stale_ttl=0, sizeof=_estimate_size, backend=None, clock=time.time):
+        self.name = name
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+        _caches.add(self)
+
+    def get(self, key):
+        """Return the fresh value for key, or None."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+        entry = self._from_backend(key, entry)
+        with self._lock:
+            if entry is None or now >= entry.expires_at:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+            return entry.value
+
+    def set(self, key, value, ttl=None, stale_ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        entry = _Entry(value, self._sizeof(value), self._clock(), ttl, stale_ttl)
+        self._store_locally(key, entry)
+        if self.backend is not None:
+            try:
+                self.backend.put(self.name, key, value, entry.stored_at, entry.expires_at, entry.stale_until)
+            except Exception as e:
+                log_error(f"Shared cache write failed for {self.name} cache key {key}", e)
+        return value
+
+    def _store_locally(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict_locked()
+
+    def _from_backend(self, key, local=None):
+        """
+        The shared entry for key if it is newer than the local one (which it
+        then replaces), else the local one.
+        """
+        if self.backend is None:
+            return local
+        try:
+            shared = self.backend.get(self.name, key)
+        except Exception as e:
+            log_error(f"Shared cache read failed for {self.name} cache key {key}", e)
+            return local
+        if shared is None:
+            return local
+        value, stored_at, expires_at, stale_until = shared
+        if local is not None and local.stored_at >= stored_at:
+            return local
+        entry = _Entry(value, self._sizeof(value), stored_at, 0, 0)
+        entry.expires_at = expires_at
+        entry.stale_until = stale_until
+        self._store_locally(key, entry)
+        return entry
+
+    def get_or_load(self, key, loader, ttl=None, stale_ttl=None):
+        """
+        Return the cached value for key, calling loader() on a miss.
+        Within the stale window the previous value is returned immediately
+        and loader() runs once in the background to refresh it.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+        if self.backend is not None:
+            # Another process may have loaded or refreshed it
+            shared = self._from_backend(key, entry)
+            if shared is not entry and now < shared.expires_at:
+                with self._lock:
+                    self.shared_hits += 1
+                return shared.value
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                if now < entry.stale_until:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, entry, loader, ttl, stale_ttl),
+                            daemon=True
+                        ).start()
+                    return entry.value
+                self._remove_locked(key)
+            self.misses += 1
+
+        if self.backend is not None:
+            return self._load_shared(key, loader, ttl, stale_ttl)
+        return self.set(key, loader(), ttl, stale_ttl)
+
+    def _load_shared(self, key, loader, ttl, stale_ttl):
+        """
+        Load a missing key once host-wide: the process holding the lease
+        calls loader(), the others poll the backend for its value. If the
+        holder fails or takes longer than LEASE_TTL they load it themselves.
+        """
+        deadline = self._clock() + LEASE_TTL
+        leased = False
+        try:
+            while True:
+                try:
+                    leased = self.backend.try_lease(self.name, key, LEASE_TTL)
+                except Exception as e:
+                    log_error(f"Shared cache lease failed for {self.name} cache key {key}", e)
+                    break
+                entry = self._from_backend(key)
+                if entry is not None and self._clock() < entry.stale_until:
+                    with self._lock:
+                        self.shared_hits += 1
+                    return entry.value
+                if leased or self._clock() >= deadline:
+                    break
+                time.sleep(LEASE_POLL)
+            return self.set(key, loader(), ttl, stale_ttl)
+        finally:
+            if leased:
+                try:
+                    self.backend.release(self.name, key)
+                except Exception as e:
+                    log_error(f"Shared cache lease release failed for {self.name} cache key {key}", e)
+
+    def _refresh(self, key, entry, loader, ttl, stale_ttl):
+        leased = False
+        try:
+            if self.backend is not None:
+                leased = self.backend.try_lease(self.name, key, LEASE_TTL)
+                if not leased:
+                    # Another process is refreshing; a later call picks its value up from the backend
+                    entry.refreshing = False
+                    return
+            self.set(key, loader(), ttl, stale_ttl)
+        except Exception as e:
+            entry.refreshing = False
+            with self._lock:
+                self.refresh_errors += 1
+            log_error(f"Background refresh failed for {self.name} cache key {key}", e)
+        finally:
+            if leased:
+                try:
+                    self.backend.release(self.name, key)
+                except Exception as e:
+                    log_error(f"Shared cache lease release failed for {self.name} cache key {key}", e)
+
+    def stored_at(self, key):
+        """When the locally cached value for key was stored, or None if there is none."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.stored_at if entry is not None else None
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._remove_locked(key)
+        if self.backend is not None:
+            self.backend.delete(self.name, key)
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict_locked(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "shared_hits": self.shared_hits,
+                "evictions": self.evictions,
+                "refresh_errors": self.refresh_errors
+            }
+
+
+def all_caches():
+    """Every live ResponseCache, ordered by name."""
+    return sorted(list(_caches), key=lambda cache: cache.name)
@@ -0,0 +1,103 @@
+"""
+Compiled projections from nba_api result sets to output records.
+
+A schema is a tuple of Field entries naming the output key, the source
+column and an optional coercion. The first time a schema meets a given
+header list it is compiled into a small function that pulls every field out
+of a row by position; later calls with the same header signature reuse it.
+"""
+
+import threading
+from collections import namedtuple
+
+from request_timing import span
+
+Field = namedtuple('Field', ['name', 'column', 'coerce', 'default'], defaults=(None, None))
+
+_projectors = {}
+_projectors_lock = threading.Lock()
+
+
+class Projector:
+    def __init__(self, schema, headers):
+        self.schema = schema
+        self.headers = headers
+        positions = {col: i for i, col in enumerate(headers)}
+        self.missing = tuple(f.column for f in schema if f.column not in positions)
+
+        namespace = {}
+        parts = []
+        for i, field in enumerate(schema):
+            pos = positions.get(field.column)
+            if pos is None:
+                namespace[f'd{i}'] = field.default
+                expr = f'd{i}'
+            elif field.coerce is not None:
+                namespace[f'c{i}'] = field.coerce
+                expr = f'c{i}(row[{pos}])'
+            else:
+                expr = f'row[{pos}]'
+            parts.append(f'{field.name!r}: {expr}')
+        source = 'def project(row):\n    return {' + ', '.join(parts) + '}\n'
+        exec(compile(source, f'<projector {len(schema)} fields>', 'exec'), namespace)
+        self.project = namespace['project']
+
+    @span('parse')
+    def records(self, rows, limit=None):
+        project = self.project
+        if limit is not None:
+            rows = rows[:limit]
+        return list(map(project, rows))
+
+    @span('parse')
+    def columns(self, rows):
+        """Project rows into {name: [values...]}, one list per field."""
+        positions = {col: i for i, col in enumerate(self.headers)}
+        columns = {}
+        for field in self.schema:
+            pos = positions.get(field.column)
+            if pos is None:
+                columns[field.name] = [field.default] * len(rows)
+            elif field.coerce is not None:
+                coerce = field.coerce
+                columns[field.name] = [coerce(row[pos]) for row in rows]
+            else:
+                columns[field.name] = [row[pos] for row in rows]
+        return columns
+
+
+def compile_projector(schema, headers):
+    """Return the cached projector for this schema and header signature."""
+    key = (schema, tuple(headers))
+    projector = _projectors.get(key)
+    if projector is None:
+        with _projectors_lock:
+            projector = _projectors.get(key)
+            if projector is None:
+                projector = Projector(schema, key[1])
+                _projectors[key] = projector
+    return projector
+
+
+def find_result_set(data, name=None, contains=None):
+    """
+    Return the named result set from an nba_api response dict. With neither
+    name nor contains, the first result set is returned.
+    """
+    for rs in data.get('resultSets', []):
+        rs_name = rs.get('name', '')
+        if name is not None and rs_name != name:
+            continue
+        if contains is not None and contains not in rs_name:
+            continue
+        return rs
+    return None
+
+
+def project_result_set(data, schema, name=None, contains=None, limit=None):
+    """Project a whole result set into output records."""
+    rs = find_result_set(data, name=name, contains=contains)
+    if rs is None:
+        return []
+    projector = compile_projector(schema, rs.get('headers', []))
+    return projector.records(rs.get('rowSet', []), limit=limit)
@@ -0,0 +1,131 @@
+"""
+Background poller for the live scoreboard.
+
+One daemon thread fetches the scoreboard on an adaptive interval: every few
+seconds while a game is live, until tip-off when games are still to come,
+and rarely once the day's games are over. Each successful poll replaces an
+immutable snapshot that request handlers read without touching the upstream.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from request_timing import log_error
+
+LIVE_INTERVAL = 10  # seconds between polls while a game is in progress
+IDLE_INTERVAL = 60 * 5  # no live games and none about to start
+
+STATUS_SCHEDULED = 1
+STATUS_LIVE = 2
+STATUS_FINAL = 3
+
+# data is the raw scoreboard dict, views whatever the transform derived from it.
+# Neither is modified after the snapshot is published.
+Snapshot = namedtuple('Snapshot', ['data', 'views', 'fetched_at', 'version'])
+
+
+def _parse_utc(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def next_interval(data, now, live_interval=LIVE_INTERVAL, idle_interval=IDLE_INTERVAL):
+    """Seconds until the next poll for this scoreboard."""
+    games = data.get('scoreboard', {}).get('games', [])
+    if any(g.get('gameStatus') == STATUS_LIVE for g in games):
+        return live_interval
+    starts = [_parse_utc(g.get('gameTimeUTC')) for g in games if g.get('gameStatus') == STATUS_SCHEDULED]
+    starts = [start for start in starts if start is not None]
+    if starts:
+        return min(idle_interval, max(live_interval, min(starts) - now))
+    return idle_interval
+
+
+class ScoreboardPoller:
+    def __init__(self, fetch, transform=None, live_interval=LIVE_INTERVAL, idle_interval=IDLE_INTERVAL,
+                 clock=time.time):
+        self._fetch = fetch
+        self._transform = transform or (lambda data: {})
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self._clock = clock
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._backoff = 0
+        self._listeners = []
+        self.interval = None
+        self.polls = 0
+        self.errors = 0
+        self.last_error = None
+
+    def refresh(self):
+        """Poll once, publish the new snapshot and return the next interval."""
+        try:
+            data = self._fetch()
+            views = self._transform(data)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            self._backoff = min(self.idle_interval, max(self.live_interval, self._backoff * 2))
+            log_error(f"Scoreboard poll failed (retrying in {self._backoff}s)", e)
+            self.interval = self._backoff
+            return self.interval
+
+        now = self._clock()
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        self._snapshot = Snapshot(data, views, now, version)
+        self.polls += 1
+        for listener in self._listeners:
+            try:
+                listener(self._snapshot)
+            except Exception as e:
+                log_error("Scoreboard listener failed", e)
+        self._backoff = 0
+        self.interval = next_interval(data, now, self.live_interval, self.idle_interval)
+        return self.interval
+
+    def add_listener(self, listener):
+        """Call listener(snapshot) after every successful poll."""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Poll once in the calling thread, then keep polling in the background."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            interval = self.refresh()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='scoreboard-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            interval = self.refresh()
+
+    def stop(self):
+        self._stop.set()
+
+    def current(self):
+        """The latest snapshot, starting the poller on first use."""
+        if self._thread is None:
+            self.start()
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError(f"Scoreboard unavailable: {self.last_error}")
+        return snapshot
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            "polls": self.polls,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "interval_seconds": self.interval,
+            "snapshot_version": snapshot.version if snapshot else None,
+            "snapshot_age_seconds": round(self._clock() - snapshot.fetched_at, 1) if snapshot else None
+        }
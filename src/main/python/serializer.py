@@ -0,0 +1,132 @@
+"""
+JSON encoding and response compression for the service.
+
+The encoder is orjson when it is installed and the standard library json
+module otherwise; NBA_JSON_SERIALIZER=json forces the fallback. Both produce
+compact output with sorted keys, handle the same extra types as Flask's
+default provider and write NaN and infinities as null (orjson's behaviour;
+bare NaN is not valid JSON). Bodies above COMPRESS_MIN_BYTES are gzip- or
+deflate-encoded when the client accepts it.
+"""
+
+import dataclasses
+import decimal
+import gzip
+import json
+import math
+import os
+import uuid
+import zlib
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+from request_timing import span
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used instead
+    orjson = None
+
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+CODINGS = ('gzip', 'deflate')
+
+
+def _default(o):
+    """Same conversions as Flask's default JSON provider."""
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    if hasattr(o, 'item'):  # NumPy scalars
+        return o.item()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _finite(value):
+    """value with NaN and infinities replaced by None, at any depth."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def _finite_default(o):
+    return _finite(_default(o))
+
+
+class StdlibSerializer:
+    name = 'json'
+
+    def dumps(self, value):
+        try:
+            text = json.dumps(value, sort_keys=True, separators=(',', ':'), default=_default, allow_nan=False)
+        except ValueError:
+            # Only documents holding a non-finite float pay for the extra pass
+            text = json.dumps(_finite(value), sort_keys=True, separators=(',', ':'), default=_finite_default)
+        return text.encode('utf-8')
+
+
+class OrjsonSerializer:
+    name = 'orjson'
+
+    def __init__(self):
+        self._option = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                        | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumps(self, value):
+        return orjson.dumps(value, default=_default, option=self._option)
+
+
+def get_serializer(name=None):
+    name = name or os.environ.get('NBA_JSON_SERIALIZER', 'auto')
+    if name == 'json' or (name == 'auto' and orjson is None):
+        return StdlibSerializer()
+    if orjson is None:
+        raise ValueError("NBA_JSON_SERIALIZER=orjson but orjson is not installed")
+    return OrjsonSerializer()
+
+
+serializer = get_serializer()
+
+
+def dumps(value):
+    """Encoded JSON body as sent by jsonify (with its trailing newline)."""
+    with span('serialize'):
+        return serializer.dumps(value) + b'\n'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with the configured serializer."""
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        value = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(value), mimetype=self.mimetype)
+
+
+def negotiate_coding(request, size):
+    """Content coding to use for a body of size bytes, or None."""
+    if size < COMPRESS_MIN_BYTES:
+        return None
+    coding = request.accept_encodings.best_match(CODINGS)
+    return coding if coding in CODINGS else None
+
+
+@span('serialize')
+def compress(body, coding):
+    if coding == 'gzip':
+        return gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+    if coding == 'deflate':
+        return zlib.compress(body, COMPRESS_LEVEL)
+    raise ValueError(f"Unsupported content coding: {coding}")
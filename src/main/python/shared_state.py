@@ -0,0 +1,213 @@
+"""
+Host-wide state shared by every worker process of the service.
+
+Under gunicorn each worker is its own process, so an in-memory rate limiter
+lets N workers call the upstream N times as often as intended and each worker
+warms its own caches. SharedState keeps both in one SQLite database in WAL
+mode that every worker on the host opens:
+
+  buckets  the token bucket state (theoretical arrival time) of each rate
+           limit, updated in a BEGIN IMMEDIATE transaction so reservations
+           from all processes are serialized
+  cache    cached values (pickled) with their expiry, written through by
+           ResponseCache so a value one worker loaded serves the others
+  leases   which process is loading a missing key, so the others wait for
+           its value instead of repeating the upstream call
+
+Values are pickled, so the database must stay private to the service, like
+the other stores under CACHE_DIR. Set NBA_SHARED_STATE to enable it, see
+open_shared_state().
+"""
+
+import json
+import os
+import pickle
+import threading
+import time
+
+from local_store import CACHE_DIR, SqliteStore
+
+SHARED_STATE_DB = os.path.join(CACHE_DIR, "shared_state.sqlite3")
+PURGE_INTERVAL = 60  # seconds between sweeps of expired cache rows, per process
+
+
+def _key_text(key):
+    return json.dumps(key, default=str, separators=(",", ":"))
+
+
+class SharedTokenBucket:
+    """TokenBucket (GCRA) whose state lives in SharedState; same reserve() contract."""
+
+    def __init__(self, state, name, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.state = state
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.interval = 1.0 / rate
+        self._tolerance = (burst - 1) * self.interval
+
+    def reserve(self, clock, timeout=None):
+        """Claim the next slot; returns the seconds until it, or None if that exceeds timeout."""
+        conn = self.state._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = clock()  # read under the database write lock
+            row = conn.execute("SELECT tat FROM buckets WHERE name = ?", (self.name,)).fetchone()
+            tat = row[0] if row else 0.0
+            wait = max(now, tat - self._tolerance) - now
+            if timeout is not None and wait > timeout:
+                conn.rollback()
+                return None
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tat) VALUES (?, ?)",
+                (self.name, max(tat, now + wait) + self.interval)
+            )
+            conn.commit()
+            return wait
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+class SharedState(SqliteStore):
+    """Rate-limit buckets, cached values and load leases shared across processes."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS buckets (
+            name TEXT PRIMARY KEY,
+            tat REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS cache (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            stored_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            stale_until REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        );
+        CREATE TABLE IF NOT EXISTS leases (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        );
+    """
+
+    clock = staticmethod(time.time)  # shared deadlines need a clock every process agrees on
+
+    def __init__(self, path=SHARED_STATE_DB):
+        super().__init__(path)
+        self._last_purge = 0.0
+        self._purge_lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+
+    def token_bucket(self, name, rate, burst=1):
+        return SharedTokenBucket(self, name, rate, burst)
+
+    def get(self, namespace, key):
+        """(value, stored_at, expires_at, stale_until) or None if absent or past its stale window."""
+        row = self._conn().execute(
+            "SELECT payload, stored_at, expires_at, stale_until FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, _key_text(key))
+        ).fetchone()
+        self.reads += 1
+        if row is None or row[3] <= self.clock():
+            return None
+        return pickle.loads(row[0]), row[1], row[2], row[3]
+
+    def put(self, namespace, key, value, stored_at, expires_at, stale_until):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, payload, stored_at, expires_at, stale_until) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, _key_text(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), stored_at, expires_at,
+             stale_until)
+        )
+        conn.commit()
+        self.writes += 1
+        self._maybe_purge()
+
+    def delete(self, namespace, key=None):
+        conn = self._conn()
+        if key is None:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+        else:
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, _key_text(key)))
+        conn.commit()
+
+    def try_lease(self, namespace, key, ttl):
+        """Become the process loading key, unless another one holds an unexpired lease."""
+        now = self.clock()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT owner, expires_at FROM leases WHERE namespace = ? AND key = ?", (namespace, _key_text(key))
+            ).fetchone()
+            if row is not None and row[1] > now and row[0] != self._owner():
+                conn.rollback()
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (namespace, key, owner, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, _key_text(key), self._owner(), now + ttl)
+            )
+            conn.commit()
+            return True
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def release(self, namespace, key):
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM leases WHERE namespace = ? AND key = ? AND owner = ?",
+            (namespace, _key_text(key), self._owner())
+        )
+        conn.commit()
+
+    def _owner(self):
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _maybe_purge(self):
+        now = self.clock()
+        with self._purge_lock:
+            if now - self._last_purge < PURGE_INTERVAL:
+                return
+            self._last_purge = now
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE stale_until <= ?", (now,))
+        conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+        conn.commit()
+
+    def stats(self):
+        conn = self._conn()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(length(payload)), 0) FROM cache").fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "buckets": conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0],
+            "reads": self.reads,
+            "writes": self.writes
+        }
+
+
+def open_shared_state(environ=os.environ):
+    """
+    NBA_SHARED_STATE=<path> (or 1 for CACHE_DIR/shared_state.sqlite3) shares
+    the rate limits and caches of every process using that path. Unset, each
+    process keeps its own and None is returned.
+    """
+    path = environ.get("NBA_SHARED_STATE", "").strip()
+    if not path or path.lower() in ("0", "off", "false"):
+        return None
+    if path.lower() in ("1", "on", "true"):
+        path = SHARED_STATE_DB
+    return SharedState(path)
@@ -0,0 +1,198 @@
+"""
+Team offense/defense rankings shared by nba_service and generate_team_rankings.
+
+Every ranked stat is one entry in STATS: which frame it comes from, the
+column names to look for, whether lower is better and how the value is
+formatted. Ranks and formatted values are computed a whole column at a time
+and only the final JSON objects are built per team.
+"""
+
+from collections import namedtuple
+
+from lazy_import import lazy_module
+
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
+
+# source is 'base' (Base measure type) or 'opp' (Opponent measure type).
+# kind is 'value' (rounded to one decimal) or 'pct' (fraction shown as a percentage).
+Stat = namedtuple('Stat', ['section', 'key', 'source', 'columns', 'ascending', 'kind'])
+
+STATS = (
+    Stat('offense', 'ppg', 'base', ('PTS', 'PTS_PG'), False, 'value'),
+    Stat('offense', 'fgPct', 'base', ('FG_PCT',), False, 'pct'),
+    Stat('offense', 'fg3Pct', 'base', ('FG3_PCT',), False, 'pct'),
+    Stat('offense', 'ftPct', 'base', ('FT_PCT',), False, 'pct'),
+    Stat('offense', 'ast', 'base', ('AST',), False, 'value'),
+    Stat('offense', 'to', 'base', ('TOV',), True, 'value'),
+    Stat('defense', 'oppg', 'opp', ('OPP_PTS', 'PTS', 'PTS_PG'), True, 'value'),
+    Stat('defense', 'ofgPct', 'opp', ('OPP_FG_PCT', 'FG_PCT'), True, 'pct'),
+    Stat('defense', 'o3fgPct', 'opp', ('OPP_FG3_PCT', 'FG3_PCT'), True, 'pct'),
+    Stat('defense', 'blk', 'base', ('BLK',), False, 'value'),
+    Stat('defense', 'stl', 'base', ('STL',), False, 'value'),
+    Stat('defense', 'reb', 'base', ('REB',), False, 'value'),
+)
+SECTIONS = ('offense', 'defense')
+
+
+def format_rank(rank):
+    if rank is None:
+        return "-"
+    rank = int(rank)
+    if rank <= 0:
+        return "-"
+    if rank == 1:
+        return "1st"
+    if rank == 2:
+        return "2nd"
+    if rank == 3:
+        return "3rd"
+    return f"{rank}th"
+
+
+def pick_column(columns, candidates):
+    for col in candidates:
+        if col in columns:
+            return col
+    return None
+
+
+def normalize_team_name(value):
+    if not value:
+        return ""
+    return str(value).strip().lower().replace(".", "")
+
+
+def build_team_abbr_map():
+    from nba_api.stats.static import teams
+    mapping = {}
+    for team in teams.get_teams():
+        full_name = team.get("full_name")
+        abbr = team.get("abbreviation")
+        if full_name and abbr:
+            mapping[normalize_team_name(full_name)] = abbr
+    return mapping
+
+
+def _numeric(frame, col):
+    """Column as float64 with missing or non-numeric values as NaN."""
+    return pd.to_numeric(frame[col], errors='coerce').to_numpy(dtype=float)
+
+
+def rank_min(values, ascending):
+    """
+    Competition ranks (ties share the best rank, like pandas method='min').
+    Missing values get rank 0.
+    """
+    valid = ~np.isnan(values)
+    keyed = values if ascending else -values
+    ordered = np.sort(keyed[valid])
+    ranks = np.zeros(len(values), dtype=np.int64)
+    ranks[valid] = np.searchsorted(ordered, keyed[valid], side='left') + 1
+    return ranks
+
+
+def format_values(values, kind):
+    """Output values as a list; rounded with round(), since np.round breaks .x5 ties differently."""
+    values = np.where(np.isnan(values), 0.0, values)
+    if kind == 'pct':
+        values = np.where(values <= 1.1, values * 100, values)
+    return [round(value, 1) for value in values.tolist()]
+
+
+def _rank_labels(ranks):
+    labels = np.array([format_rank(rank) for rank in range(int(ranks.max(initial=0)) + 1)], dtype=object)
+    return labels[ranks]
+
+
+def _resolve_columns(df_base, df_opp):
+    frames = {'base': df_base, 'opp': df_opp}
+    resolved = {}
+    for source, label in (('base', 'base'), ('opp', 'opponent')):
+        columns = frames[source].columns
+        missing = False
+        for stat in STATS:
+            if stat.source != source:
+                continue
+            resolved[stat] = pick_column(columns, stat.columns)
+            missing = missing or resolved[stat] is None
+        if missing:
+            raise ValueError(f"Missing required {label} stat columns from NBA stats response. Columns: {list(columns)}")
+    return resolved
+
+
+def _opp_positions(df_base, df_opp, team_ids, team_abbrs):
+    """Row of df_opp for each base team (by id, then abbreviation), or -1."""
+    positions = np.full(len(df_base), -1, dtype=np.int64)
+    opp_id_col = pick_column(df_opp.columns, ['TEAM_ID'])
+    opp_abbr_col = pick_column(df_opp.columns, ['TEAM_ABBREVIATION'])
+    if opp_id_col and team_ids is not None:
+        known = ~pd.isna(team_ids)
+        positions[known] = pd.Index(df_opp[opp_id_col]).get_indexer(team_ids[known])
+    if opp_abbr_col:
+        unmatched = positions < 0
+        positions[unmatched] = pd.Index(df_opp[opp_abbr_col]).get_indexer(team_abbrs[unmatched])
+    return positions
+
+
+def build_team_rankings(df_base, df_opp, name_to_abbr=None):
+    """
+    Rank every team from the Base and Opponent LeagueDashTeamStats frames.
+    Returns {team_abbr: {...}} in the order of df_base.
+    """
+    stat_cols = _resolve_columns(df_base, df_opp)
+    base_cols = df_base.columns
+
+    team_id_col = pick_column(base_cols, ['TEAM_ID'])
+    team_abbr_col = pick_column(base_cols, ['TEAM_ABBREVIATION'])
+    team_name_col = pick_column(base_cols, ['TEAM_NAME'])
+    wins_col = pick_column(base_cols, ['W'])
+    losses_col = pick_column(base_cols, ['L'])
+
+    count = len(df_base)
+    team_ids = _numeric(df_base, team_id_col) if team_id_col else None
+    team_names = df_base[team_name_col].to_numpy(dtype=object) if team_name_col else np.full(count, None, dtype=object)
+    if team_abbr_col:
+        team_abbrs = df_base[team_abbr_col].to_numpy(dtype=object)
+    else:
+        name_to_abbr = name_to_abbr if name_to_abbr is not None else build_team_abbr_map()
+        team_abbrs = np.array([name_to_abbr.get(normalize_team_name(name), name) for name in team_names], dtype=object)
+
+    opp_positions = _opp_positions(df_base, df_opp, team_ids, team_abbrs)
+    has_opp = opp_positions >= 0
+
+    section_keys = {section: [] for section in SECTIONS}
+    section_columns = {section: [] for section in SECTIONS}
+    for stat in STATS:
+        if stat.source == 'base':
+            raw = _numeric(df_base, stat_cols[stat])
+            ranks = rank_min(raw, stat.ascending)
+        else:
+            opp_raw = _numeric(df_opp, stat_cols[stat])
+            opp_ranks = rank_min(opp_raw, stat.ascending)
+            safe = np.where(has_opp, opp_positions, 0)
+            raw = np.where(has_opp, opp_raw[safe] if len(opp_raw) else np.nan, np.nan)
+            ranks = np.where(has_opp, opp_ranks[safe] if len(opp_ranks) else 0, 0)
+        section_keys[stat.section] += [stat.key, stat.key + 'Rank']
+        section_columns[stat.section] += [format_values(raw, stat.kind), _rank_labels(ranks).tolist()]
+
+    ids = [None if np.isnan(v) else int(v) for v in team_ids.tolist()] if team_ids is not None else [None] * count
+    wins = df_base[wins_col].fillna(0).astype(int).tolist() if wins_col else [0] * count
+    losses = df_base[losses_col].fillna(0).astype(int).tolist() if losses_col else [0] * count
+    offense_keys, defense_keys = section_keys['offense'], section_keys['defense']
+
+    teams_data = {}
+    for team_id, team_name, team_abbr, won, lost, offense, defense in zip(
+        ids, team_names.tolist(), team_abbrs.tolist(), wins, losses,
+        zip(*section_columns['offense']), zip(*section_columns['defense'])
+    ):
+        teams_data[team_abbr] = {
+            'teamId': team_id,
+            'teamName': team_name if team_name else team_abbr,
+            'teamAbbr': team_abbr,
+            'wins': won,
+            'losses': lost,
+            'offense': dict(zip(offense_keys, offense)),
+            'defense': dict(zip(defense_keys, defense))
+        }
+    return teams_data
@@ -0,0 +1,210 @@
+"""
+Record and replay nba_api traffic.
+
+Both work by swapping nba_api's HTTP transport (NBAHTTP.send_api_request,
+shared by the stats.nba.com and cdn.nba.com clients), so the service,
+the generate_team_* scripts and every endpoint class run unchanged:
+
+  Recorder  sends requests as usual and writes each response to a fixture
+            file under DIR/<stats|live>/<endpoint>/<hash>.json
+  Replayer  answers from those files, optionally after an injected delay,
+            and never touches the network
+
+A fixture is keyed by the endpoint and its parameters, except the date
+window parameters (VOLATILE_PARAMS), which routes derive from today's
+date. The service can be pointed at fixtures with environment variables,
+see install_from_env().
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from local_store import CACHE_DIR
+
+FIXTURE_DIR = os.path.join(CACHE_DIR, 'upstream_fixtures')
+VOLATILE_PARAMS = ('DateFrom', 'DateTo')
+
+
+class FixtureMissing(LookupError):
+    """No recorded response for this request."""
+
+
+def _kind(base_url):
+    host = urlsplit(base_url or '').hostname or ''
+    return 'live' if host.startswith('cdn.') else 'stats'
+
+
+def fixture_path(directory, base_url, endpoint, parameters):
+    kept = sorted((key, '' if value is None else str(value)) for key, value in (parameters or {}).items()
+                  if key not in VOLATILE_PARAMS)
+    digest = hashlib.sha1(json.dumps(kept).encode('utf-8')).hexdigest()[:16]
+    slug = endpoint.lower().replace('/', '_').replace('.json', '')
+    return os.path.join(directory, _kind(base_url), slug, f"{digest}.json")
+
+
+def _network_send(http, endpoint, parameters, **kwargs):
+    """nba_api's own transport, as it was before any install()."""
+    from nba_api.library.http import NBAHTTP
+    send = _ORIGINAL_SEND[0] if _ORIGINAL_SEND else NBAHTTP.send_api_request
+    response = send(http, endpoint, parameters, **kwargs)
+    return response.get_response(), response._status_code, response.get_url()  # NBAResponse has no status getter
+
+
+class Recorder:
+    """
+    Write every response to a fixture file. send(http, endpoint, parameters,
+    **kwargs) -> (text, status, url) performs the request; by default it is
+    nba_api's network transport.
+    """
+
+    def __init__(self, directory=FIXTURE_DIR, send=None):
+        self.directory = directory
+        self._send = send or _network_send
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def __call__(self, http, endpoint, parameters, **kwargs):
+        text, status, url = self._send(http, endpoint, parameters, **kwargs)
+        path = fixture_path(self.directory, http.base_url, endpoint, parameters)
+        record = {
+            "endpoint": endpoint,
+            "base_url": http.base_url,
+            "parameters": parameters,
+            "status_code": status,
+            "url": url,
+            "recorded_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "body": text
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.recorded += 1
+        return http.nba_response(response=text, status_code=status, url=url)
+
+
+class Replayer:
+    """
+    Serve recorded responses after latency seconds (plus up to jitter more,
+    uniformly). latency may also be a dict of {endpoint: seconds} with a
+    '*' default. Missing fixtures raise FixtureMissing.
+    """
+
+    def __init__(self, directory=FIXTURE_DIR, latency=0.0, jitter=0.0, seed=0, sleep=time.sleep):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._fixtures = {}  # path -> (text, status, url)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _delay(self, endpoint):
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(endpoint, latency.get('*', 0.0))
+        if self.jitter:
+            with self._lock:
+                latency += self._random.uniform(0, self.jitter)
+        return latency
+
+    def _load(self, path):
+        with self._lock:
+            cached = self._fixtures.get(path)
+        if cached is not None:
+            return cached
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        cached = (record['body'], record.get('status_code', 200), record.get('url'))
+        with self._lock:
+            self._fixtures[path] = cached
+        return cached
+
+    def __call__(self, http, endpoint, parameters, **kwargs):
+        path = fixture_path(self.directory, http.base_url, endpoint, parameters)
+        fixture = self._load(path)
+        with self._lock:
+            if fixture is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if fixture is None:
+            raise FixtureMissing(f"No recorded response for {endpoint} {parameters} ({path})")
+        delay = self._delay(endpoint)
+        if delay > 0:
+            self._sleep(delay)
+        text, status, url = fixture
+        return http.nba_response(response=text, status_code=status, url=url)
+
+    def stats(self):
+        with self._lock:
+            return {"fixtures_loaded": len(self._fixtures), "hits": self.hits, "misses": self.misses}
+
+
+_ORIGINAL_SEND = []  # nba_api's transport while another one is installed
+_install_lock = threading.Lock()
+
+
+def install(transport):
+    """Route every nba_api request through transport(http, endpoint, parameters, **kwargs)."""
+    from nba_api.library.http import NBAHTTP
+
+    def send_api_request(self, endpoint, parameters, referer=None, proxy=None, headers=None, timeout=None,
+                         raise_exception_on_error=False):
+        return transport(self, endpoint, parameters, referer=referer, proxy=proxy, headers=headers,
+                         timeout=timeout, raise_exception_on_error=raise_exception_on_error)
+
+    with _install_lock:
+        if not _ORIGINAL_SEND:
+            _ORIGINAL_SEND.append(NBAHTTP.send_api_request)
+        NBAHTTP.send_api_request = send_api_request
+    return transport
+
+
+def uninstall():
+    from nba_api.library.http import NBAHTTP
+    with _install_lock:
+        if _ORIGINAL_SEND:
+            NBAHTTP.send_api_request = _ORIGINAL_SEND.pop()
+
+
+@contextmanager
+def installed(transport):
+    install(transport)
+    try:
+        yield transport
+    finally:
+        uninstall()
+
+
+def install_from_env(environ=os.environ):
+    """
+    NBA_UPSTREAM_MODE=record|replay switches the transport for this process;
+    NBA_UPSTREAM_FIXTURES sets the directory and NBA_UPSTREAM_LATENCY_MS the
+    injected replay delay. Returns the installed transport, or None.
+    """
+    mode = environ.get('NBA_UPSTREAM_MODE', '').strip().lower()
+    if not mode:
+        return None
+    directory = environ.get('NBA_UPSTREAM_FIXTURES', FIXTURE_DIR)
+    if mode == 'record':
+        transport = Recorder(directory)
+    elif mode == 'replay':
+        transport = Replayer(directory, latency=float(environ.get('NBA_UPSTREAM_LATENCY_MS', 0)) / 1000.0)
+    else:
+        raise ValueError(f"NBA_UPSTREAM_MODE must be 'record' or 'replay', not {mode!r}")
+    print(f"nba_api upstream: {mode} ({directory})")
+    return install(transport)
@@ -0,0 +1,90 @@
+"""
+Background warmup of imports and caches after the service starts listening.
+
+Jobs run one after another on a daemon thread so the port is bound (and
+/health answers) immediately; a slow or failing upstream only delays the
+caches it feeds. Failed jobs are retried after each of RETRY_DELAYS and
+stay failed once those run out. /ready reports the state of every job and
+is only ready once all of them are done.
+"""
+
+import threading
+import time
+
+from request_timing import log_error, log_event
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+RETRY_DELAYS = (5, 30, 120)  # seconds before each retry of the jobs that failed
+
+
+class Warmup:
+    def __init__(self, clock=time.time, sleep=time.sleep, retry_delays=RETRY_DELAYS):
+        self._jobs = []  # (name, fn) in run order
+        self._state = {}  # name -> {"state", "seconds", "error", "attempts"}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._clock = clock
+        self._sleep = sleep
+        self.retry_delays = retry_delays
+        self.started_at = None
+        self.finished_at = None
+
+    def add(self, name, fn):
+        with self._lock:
+            self._jobs.append((name, fn))
+            self._state[name] = {"state": PENDING, "seconds": None, "error": None, "attempts": 0}
+
+    def start(self):
+        """Run the jobs in the background; later calls are no-ops."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.started_at = self._clock()
+            self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+        self._thread.start()
+
+    def run(self):
+        self._run_jobs(self._jobs)
+        for delay in self.retry_delays:
+            failed = [(name, fn) for name, fn in self._jobs if self._state[name]["state"] == FAILED]
+            if not failed:
+                break
+            self._sleep(delay)
+            self._run_jobs(failed)
+        self.finished_at = self._clock()
+        log_event('warmup', status='finished',
+                  seconds=round(self.finished_at - (self.started_at or self.finished_at), 1),
+                  failed=self.status()["failed"])
+
+    def _run_jobs(self, jobs):
+        for name, fn in list(jobs):
+            self._set(name, state=RUNNING, attempts=self._state[name]["attempts"] + 1)
+            started = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                log_error(f"Warmup job {name} failed (attempt {self._state[name]['attempts']})", e)
+                self._set(name, state=FAILED, seconds=round(time.perf_counter() - started, 3), error=str(e))
+            else:
+                self._set(name, state=DONE, seconds=round(time.perf_counter() - started, 3), error=None)
+
+    def _set(self, name, **fields):
+        with self._lock:
+            self._state[name].update(fields)
+
+    def finished(self):
+        """Every job has run and no retries are left."""
+        return self.finished_at is not None
+
+    def status(self):
+        with self._lock:
+            jobs = {name: dict(job) for name, job in self._state.items()}
+        return {
+            "finished": self.finished(),
+            "ready": all(job["state"] == DONE for job in jobs.values()),
+            "failed": [name for name, job in jobs.items() if job["state"] == FAILED],
+            "jobs": jobs
+        }
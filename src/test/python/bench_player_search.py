@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark of player_directory search over the full data/player_directory.csv.
+
+Queries are drawn from the directory itself, per kind:
+
+  prefix    1-6 leading letters of a last name, or of first and last name
+  folded    accent-free spelling of names with diacritics ("doncic")
+  fuzzy     names with a letter dropped or two letters swapped
+  filtered  prefixes with active and/or team filters, and team rosters
+
+Reports index build time and per-query p50/p95/p99 for each kind, in the
+index and through /players/search. The route is timed by calling the WSGI
+app the way a server worker does (routing, the before/after_request hooks
+and JSON encoding included, no socket, no test client). The "floor" row is
+/health the same way: what any route costs before its own work. Exits 1 if
+a p99 exceeds --budget-ms.
+
+    python src/test/python/bench_player_search.py [--csv data/player_directory.csv] [--rounds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from urllib.parse import urlencode
+
+from werkzeug.test import EnvironBuilder
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+from player_directory import DIRECTORY_CSV, PlayerDirectory, fold, load_index
+
+
+def _misspell(rng, name):
+    if len(name) < 5:
+        return name
+    i = rng.randrange(1, len(name) - 2)
+    if rng.random() < 0.5:
+        return name[:i] + name[i + 1:]
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def build_queries(index, count, seed):
+    rng = random.Random(seed)
+    players = index.players
+    accented = [p for p in players if fold(p['full_name']) != p['full_name'].lower()]
+    teams = sorted({p['team_abbr'] for p in players if p['team_abbr']})
+    queries = {"prefix": [], "folded": [], "fuzzy": [], "filtered": []}
+    for _ in range(count):
+        player = rng.choice(players)
+        last = fold(player['last_name'])
+        if rng.random() < 0.6:
+            queries["prefix"].append({"q": last[:rng.randint(1, 6)]})
+        else:
+            queries["prefix"].append({"q": f"{fold(player['first_name'])[:rng.randint(1, 4)]} {last[:rng.randint(1, 4)]}"})
+        if accented:
+            queries["folded"].append({"q": fold(rng.choice(accented)['full_name'])})
+        queries["fuzzy"].append({"q": _misspell(rng, fold(player['full_name']))})
+        team = rng.choice(teams) if teams else None
+        choice = rng.random()
+        if choice < 0.4:
+            queries["filtered"].append({"q": last[:rng.randint(1, 4)], "active": True})
+        elif choice < 0.8:
+            queries["filtered"].append({"q": last[:rng.randint(1, 3)], "team": team})
+        else:
+            queries["filtered"].append({"team": team, "active": True})
+    return queries
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda f: samples[min(len(samples) - 1, int(f * len(samples)))]
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def time_index(index, queries, rounds):
+    samples = []
+    for _ in range(rounds):
+        for params in queries:
+            started = time.perf_counter()
+            index.search(params.get('q', ''), active=params.get('active'), team=params.get('team'))
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def search_url(params):
+    if params is None:
+        return '/health'
+    return '/players/search?' + urlencode({k: str(v).lower() if isinstance(v, bool) else v for k, v in params.items()})
+
+
+def time_route(app, queries, rounds):
+    environs = [EnvironBuilder(search_url(params)).get_environ() for params in queries]
+    status = []
+
+    def start_response(line, headers, exc_info=None):
+        status.append(line)
+
+    samples = []
+    for _ in range(rounds):
+        for environ in environs:
+            started = time.perf_counter()
+            body = app(dict(environ), start_response)
+            b''.join(body)
+            body.close()
+            samples.append(time.perf_counter() - started)
+            assert status.pop().startswith('200'), environ['QUERY_STRING']
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--csv', default=DIRECTORY_CSV)
+    parser.add_argument('--queries', type=int, default=2000, help="Queries per kind")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=1.0, help="p99 budget per query, index and route")
+    parser.add_argument('--skip-route', action='store_true', help="Only time the index")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = load_index(args.csv)
+    build = time.perf_counter() - started
+    print(f"Indexed {len(index)} players in {build * 1000:.0f} ms")
+
+    queries = build_queries(index, args.queries, args.seed)
+    app = None
+    if not args.skip_route:
+        import logging
+        import nba_service
+        import request_timing
+        request_timing.logger.setLevel(logging.WARNING)
+        nba_service.player_directory = PlayerDirectory(args.csv)
+        nba_service.player_directory.load()
+        app = nba_service.app
+
+    over_budget = []
+    print(f"{'kind':<10} {'where':<6} {'n':>7} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9}")
+    if app is not None:
+        time_route(app, [None] * 100, 1)
+        p50, p95, p99 = percentiles(time_route(app, [None] * 500, 1))
+        print(f"{'floor':<10} {'route':<6} {500:>7} {p50 * 1e6:>9.1f} {p95 * 1e6:>9.1f} {p99 * 1e6:>9.1f}")
+    for kind, kind_queries in queries.items():
+        if not kind_queries:
+            continue
+        time_index(index, kind_queries[:200], 1)  # warm up
+        rows = [('index', time_index(index, kind_queries, args.rounds))]
+        if app is not None:
+            time_route(app, kind_queries[:100], 1)
+            rows.append(('route', time_route(app, kind_queries[:500], 2)))
+        for where, samples in rows:
+            p50, p95, p99 = percentiles(samples)
+            print(f"{kind:<10} {where:<6} {len(samples):>7} {p50 * 1e6:>9.1f} {p95 * 1e6:>9.1f} {p99 * 1e6:>9.1f}")
+            if p99 * 1000 > args.budget_ms:
+                over_budget.append(f"{kind} {where}")
+
+    for name in over_budget:
+        print(f"OVER BUDGET: {name} p99 above {args.budget_ms} ms")
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
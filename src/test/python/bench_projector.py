@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: compiled result-set projector vs. the per-route idx() mapping
+it replaced, on a full-season player game log and a league-wide game log.
+
+    python src/test/python/bench_projector.py [--fixture recorded_gamelog.json]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import fixtures
+from nba_service import PLAYER_GAMELOG_SCHEMA
+from result_projector import project_result_set
+
+
+def legacy_gamelog(data, limit):
+    """The get_player_gamelog loop as it was before the projector."""
+    games = []
+    if 'resultSets' in data and len(data['resultSets']) > 0:
+        headers = data['resultSets'][0]['headers']
+        rows = data['resultSets'][0]['rowSet']
+
+        def idx(col):
+            try:
+                return headers.index(col)
+            except ValueError:
+                return -1
+
+        game_id_idx = idx('Game_ID')
+        game_date_idx = idx('GAME_DATE')
+        matchup_idx = idx('MATCHUP')
+        wl_idx = idx('WL')
+        min_idx = idx('MIN')
+        pts_idx = idx('PTS')
+        reb_idx = idx('REB')
+        ast_idx = idx('AST')
+        stl_idx = idx('STL')
+        blk_idx = idx('BLK')
+        fgm_idx = idx('FGM')
+        fga_idx = idx('FGA')
+        fg_pct_idx = idx('FG_PCT')
+
+        for row in rows[:limit]:
+            games.append({
+                "game_id": row[game_id_idx] if game_id_idx >= 0 else None,
+                "game_date": row[game_date_idx] if game_date_idx >= 0 else None,
+                "matchup": row[matchup_idx] if matchup_idx >= 0 else None,
+                "wl": row[wl_idx] if wl_idx >= 0 else None,
+                "min": row[min_idx] if min_idx >= 0 else None,
+                "pts": row[pts_idx] if pts_idx >= 0 else None,
+                "reb": row[reb_idx] if reb_idx >= 0 else None,
+                "ast": row[ast_idx] if ast_idx >= 0 else None,
+                "stl": row[stl_idx] if stl_idx >= 0 else None,
+                "blk": row[blk_idx] if blk_idx >= 0 else None,
+                "fgm": row[fgm_idx] if fgm_idx >= 0 else None,
+                "fga": row[fga_idx] if fga_idx >= 0 else None,
+                "fg_pct": row[fg_pct_idx] if fg_pct_idx >= 0 else None
+            })
+    return games
+
+
+def projected_gamelog(data, limit):
+    return project_result_set(data, PLAYER_GAMELOG_SCHEMA, limit=limit)
+
+
+def bench(label, data, repeat):
+    rows = len(data['resultSets'][0]['rowSet'])
+    assert legacy_gamelog(data, rows) == projected_gamelog(data, rows)
+    print(f"{label}: {rows} rows")
+    for name, fn in (('legacy idx()', legacy_gamelog), ('projector', projected_gamelog)):
+        best = min(timeit.repeat(lambda: fn(data, rows), number=repeat, repeat=5)) / repeat
+        print(f"  {name:<13} {best * 1e6:10.1f} us/call  {rows / best / 1e6:6.2f} M rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--fixture', help='Recorded PlayerGameLog response (JSON) to use instead of the synthetic one.')
+    args = parser.parse_args()
+
+    season = fixtures.load_response(args.fixture) if args.fixture else fixtures.player_gamelog()
+    bench('full-season player game log', season, 2000)
+    bench('league-wide player game logs', fixtures.league_player_gamelog(), 5)
+
+
+if __name__ == '__main__':
+    main()
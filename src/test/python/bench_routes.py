@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of every route and generator against replayed nba_api traffic.
+
+The service runs on a real threaded HTTP server with nba_api answered by
+upstream_replay.Replayer (fixtures from --fixtures, or synthetic ones seeded
+into a temporary directory), with --latency-ms injected per upstream call.
+Three phases are measured:
+
+  warm        --requests per route at --concurrency, caches populated
+  cold        --cold-requests per route, one at a time, every ResponseCache
+              cleared before each request so the upstream, parse and compute
+              path runs each time
+  generators  generate_team_rankings / _differentials / _stats end to end
+
+Throughput and p50/p95/p99 are reported per scenario. --save-baseline
+writes them to a JSON file; --baseline compares against one and exits 1
+when a p95/p99 grows, or throughput drops, by more than --threshold (and the
+latency change is above --min-delta-ms, to ignore sub-millisecond noise).
+Any 5xx response also fails the run.
+
+    python src/test/python/bench_routes.py --save-baseline /tmp/routes.json
+    python src/test/python/bench_routes.py --baseline /tmp/routes.json
+    python src/test/python/bench_routes.py --record DIR   # capture the live API into DIR
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import fixtures
+import generate_team_differentials
+import generate_team_rankings
+import generate_team_stats
+import nba_service
+import request_timing
+from local_store import BoxscoreStore, CareerStore
+from rate_limiter import RateLimiter
+from response_cache import all_caches
+from upstream_replay import Recorder, Replayer, installed
+from werkzeug.serving import make_server
+
+ROUTES = (
+    ('GET', '/games', None),
+    ('GET', '/games/finals', None),
+    ('GET', '/standings', None),
+    ('GET', '/team-rankings', None),
+    ('GET', '/players/usage-rates', None),
+    ('GET', '/players/1600101/usage-rates', None),  # in the league table
+    ('GET', '/players/1628369/usage-rates', None),  # career + team totals fallback
+    ('GET', '/players/1628369/gamelog', None),
+    ('GET', '/teams/1610612738/games', None),
+    ('GET', '/teams/1610612738/leaders', None),
+    ('GET', '/games/0022500001/boxscore', None),
+    ('POST', '/games/boxscores', {"game_ids": [f"00225000{i:02d}" for i in range(1, 11)]}),
+    ('POST', '/team-differentials/refresh', None),
+)
+WARM_SKIP = {'/team-differentials/refresh'}  # regenerates a file on every call; measured cold only
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, wall, errors):
+    latencies = sorted(latencies)
+    return {
+        "n": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3)
+    }
+
+
+class Service:
+    """nba_service on a background werkzeug server, isolated from the real data directories."""
+
+    def __init__(self, workdir, throttle):
+        nba_service.boxscore_store = BoxscoreStore(os.path.join(workdir, 'boxscores.sqlite3'))
+        nba_service.career_store = CareerStore(os.path.join(workdir, 'careers.sqlite3'))
+        if not throttle:
+            nba_service.upstream_limiter = RateLimiter(10000, burst=10000)
+            generate_team_stats.MIN_REQUEST_INTERVAL = 0.0001
+            generate_team_differentials.MIN_REQUEST_INTERVAL = 0.0001
+        output_dir = os.path.join(workdir, 'static')
+        generate_team_differentials.OUTPUT_DIR = output_dir
+        generate_team_differentials.OUTPUT_FILE = os.path.join(output_dir, 'team_differentials.json')
+        generate_team_rankings.OUTPUT_DIR = output_dir
+        generate_team_stats.OUTPUT_DIR = output_dir
+        self.checkpoint_dir = os.path.join(workdir, 'checkpoints')
+        request_timing.logger.setLevel(logging.WARNING)
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        self.server = make_server('127.0.0.1', 0, nba_service.app, threaded=True)
+        self.port = self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def start_poller(self):
+        # One poll for the snapshot; no background polling during the run
+        nba_service.scoreboard_poller.refresh()
+        nba_service.scoreboard_poller._thread = object()
+
+    def request(self, method, path, body=None):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=120)
+        started = time.perf_counter()
+        try:
+            payload = json.dumps(body) if body is not None else None
+            headers = {'Content-Type': 'application/json', 'Accept-Encoding': 'gzip'} if payload else {'Accept-Encoding': 'gzip'}
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status, time.perf_counter() - started
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def clear_caches():
+    for cache in all_caches():
+        cache.invalidate()
+
+
+def run_warm(service, requests, concurrency):
+    results = {}
+    for method, path, body in ROUTES:
+        if path in WARM_SKIP:
+            continue
+        service.request(method, path, body)  # populate caches
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for status, seconds in pool.map(lambda _: service.request(method, path, body), range(requests)):
+                latencies.append(seconds)
+                errors += status >= 500
+        results[f"warm {method} {path}"] = summarize(latencies, time.perf_counter() - started, errors)
+    return results
+
+
+def run_cold(service, requests):
+    results = {}
+    for method, path, body in ROUTES:
+        latencies, errors, busy = [], 0, 0.0
+        for _ in range(requests):
+            clear_caches()
+            status, seconds = service.request(method, path, body)
+            latencies.append(seconds)
+            busy += seconds
+            errors += status >= 500
+        results[f"cold {method} {path}"] = summarize(latencies, busy, errors)
+    return results
+
+
+def run_generators(service, runs):
+    generators = (
+        ('generate_team_rankings', generate_team_rankings.generate_team_rankings),
+        ('generate_team_differentials league', lambda: generate_team_differentials.generate_team_differentials(mode='league')),
+        ('generate_team_differentials full', lambda: generate_team_differentials.generate_team_differentials(mode='full')),
+        ('generate_team_stats', lambda: _run_team_stats(service.checkpoint_dir)),
+    )
+    results = {}
+    for name, run in generators:
+        latencies, errors = [], 0
+        for _ in range(runs):
+            started = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if run() not in (None, 0) and name == 'generate_team_stats':
+                        errors += 1
+            except Exception as e:
+                print(f"{name} failed: {e}")
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        results[f"generator {name}"] = summarize(latencies, sum(latencies), errors)
+    return results
+
+
+def _run_team_stats(checkpoint_dir):
+    argv = sys.argv
+    sys.argv = ['generate_team_stats.py', '--fresh', '--checkpoint-dir', checkpoint_dir]
+    try:
+        return generate_team_stats.main()
+    finally:
+        sys.argv = argv
+
+
+def run_all(service, args):
+    service.start_poller()
+    results = {}
+    results.update(run_warm(service, args.requests, args.concurrency))
+    results.update(run_cold(service, args.cold_requests))
+    results.update(run_generators(service, args.generator_runs))
+    return results
+
+
+def seed_synthetic(directory, workdir):
+    """Record one pass over every scenario from the synthetic upstream."""
+    service = Service(workdir, throttle=False)
+    try:
+        with installed(Recorder(directory, send=fixtures.synthetic_send)) as recorder:
+            service.start_poller()
+            for method, path, body in ROUTES:
+                clear_caches()
+                service.request(method, path, body)
+            run_generators(service, 1)
+        return recorder.recorded
+    finally:
+        service.stop()
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in ('p95_ms', 'p99_ms'):
+            if current[key] > base[key] * (1 + threshold) and current[key] - base[key] > min_delta_ms:
+                regressions.append(f"{name}: {key} {base[key]:.2f} -> {current[key]:.2f}")
+        if base['throughput'] and current['throughput'] < base['throughput'] * (1 - threshold):
+            regressions.append(f"{name}: throughput {base['throughput']:.1f}/s -> {current['throughput']:.1f}/s")
+    return regressions
+
+
+def report(results):
+    print(f"{'scenario':<52} {'n':>5} {'err':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, r in results.items():
+        print(f"{name:<52} {r['n']:>5} {r['errors']:>4} {r['throughput']:>9.1f} "
+              f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--fixtures', help="Replay fixtures directory (default: synthetic, seeded into a temp dir)")
+    parser.add_argument('--record', metavar='DIR', help="Record the live nba_api responses for every scenario into DIR and exit")
+    parser.add_argument('--latency-ms', type=float, default=25.0, help="Injected latency per upstream call")
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--requests', type=int, default=200, help="Warm requests per route")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--cold-requests', type=int, default=10)
+    parser.add_argument('--generator-runs', type=int, default=3)
+    parser.add_argument('--throttle', action='store_true', help="Keep the production upstream rate limits")
+    parser.add_argument('--baseline', help="Compare with this results file")
+    parser.add_argument('--save-baseline', help="Write the results to this file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help="Ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_routes_')
+    if args.record:
+        service = Service(workdir, throttle=True)
+        try:
+            with installed(Recorder(args.record)) as recorder:
+                service.start_poller()
+                for method, path, body in ROUTES:
+                    clear_caches()
+                    service.request(method, path, body)
+                run_generators(service, 1)
+        finally:
+            service.stop()
+        print(f"Recorded {recorder.recorded} responses into {args.record}")
+        return 0
+
+    fixture_dir = args.fixtures
+    if not fixture_dir:
+        fixture_dir = os.path.join(workdir, 'fixtures')
+        print(f"Seeded {seed_synthetic(fixture_dir, os.path.join(workdir, 'seed'))} synthetic fixtures into {fixture_dir}")
+
+    replayer = Replayer(fixture_dir, latency=args.latency_ms / 1000.0, jitter=args.jitter_ms / 1000.0)
+    service = Service(os.path.join(workdir, 'run'), throttle=args.throttle)
+    try:
+        with installed(replayer):
+            results = run_all(service, args)
+    finally:
+        service.stop()
+
+    report(results)
+    print(f"replay: {replayer.stats()}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    failed = [name for name, r in results.items() if r['errors']]
+    for name in failed:
+        print(f"ERRORS: {name} ({results[name]['errors']} failed requests)")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        failed += regressions
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: encoding the heavy JSON payloads (/team-rankings, a box score,
+/players/usage-rates) with stdlib jsonify, the configured fast serializer and
+pre-encoded cached payloads, each with and without gzip. Reports body
+throughput and p50/p99 per response, then end-to-end timings through the
+Flask test client.
+
+    python src/test/python/bench_serialization.py [--calls 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import fixtures
+import nba_service
+from conditional import EncodedPayload
+from flask.json.provider import DefaultJSONProvider
+from serializer import FastJSONProvider, compress, serializer
+from team_rankings import build_team_rankings
+
+
+def team_rankings():
+    teams = build_team_rankings(fixtures.frame(fixtures.league_dash_team_stats('Base')),
+                                fixtures.frame(fixtures.league_dash_team_stats('Opponent')))
+    return {'lastUpdated': '2026-01-15T20:00:00Z', 'season': '2025-26', 'teams': teams}
+
+
+def boxscore(seed=2):
+    rng = random.Random(seed)
+    players = []
+    for i in range(26):
+        fga, fg3a, fta = rng.randint(0, 25), rng.randint(0, 12), rng.randint(0, 10)
+        players.append({
+            'player_id': 1630000 + i, 'player_name': f'Player {i}', 'team_id': 1610612738 + i // 13,
+            'team_abbr': 'BOS' if i < 13 else 'LAL', 'min': round(rng.uniform(0, 40), 2),
+            'pts': rng.randint(0, 40), 'reb': rng.randint(0, 15), 'ast': rng.randint(0, 12),
+            'stl': rng.randint(0, 4), 'blk': rng.randint(0, 4), 'tov': rng.randint(0, 6),
+            'fgm': fga // 2, 'fga': fga, 'fg_pct': 0.5, 'fg3m': fg3a // 3, 'fg3a': fg3a, 'fg3_pct': 0.333,
+            'ftm': fta // 2, 'fta': fta, 'ft_pct': 0.5
+        })
+    teams = [{'team_id': 1610612738, 'team_abbr': 'BOS', 'pts': 112}, {'team_id': 1610612747, 'team_abbr': 'LAL', 'pts': 104}]
+    return {'game_id': '0022500001', 'players': players, 'teams': teams, 'count': len(players)}
+
+
+def usage_rates():
+    player_data, team_data = fixtures.league_player_totals()
+    fetch = nba_service._fetch_upstream
+    nba_service._fetch_upstream = lambda cls, **params: player_data if cls.__name__ == 'LeagueDashPlayerStats' else team_data
+    try:
+        return nba_service._build_league_usage_rates('2025-26')
+    finally:
+        nba_service._fetch_upstream = fetch
+
+
+def measure(fn, calls):
+    samples = []
+    size = 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        size = len(fn())
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    total = sum(samples)
+    return size, size * calls / total / 1e6, samples[len(samples) // 2] * 1e6, samples[int(len(samples) * 0.99)] * 1e6
+
+
+def bench_payload(label, value, calls):
+    app = nba_service.app
+    stdlib, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+    payload = EncodedPayload(value)
+    modes = (
+        ('jsonify stdlib', lambda: stdlib.response(value).get_data()),
+        (f'jsonify {serializer.name}', lambda: fast.response(value).get_data()),
+        ('pre-encoded', lambda: payload.response().get_data()),
+        ('stdlib + gzip', lambda: compress(stdlib.response(value).get_data(), 'gzip')),
+        (f'{serializer.name} + gzip', lambda: compress(fast.response(value).get_data(), 'gzip')),
+        ('pre-encoded gzip', lambda: payload.compressed('gzip')),
+    )
+    print(f"{label}")
+    with app.app_context():
+        for name, fn in modes:
+            size, mbps, p50, p99 = measure(fn, calls)
+            print(f"  {name:<18} {size:>8} B  {mbps:9.1f} MB/s  p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+
+
+def bench_routes(calls):
+    rankings, box, usage = team_rankings(), boxscore(), usage_rates()
+    nba_service.team_rankings_cache.get_or_load = lambda key, loader: rankings
+    nba_service.usage_rates_cache.get_or_load = lambda key, loader: usage
+    nba_service._stored_boxscore = lambda game_id: box
+    client = nba_service.app.test_client()
+    print("end to end (Flask test client, Accept-Encoding: gzip)")
+    for path in ('/team-rankings', '/games/0022500001/boxscore', '/players/usage-rates'):
+        size, mbps, p50, p99 = measure(lambda: client.get(path, headers={'Accept-Encoding': 'gzip'}).data, calls)
+        print(f"  {path:<28} {size:>8} B  p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"serializer: {serializer.name}")
+    bench_payload('/team-rankings (30 teams)', team_rankings(), args.calls)
+    bench_payload('/games/<id>/boxscore (26 players)', boxscore(), args.calls)
+    bench_payload('/players/usage-rates (450 players)', nba_service._league_usage_response(usage_rates()), args.calls // 4)
+    bench_routes(args.calls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark of columnar snapshots against pandas.read_csv on the data/*.csv
+files.
+
+Per file it reports:
+
+  time    median load time: pd.read_csv vs load_snapshot (the snapshot
+          already converted; the one-off conversion and the source hash a
+          reload check costs are shown separately)
+  memory  DataFrame memory_usage(deep=True) vs the snapshot's file size, and
+          resident set growth (KB) of a fresh process after pd.read_csv,
+          after mapping the snapshot, and after then reading every column
+          (decoding the dictionaries into Python strings); numpy and pandas
+          are imported before measuring
+
+    python src/test/python/bench_snapshots.py [data/*.csv] [--rounds 20]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import columnar_snapshot
+from columnar_snapshot import DictionaryColumn, file_sha256, load_snapshot, snapshot_for
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
+
+
+def resident_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def touch(snapshot):
+    """Read every value of every column, as a consumer scanning the data would."""
+    for name in snapshot.columns:
+        column = snapshot[name]
+        if isinstance(column, DictionaryColumn):
+            column.values
+            column.codes.sum()
+        else:
+            column.sum()
+
+
+def child(kind, path):
+    """Resident growth of loading and scanning path, in this (fresh) process."""
+    import numpy  # noqa: F401
+    import pandas as pd
+    before = resident_bytes()
+    data = pd.read_csv(path) if kind == 'pandas' else load_snapshot(path)
+    loaded = resident_bytes()
+    if kind == 'snapshot':
+        touch(data)
+    print(json.dumps({"loaded": loaded - before, "scanned": resident_bytes() - before}))
+
+
+def measure_child(kind, path):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', kind, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def median_seconds(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def bench(csv_path, snapshot_dir, rounds):
+    import pandas as pd
+    started = time.perf_counter()
+    snapshot = snapshot_for(csv_path, snapshot_dir)
+    convert = time.perf_counter() - started
+    frame = pd.read_csv(csv_path)
+    return {
+        "file": os.path.basename(csv_path),
+        "csv_bytes": os.path.getsize(csv_path),
+        "rows": len(frame),
+        "convert_ms": convert * 1000,
+        "hash_ms": median_seconds(lambda: file_sha256(csv_path), rounds) * 1000,
+        "pandas_ms": median_seconds(lambda: pd.read_csv(csv_path), rounds) * 1000,
+        "snapshot_ms": median_seconds(lambda: load_snapshot(snapshot.path), rounds) * 1000,
+        "frame_bytes": int(frame.memory_usage(deep=True).sum()),
+        "snapshot_bytes": snapshot.nbytes(),
+        "pandas_rss": measure_child('pandas', csv_path),
+        "snapshot_rss": measure_child('snapshot', snapshot.path)
+    }
+
+
+def report(results):
+    kb = lambda n: f"{n / 1024:,.0f}"
+    print(f"{'file':<38} {'rows':>5} {'read_csv ms':>11} {'snapshot ms':>11} {'convert ms':>10} {'hash ms':>7}")
+    for r in results:
+        print(f"{r['file']:<38} {r['rows']:>5} {r['pandas_ms']:>11.2f} {r['snapshot_ms']:>11.3f} "
+              f"{r['convert_ms']:>10.1f} {r['hash_ms']:>7.2f}")
+    print()
+    print(f"{'file':<38} {'csv KB':>7} {'frame KB':>8} {'snap KB':>7} "
+          f"{'rss read_csv':>12} {'rss mapped':>10} {'rss scanned':>11}")
+    for r in results:
+        print(f"{r['file']:<38} {kb(r['csv_bytes']):>7} {kb(r['frame_bytes']):>8} {kb(r['snapshot_bytes']):>7} "
+              f"{kb(r['pandas_rss']['loaded']):>12} {kb(r['snapshot_rss']['loaded']):>10} "
+              f"{kb(r['snapshot_rss']['scanned']):>11}")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+        return 0
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('csv', nargs='*', default=sorted(glob.glob(os.path.join(DATA_DIR, '*.csv'))))
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--snapshot-dir', default=None, help="Default: a temporary directory")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_dir = args.snapshot_dir or os.path.join(tmp, os.path.basename(columnar_snapshot.SNAPSHOT_DIR))
+        results = [bench(path, snapshot_dir, args.rounds) for path in args.csv]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        report(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time from process start to the first byte of /health (and to a
+200 from /ready) for the Python service.
+
+    python src/test/python/bench_startup.py [--runs 5] [--service path/to/nba_service.py]
+
+Point --service at an older checkout to compare. The service is started on
+--port (via NBA_SERVICE_PORT; older versions always use 5001).
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+SERVICE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'main', 'python', 'nba_service.py')
+
+
+def first_byte(url, deadline):
+    """Seconds until url returns its first byte, polling until deadline."""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read(1)
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.01)
+    return None
+
+
+def run_once(service, port, timeout):
+    env = dict(os.environ, NBA_SERVICE_PORT=str(port), PYTHONUNBUFFERED='1')
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, service], env=env, cwd=os.path.dirname(os.path.abspath(service)),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = started + timeout
+    try:
+        if first_byte(f"http://127.0.0.1:{port}/health", deadline) is None:
+            return None, None
+        health = time.perf_counter() - started
+        ready = None
+        while time.perf_counter() < deadline:
+            if first_byte(f"http://127.0.0.1:{port}/ready", deadline) == 200:
+                ready = time.perf_counter() - started
+                break
+            time.sleep(0.05)
+        return health, ready
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summary(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return "n/a"
+    return f"median {statistics.median(values) * 1000:7.0f} ms  min {min(values) * 1000:7.0f} ms  max {max(values) * 1000:7.0f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--service', default=SERVICE)
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    health, ready = [], []
+    for run in range(args.runs):
+        h, r = run_once(args.service, args.port, args.timeout)
+        health.append(h)
+        ready.append(r)
+        print(f"run {run + 1}: /health {h * 1000 if h else float('nan'):7.0f} ms  "
+              f"/ready {r * 1000 if r else float('nan'):7.0f} ms")
+    print(f"/health first byte: {summary(health)}")
+    print(f"/ready 200:         {summary(ready)}")
+
+
+if __name__ == '__main__':
+    main()
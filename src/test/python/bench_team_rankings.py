@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: catalogue-driven team rankings engine vs. the iterrows() builder it
+replaced, on a 30-team league and a synthetic 300-team league.
+
+    python src/test/python/bench_team_rankings.py [--base base.json --opp opp.json]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import fixtures
+import pandas as pd
+from team_rankings import build_team_rankings, format_rank, pick_column
+
+
+def _format_pct(value):
+    if value is None:
+        return 0.0
+    if value <= 1.1:
+        return round(value * 100, 1)
+    return round(value, 1)
+
+
+def _get_numeric(source, col, default=0.0):
+    if not col:
+        return default
+    value = source.get(col) if isinstance(source, dict) else source[col]
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def legacy_team_rankings(df_base, df_opp):
+    """The _build_team_rankings loop as it was before the engine (abbreviation column assumed)."""
+    df_base = df_base.copy()
+    df_opp = df_opp.copy()
+    base_cols = df_base.columns
+    opp_cols = df_opp.columns
+
+    team_id_col = pick_column(base_cols, ['TEAM_ID'])
+    team_abbr_col = pick_column(base_cols, ['TEAM_ABBREVIATION'])
+    team_name_col = pick_column(base_cols, ['TEAM_NAME'])
+    wins_col = pick_column(base_cols, ['W'])
+    losses_col = pick_column(base_cols, ['L'])
+
+    pts_col = pick_column(base_cols, ['PTS', 'PTS_PG'])
+    fg_pct_col = pick_column(base_cols, ['FG_PCT'])
+    fg3_pct_col = pick_column(base_cols, ['FG3_PCT'])
+    ft_pct_col = pick_column(base_cols, ['FT_PCT'])
+    ast_col = pick_column(base_cols, ['AST'])
+    tov_col = pick_column(base_cols, ['TOV'])
+    blk_col = pick_column(base_cols, ['BLK'])
+    stl_col = pick_column(base_cols, ['STL'])
+    reb_col = pick_column(base_cols, ['REB'])
+
+    opp_team_id_col = pick_column(opp_cols, ['TEAM_ID'])
+    opp_team_abbr_col = pick_column(opp_cols, ['TEAM_ABBREVIATION'])
+    opp_pts_col = pick_column(opp_cols, ['OPP_PTS', 'PTS', 'PTS_PG'])
+    opp_fg_pct_col = pick_column(opp_cols, ['OPP_FG_PCT', 'FG_PCT'])
+    opp_fg3_pct_col = pick_column(opp_cols, ['OPP_FG3_PCT', 'FG3_PCT'])
+
+    df_base['PTS_RANK'] = df_base[pts_col].rank(ascending=False, method='min').astype(int)
+    df_base['FG_PCT_RANK'] = df_base[fg_pct_col].rank(ascending=False, method='min').astype(int)
+    df_base['FG3_PCT_RANK'] = df_base[fg3_pct_col].rank(ascending=False, method='min').astype(int)
+    df_base['FT_PCT_RANK'] = df_base[ft_pct_col].rank(ascending=False, method='min').astype(int)
+    df_base['AST_RANK'] = df_base[ast_col].rank(ascending=False, method='min').astype(int)
+    df_base['TOV_RANK'] = df_base[tov_col].rank(ascending=True, method='min').astype(int)
+    df_base['BLK_RANK'] = df_base[blk_col].rank(ascending=False, method='min').astype(int)
+    df_base['STL_RANK'] = df_base[stl_col].rank(ascending=False, method='min').astype(int)
+    df_base['REB_RANK'] = df_base[reb_col].rank(ascending=False, method='min').astype(int)
+
+    df_opp['OPP_PTS_RANK'] = df_opp[opp_pts_col].rank(ascending=True, method='min').astype(int)
+    df_opp['OPP_FG_PCT_RANK'] = df_opp[opp_fg_pct_col].rank(ascending=True, method='min').astype(int)
+    df_opp['OPP_FG3_PCT_RANK'] = df_opp[opp_fg3_pct_col].rank(ascending=True, method='min').astype(int)
+
+    opp_by_team_id = {}
+    opp_by_team_abbr = {}
+    if opp_team_id_col:
+        opp_by_team_id = df_opp.set_index(opp_team_id_col).to_dict(orient='index')
+    if opp_team_abbr_col:
+        opp_by_team_abbr = df_opp.set_index(opp_team_abbr_col).to_dict(orient='index')
+
+    teams_data = {}
+    for _, row in df_base.iterrows():
+        team_id = int(row[team_id_col]) if team_id_col and not pd.isna(row[team_id_col]) else None
+        team_name = row[team_name_col] if team_name_col else None
+        team_abbr = row[team_abbr_col]
+        if team_id is not None and team_id in opp_by_team_id:
+            opp_row = opp_by_team_id[team_id]
+        elif team_abbr in opp_by_team_abbr:
+            opp_row = opp_by_team_abbr[team_abbr]
+        else:
+            opp_row = {}
+
+        teams_data[team_abbr] = {
+            'teamId': team_id,
+            'teamName': team_name if team_name else team_abbr,
+            'teamAbbr': team_abbr,
+            'wins': int(row[wins_col]) if wins_col else 0,
+            'losses': int(row[losses_col]) if losses_col else 0,
+            'offense': {
+                'ppg': round(_get_numeric(row, pts_col), 1),
+                'ppgRank': format_rank(row['PTS_RANK']),
+                'fgPct': _format_pct(_get_numeric(row, fg_pct_col)),
+                'fgPctRank': format_rank(row['FG_PCT_RANK']),
+                'fg3Pct': _format_pct(_get_numeric(row, fg3_pct_col)),
+                'fg3PctRank': format_rank(row['FG3_PCT_RANK']),
+                'ftPct': _format_pct(_get_numeric(row, ft_pct_col)),
+                'ftPctRank': format_rank(row['FT_PCT_RANK']),
+                'ast': round(_get_numeric(row, ast_col), 1),
+                'astRank': format_rank(row['AST_RANK']),
+                'to': round(_get_numeric(row, tov_col), 1),
+                'toRank': format_rank(row['TOV_RANK'])
+            },
+            'defense': {
+                'oppg': round(_get_numeric(opp_row, opp_pts_col), 1),
+                'oppgRank': format_rank(opp_row.get('OPP_PTS_RANK', 0)),
+                'ofgPct': _format_pct(_get_numeric(opp_row, opp_fg_pct_col)),
+                'ofgPctRank': format_rank(opp_row.get('OPP_FG_PCT_RANK', 0)),
+                'o3fgPct': _format_pct(_get_numeric(opp_row, opp_fg3_pct_col)),
+                'o3fgPctRank': format_rank(opp_row.get('OPP_FG3_PCT_RANK', 0)),
+                'blk': round(_get_numeric(row, blk_col), 1),
+                'blkRank': format_rank(row['BLK_RANK']),
+                'stl': round(_get_numeric(row, stl_col), 1),
+                'stlRank': format_rank(row['STL_RANK']),
+                'reb': round(_get_numeric(row, reb_col), 1),
+                'rebRank': format_rank(row['REB_RANK'])
+            }
+        }
+    return teams_data
+
+
+def bench(label, df_base, df_opp, repeat):
+    assert legacy_team_rankings(df_base, df_opp) == build_team_rankings(df_base, df_opp)
+    print(f"{label}: {len(df_base)} teams")
+    for name, fn in (('legacy iterrows', legacy_team_rankings), ('engine', build_team_rankings)):
+        best = min(timeit.repeat(lambda: fn(df_base, df_opp), number=repeat, repeat=5)) / repeat
+        print(f"  {name:<16} {best * 1e3:8.2f} ms/call  {best / len(df_base) * 1e6:7.1f} us/team")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--base', help='Recorded Base LeagueDashTeamStats response (JSON).')
+    parser.add_argument('--opp', help='Recorded Opponent LeagueDashTeamStats response (JSON).')
+    args = parser.parse_args()
+
+    if args.base and args.opp:
+        base, opp = fixtures.load_response(args.base), fixtures.load_response(args.opp)
+    else:
+        base, opp = fixtures.league_dash_team_stats('Base'), fixtures.league_dash_team_stats('Opponent')
+    bench('30-team league', fixtures.frame(base), fixtures.frame(opp), 50)
+    bench('synthetic 300-team league', fixtures.frame(fixtures.league_dash_team_stats('Base', teams=300)),
+          fixtures.frame(fixtures.league_dash_team_stats('Opponent', teams=300)), 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The service and generator modules live side by side in src/main/python and
+# import each other as top-level modules.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python'))
+
+# Tests and benchmarks drive warmup themselves; a test client request must not
+# start it (or the scheduler) against the real upstream
+os.environ.setdefault('NBA_WARMUP', 'off')
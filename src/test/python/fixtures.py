@@ -0,0 +1,448 @@
+"""
+Deterministic nba_api-shaped responses for tests and benchmarks.
+
+These mirror the headers and value types of the real stats.nba.com result
+sets so parsing code can be exercised without network access. Benchmarks
+also accept a recorded response file in place of the synthetic one.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+
+TEAM_IDS = {
+    'ATL': 1610612737, 'BOS': 1610612738, 'BKN': 1610612751, 'CHA': 1610612766,
+    'CHI': 1610612741, 'CLE': 1610612739, 'DAL': 1610612742, 'DEN': 1610612743,
+    'DET': 1610612765, 'GSW': 1610612744, 'HOU': 1610612745, 'IND': 1610612754,
+    'LAC': 1610612746, 'LAL': 1610612747, 'MEM': 1610612763, 'MIA': 1610612748,
+    'MIL': 1610612749, 'MIN': 1610612750, 'NOP': 1610612740, 'NYK': 1610612752,
+    'OKC': 1610612760, 'ORL': 1610612753, 'PHI': 1610612755, 'PHX': 1610612756,
+    'POR': 1610612757, 'SAC': 1610612758, 'SAS': 1610612759, 'TOR': 1610612761,
+    'UTA': 1610612762, 'WAS': 1610612764
+}
+
+PLAYER_GAMELOG_HEADERS = [
+    'SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS',
+    'VIDEO_AVAILABLE'
+]
+
+
+def load_response(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _pct(made, attempts):
+    return round(made / attempts, 3) if attempts else 0.0
+
+
+def player_gamelog(games=82, player_id=1628369, seed=7, season_start=date(2025, 10, 21)):
+    """A PlayerGameLog response for one player's full regular season."""
+    rng = random.Random(seed)
+    abbrs = sorted(TEAM_IDS)
+    rows = []
+    for i in range(games):
+        game_date = season_start + timedelta(days=2 * i)
+        opp = abbrs[i % len(abbrs)]
+        home = i % 2 == 0
+        fga = rng.randint(10, 28)
+        fgm = rng.randint(3, fga)
+        fg3a = rng.randint(2, 12)
+        fg3m = rng.randint(0, fg3a)
+        fta = rng.randint(0, 12)
+        ftm = rng.randint(0, fta)
+        oreb = rng.randint(0, 4)
+        dreb = rng.randint(2, 10)
+        rows.append([
+            '22025', player_id, f'00225{i:05d}', game_date.strftime('%b %d, %Y').upper(),
+            f"BOS {'vs.' if home else '@'} {opp}", rng.choice(['W', 'L']), rng.randint(24, 42),
+            fgm, fga, _pct(fgm, fga), fg3m, fg3a, _pct(fg3m, fg3a), ftm, fta, _pct(ftm, fta),
+            oreb, dreb, oreb + dreb, rng.randint(0, 12), rng.randint(0, 4), rng.randint(0, 3),
+            rng.randint(0, 6), rng.randint(0, 5), 2 * fgm + fg3m + ftm, rng.randint(-20, 20), 1
+        ])
+    rows.reverse()  # PlayerGameLog lists the most recent game first
+    return {
+        'resource': 'playergamelog',
+        'parameters': {'PlayerID': player_id, 'Season': '2025-26', 'SeasonType': 'Regular Season'},
+        'resultSets': [{'name': 'PlayerGameLog', 'headers': PLAYER_GAMELOG_HEADERS, 'rowSet': rows}]
+    }
+
+
+def league_player_gamelog(players_per_team=13, games=82, seed=11):
+    """Every player's game log for a season stacked into one result set."""
+    data = {'resultSets': [{'name': 'PlayerGameLogs', 'headers': PLAYER_GAMELOG_HEADERS, 'rowSet': []}]}
+    rows = data['resultSets'][0]['rowSet']
+    for t in range(len(TEAM_IDS)):
+        for p in range(players_per_team):
+            player_id = 1600000 + t * 100 + p
+            rows.extend(player_gamelog(games, player_id, seed + t * 100 + p)['resultSets'][0]['rowSet'])
+    return data
+
+
+LEAGUE_GAME_FINDER_HEADERS = [
+    'SEASON_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'GAME_ID', 'GAME_DATE',
+    'MATCHUP', 'WL', 'MIN', 'PTS', 'FGM', 'FGA', 'FG_PCT', 'REB', 'AST', 'PLUS_MINUS'
+]
+
+
+def league_game_finder(game_days=40, seed=3, season_start=date(2025, 10, 21)):
+    """
+    A league-wide LeagueGameFinder response: on each game day, every team plays
+    once, so each game contributes one row per team. Rows are ordered like the
+    real endpoint, newest first.
+    """
+    rng = random.Random(seed)
+    abbrs = sorted(TEAM_IDS)
+    rows = []
+    for day in range(game_days):
+        game_date = (season_start + timedelta(days=day)).isoformat()
+        order = abbrs[:]
+        rng.shuffle(order)
+        for g in range(0, len(order), 2):
+            home, away = order[g], order[g + 1]
+            home_pts, away_pts = rng.randint(88, 135), rng.randint(88, 135)
+            if home_pts == away_pts:
+                home_pts += 1
+            game_id = f'00225{day:03d}{g // 2:02d}'
+            for team, opp, pts, opp_pts, marker in (
+                (home, away, home_pts, away_pts, 'vs.'),
+                (away, home, away_pts, home_pts, '@')
+            ):
+                fga = rng.randint(80, 95)
+                fgm = rng.randint(35, 50)
+                rows.append([
+                    '22025', TEAM_IDS[team], team, f'{team} Team', game_id, game_date,
+                    f'{team} {marker} {opp}', 'W' if pts > opp_pts else 'L', 240, pts,
+                    fgm, fga, _pct(fgm, fga), rng.randint(38, 52), rng.randint(20, 32), pts - opp_pts
+                ])
+    rows.reverse()
+    return {'resultSets': [{'name': 'LeagueGameFinderResults', 'headers': LEAGUE_GAME_FINDER_HEADERS, 'rowSet': rows}]}
+
+
+def frame(data, index=0):
+    import pandas as pd
+    rs = data['resultSets'][index]
+    return pd.DataFrame(rs['rowSet'], columns=rs['headers'])
+
+
+LEAGUE_DASH_TEAM_BASE_HEADERS = [
+    'TEAM_ID', 'TEAM_NAME', 'GP', 'W', 'L', 'W_PCT', 'MIN', 'FGM', 'FGA', 'FG_PCT',
+    'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST',
+    'TOV', 'STL', 'BLK', 'BLKA', 'PF', 'PFD', 'PTS', 'PLUS_MINUS', 'TEAM_ABBREVIATION'
+]
+LEAGUE_DASH_TEAM_OPP_HEADERS = [
+    'TEAM_ID', 'TEAM_NAME', 'GP', 'W', 'L', 'W_PCT', 'MIN', 'OPP_FGM', 'OPP_FGA',
+    'OPP_FG_PCT', 'OPP_FG3M', 'OPP_FG3A', 'OPP_FG3_PCT', 'OPP_FTM', 'OPP_FTA',
+    'OPP_FT_PCT', 'OPP_REB', 'OPP_AST', 'OPP_TOV', 'OPP_STL', 'OPP_BLK', 'OPP_PTS',
+    'TEAM_ABBREVIATION'
+]
+
+
+def _league_teams(teams):
+    """The 30 real teams, or `teams` synthetic ones for scaling runs."""
+    if teams is None:
+        return sorted(TEAM_IDS.items())
+    return [(f'T{i:03d}', 1700000000 + i) for i in range(teams)]
+
+
+def league_dash_team_stats(measure='Base', teams=None, seed=5):
+    """
+    A per-game LeagueDashTeamStats response for the Base or Opponent measure
+    type. Values are rounded like the real endpoint so ties occur.
+    """
+    rng = random.Random(f'{seed}-{measure}')
+    rows = []
+    for abbr, team_id in _league_teams(teams):
+        wins = rng.randint(10, 70)
+        gp = 82
+        fga = round(rng.uniform(82, 94), 1)
+        fg_pct = round(rng.uniform(0.43, 0.51), 3)
+        fg3a = round(rng.uniform(30, 45), 1)
+        fg3_pct = round(rng.uniform(0.33, 0.40), 3)
+        fta = round(rng.uniform(18, 26), 1)
+        ft_pct = round(rng.uniform(0.72, 0.84), 3)
+        pts = round(rng.uniform(104, 122), 1)
+        common = [team_id, f'{abbr} Team', gp, wins, gp - wins, round(wins / gp, 3), 48.0]
+        if measure == 'Base':
+            rows.append(common + [
+                round(fga * fg_pct, 1), fga, fg_pct, round(fg3a * fg3_pct, 1), fg3a, fg3_pct,
+                round(fta * ft_pct, 1), fta, ft_pct, round(rng.uniform(8, 13), 1),
+                round(rng.uniform(31, 36), 1), round(rng.uniform(40, 48), 1),
+                round(rng.uniform(22, 30), 1), round(rng.uniform(11, 16), 1),
+                round(rng.uniform(6, 9.5), 1), round(rng.uniform(4, 6.5), 1),
+                round(rng.uniform(4, 6), 1), round(rng.uniform(17, 21), 1),
+                round(rng.uniform(17, 21), 1), pts, round(rng.uniform(-10, 10), 1), abbr
+            ])
+        else:
+            rows.append(common + [
+                round(fga * fg_pct, 1), fga, fg_pct, round(fg3a * fg3_pct, 1), fg3a, fg3_pct,
+                round(fta * ft_pct, 1), fta, ft_pct, round(rng.uniform(40, 48), 1),
+                round(rng.uniform(22, 30), 1), round(rng.uniform(11, 16), 1),
+                round(rng.uniform(6, 9.5), 1), round(rng.uniform(4, 6.5), 1), pts, abbr
+            ])
+    headers = LEAGUE_DASH_TEAM_BASE_HEADERS if measure == 'Base' else LEAGUE_DASH_TEAM_OPP_HEADERS
+    return {'resultSets': [{'name': 'LeagueDashTeamStats', 'headers': headers, 'rowSet': rows}]}
+
+
+LEAGUE_DASH_PLAYER_HEADERS = [
+    'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'AGE', 'GP', 'W', 'L',
+    'W_PCT', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA',
+    'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'BLKA', 'PF', 'PFD',
+    'PTS', 'PLUS_MINUS'
+]
+LEAGUE_DASH_TEAM_TOTALS_HEADERS = [
+    'TEAM_ID', 'TEAM_NAME', 'GP', 'W', 'L', 'W_PCT', 'MIN', 'FGM', 'FGA', 'FG_PCT',
+    'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'TOV', 'PTS'
+]
+
+
+def league_player_totals(players_per_team=15, seed=13):
+    """
+    Season-total LeagueDashPlayerStats and LeagueDashTeamStats responses for
+    one league; team totals are the sums of their players' totals.
+    """
+    rng = random.Random(seed)
+    player_rows = []
+    team_rows = []
+    for t, (abbr, team_id) in enumerate(sorted(TEAM_IDS.items())):
+        sums = dict.fromkeys(('MIN', 'FGM', 'FGA', 'FTM', 'FTA', 'OREB', 'DREB', 'AST', 'TOV', 'PTS'), 0)
+        for p in range(players_per_team):
+            gp = rng.randint(0, 82) if p else 82
+            minutes = round(gp * rng.uniform(4, 36), 1)
+            fga = int(minutes * rng.uniform(0.2, 0.6))
+            fgm = int(fga * rng.uniform(0.38, 0.58))
+            fta = int(minutes * rng.uniform(0.02, 0.25))
+            ftm = int(fta * rng.uniform(0.6, 0.9))
+            oreb, dreb = int(minutes * rng.uniform(0, 0.1)), int(minutes * rng.uniform(0.05, 0.3))
+            ast, tov = int(minutes * rng.uniform(0.02, 0.3)), int(minutes * rng.uniform(0.01, 0.1))
+            pts = 2 * fgm + ftm
+            player_rows.append([
+                1600000 + t * 100 + p, f'Player {abbr} {p}', team_id, abbr, rng.randint(19, 38), gp,
+                gp // 2, gp - gp // 2, 0.5, minutes, fgm, fga, _pct(fgm, fga), 0, 0, 0.0, ftm, fta,
+                _pct(ftm, fta), oreb, dreb, oreb + dreb, ast, tov, 0, 0, 0, 0, 0, pts, 0
+            ])
+            for key, value in (('MIN', minutes), ('FGM', fgm), ('FGA', fga), ('FTM', ftm), ('FTA', fta),
+                               ('OREB', oreb), ('DREB', dreb), ('AST', ast), ('TOV', tov), ('PTS', pts)):
+                sums[key] += value
+        team_rows.append([
+            team_id, f'{abbr} Team', 82, 41, 41, 0.5, round(sums['MIN'] / 5, 1), sums['FGM'], sums['FGA'],
+            _pct(sums['FGM'], sums['FGA']), sums['FTM'], sums['FTA'], _pct(sums['FTM'], sums['FTA']),
+            sums['OREB'], sums['DREB'], sums['OREB'] + sums['DREB'], sums['AST'], sums['TOV'], sums['PTS']
+        ])
+    return (
+        {'resultSets': [{'name': 'LeagueDashPlayerStats', 'headers': LEAGUE_DASH_PLAYER_HEADERS, 'rowSet': player_rows}]},
+        {'resultSets': [{'name': 'LeagueDashTeamStats', 'headers': LEAGUE_DASH_TEAM_TOTALS_HEADERS, 'rowSet': team_rows}]}
+    )
+
+
+# Synthetic upstream: a stand-in for stats.nba.com / cdn.nba.com used to seed
+# replay fixtures (upstream_replay) when the real API cannot be recorded.
+
+def _result_set(name, headers=(), rows=()):
+    return {'name': name, 'headers': list(headers), 'rowSet': list(rows)}
+
+
+def _team_abbr(team_id):
+    for abbr, known_id in TEAM_IDS.items():
+        if known_id == team_id:
+            return abbr
+    return 'BOS'
+
+
+def live_scoreboard(day=date(2026, 1, 15), seed=17):
+    """todaysScoreboard_00.json with finished, live and upcoming games."""
+    rng = random.Random(seed)
+    abbrs = sorted(TEAM_IDS)
+    games = []
+    for g in range(8):
+        home, away = abbrs[2 * g], abbrs[2 * g + 1]
+        status = (3, 3, 3, 2, 2, 1, 1, 1)[g]
+        home_score = rng.randint(95, 130) if status > 1 else 0
+        away_score = rng.randint(95, 130) if status > 1 else 0
+
+        def team(abbr, score):
+            return {'teamId': TEAM_IDS[abbr], 'teamName': f'{abbr} Team', 'teamCity': 'City',
+                    'teamTricode': abbr, 'score': score}
+        games.append({
+            'gameId': f'00225{g:05d}', 'gameStatus': status,
+            'gameStatusText': ('', '7:30 pm ET', 'Q3 5:12', 'Final')[status],
+            'period': (0, 0, 3, 4)[status], 'gameTimeUTC': f'{day.isoformat()}T{19 + g // 3}:00:00Z',
+            'homeTeam': team(home, home_score), 'awayTeam': team(away, away_score)
+        })
+    return {'meta': {'version': 1, 'code': 200}, 'scoreboard': {'gameDate': day.isoformat(), 'games': games}}
+
+
+STANDINGS_HEADERS = ['TeamID', 'TeamCity', 'TeamName', 'Conference', 'WINS', 'LOSSES', 'L10', 'strCurrentStreak']
+
+
+def league_standings(seed=19):
+    rng = random.Random(seed)
+    rows = []
+    for i, (abbr, team_id) in enumerate(sorted(TEAM_IDS.items())):
+        wins = rng.randint(10, 60)
+        rows.append([team_id, 'City', f'{abbr} Team', 'East' if i % 2 else 'West', wins, 82 - wins,
+                     f'{rng.randint(2, 8)}-{rng.randint(2, 8)}', rng.choice(['W 3', 'L 1', 'W 1'])])
+    return {'resultSets': [_result_set('Standings', STANDINGS_HEADERS, rows)]}
+
+
+TEAM_GAME_LOG_HEADERS = ['Team_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'W', 'L', 'W_PCT', 'MIN', 'FGM',
+                         'FGA', 'FG_PCT', 'REB', 'AST', 'PTS']
+
+
+def team_game_log(team_id):
+    """TeamGameLog rows for one team (like the real endpoint, without PLUS_MINUS)."""
+    finder = league_game_finder()['resultSets'][0]['rowSet']
+    rows = [[r[1], r[4], r[5], r[6], r[7], 0, 0, 0.0, r[8], r[10], r[11], r[12], r[13], r[14], r[9]]
+            for r in finder if r[1] == team_id]
+    return {'resultSets': [_result_set('TeamGameLog', TEAM_GAME_LOG_HEADERS, rows)]}
+
+
+TEAM_PLAYER_HEADERS = ['PLAYER_ID', 'PLAYER_NAME', 'GP', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV']
+
+
+def team_player_dashboard(team_id, players=15):
+    rng = random.Random(team_id)
+    abbr = _team_abbr(team_id)
+    rows = []
+    for p in range(players):
+        gp = rng.randint(20, 82)
+        rows.append([1600000 + p, f'Player {abbr} {p}', gp, round(gp * rng.uniform(8, 36), 1),
+                     int(gp * rng.uniform(2, 28)), int(gp * rng.uniform(1, 11)), int(gp * rng.uniform(0.5, 9)),
+                     int(gp * rng.uniform(0, 2)), int(gp * rng.uniform(0, 2)), int(gp * rng.uniform(0.5, 3.5))])
+    return {'resultSets': [_result_set('TeamOverall'), _result_set('PlayersSeasonTotals', TEAM_PLAYER_HEADERS, rows)]}
+
+
+ROSTER_HEADERS = ['TeamID', 'SEASON', 'PLAYER', 'NUM', 'POSITION', 'PLAYER_ID']
+
+
+def common_team_roster(team_id, players=15):
+    abbr = _team_abbr(team_id)
+    positions = ('G', 'F', 'C', 'G-F', 'F-C')
+    rows = [[team_id, '2024', f'Player {abbr} {p}', str(p), positions[p % len(positions)], 1600000 + p]
+            for p in range(players)]
+    return {'resultSets': [_result_set('CommonTeamRoster', ROSTER_HEADERS, rows), _result_set('Coaches')]}
+
+
+BOXSCORE_PLAYER_HEADERS = [
+    'GAME_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'PLAYER_ID', 'PLAYER_NAME', 'MIN', 'FGM', 'FGA', 'FG_PCT',
+    'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'REB', 'AST', 'STL', 'BLK', 'TO', 'PTS'
+]
+BOXSCORE_TEAM_HEADERS = ['GAME_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'PTS']
+
+
+def boxscore(game_id, seed=23):
+    rng = random.Random(f'{seed}-{game_id}')
+    players, teams = [], []
+    for abbr in ('BOS', 'LAL'):
+        team_pts = 0
+        for p in range(13):
+            fga, fg3a, fta = rng.randint(0, 22), rng.randint(0, 10), rng.randint(0, 8)
+            fgm, fg3m, ftm = fga // 2, fg3a // 3, fta // 2
+            pts = 2 * fgm + fg3m + ftm
+            team_pts += pts
+            players.append([game_id, TEAM_IDS[abbr], abbr, 1600000 + p, f'Player {abbr} {p}',
+                            f'{rng.randint(0, 40)}:{rng.randint(0, 59):02d}', fgm, fga, _pct(fgm, fga),
+                            fg3m, fg3a, _pct(fg3m, fg3a), ftm, fta, _pct(ftm, fta), rng.randint(0, 12),
+                            rng.randint(0, 10), rng.randint(0, 3), rng.randint(0, 3), rng.randint(0, 5), pts])
+        teams.append([game_id, TEAM_IDS[abbr], abbr, team_pts])
+    return {'resultSets': [_result_set('PlayerStats', BOXSCORE_PLAYER_HEADERS, players),
+                           _result_set('TeamStarterBenchStats'),
+                           _result_set('TeamStats', BOXSCORE_TEAM_HEADERS, teams)]}
+
+
+GAME_SUMMARY_HEADERS = ['GAME_DATE_EST', 'GAME_SEQUENCE', 'GAME_ID', 'GAME_STATUS_ID', 'GAME_STATUS_TEXT',
+                        'HOME_TEAM_ID', 'VISITOR_TEAM_ID', 'SEASON']
+
+
+def boxscore_summary(game_id, status=3):
+    """BoxScoreSummaryV2 with the game's status (3 = final)."""
+    row = ['2026-01-15T00:00:00', 1, game_id, status, ('', '7:30 pm ET', 'Q3 5:12', 'Final')[status],
+           TEAM_IDS['BOS'], TEAM_IDS['LAL'], '2025']
+    return {'resultSets': [_result_set('GameSummary', GAME_SUMMARY_HEADERS, [row]), _result_set('LineScore')]}
+
+
+CAREER_HEADERS = ['PLAYER_ID', 'SEASON_ID', 'TEAM_ID', 'GP', 'MIN', 'FGM', 'FGA', 'FTA', 'REB', 'AST', 'TOV', 'PTS']
+CAREER_SETS = ('SeasonTotalsRegularSeason', 'CareerTotalsRegularSeason', 'SeasonTotalsPostSeason',
+               'CareerTotalsPostSeason', 'SeasonTotalsAllStarSeason', 'CareerTotalsAllStarSeason',
+               'SeasonTotalsCollegeSeason', 'CareerTotalsCollegeSeason', 'SeasonRankingsRegularSeason',
+               'SeasonRankingsPostSeason')
+
+
+def player_career(player_id, seasons=6):
+    rng = random.Random(player_id)
+    rows = []
+    for s in range(seasons):
+        start = 2025 - seasons + 1 + s
+        gp = rng.randint(40, 82)
+        minutes = round(gp * rng.uniform(15, 36), 1)
+        fga = int(minutes * rng.uniform(0.3, 0.55))
+        rows.append([player_id, f'{start}-{(start + 1) % 100:02d}', 1610612738, gp, minutes, int(fga * 0.47), fga,
+                     int(minutes * 0.1), int(minutes * 0.2), int(minutes * 0.12), int(minutes * 0.05),
+                     int(fga * 1.2)])
+    sets = [_result_set(name) for name in CAREER_SETS]
+    sets[0] = _result_set('SeasonTotalsRegularSeason', CAREER_HEADERS, rows)
+    return {'resultSets': sets}
+
+
+TEAM_DASHBOARD_HEADERS = ['GROUP_SET', 'GROUP_VALUE', 'GP', 'W', 'L', 'MIN', 'FGM', 'FGA', 'FTA', 'OREB',
+                          'DREB', 'REB', 'AST', 'TOV', 'PTS']
+TEAM_DASHBOARD_SETS = ('OverallTeamDashboard', 'LocationTeamDashboard', 'WinsLossesTeamDashboard',
+                       'MonthTeamDashboard', 'PrePostAllStarTeamDashboard', 'DaysRestTeamDashboard')
+
+
+def team_dashboard_totals(team_id):
+    rng = random.Random(team_id)
+    gp = 60
+    row = ['Overall', '2025-26', gp, 30, 30, 240 * gp, 41 * gp, 88 * gp, 22 * gp, 10 * gp, 34 * gp, 44 * gp,
+           rng.randint(24, 28) * gp, 14 * gp, 114 * gp]
+    sets = [_result_set(name) for name in TEAM_DASHBOARD_SETS]
+    sets[0] = _result_set('OverallTeamDashboard', TEAM_DASHBOARD_HEADERS, [row])
+    return {'resultSets': sets}
+
+
+def synthetic_response(endpoint, parameters):
+    """The response dict the synthetic upstream returns for one nba_api request."""
+    endpoint = endpoint.lower()
+    params = parameters or {}
+    team_id = int(params.get('TeamID') or 0) or None
+    if endpoint.startswith('scoreboard'):
+        return live_scoreboard()
+    if endpoint == 'leaguestandings':
+        return league_standings()
+    if endpoint == 'leaguedashteamstats':
+        if params.get('PerMode') == 'Totals':
+            return league_player_totals()[1]
+        return league_dash_team_stats(params.get('MeasureType') or 'Base')
+    if endpoint == 'leaguedashplayerstats':
+        return league_player_totals()[0]
+    if endpoint == 'leaguegamefinder':
+        data = league_game_finder()
+        if team_id:
+            rs = data['resultSets'][0]
+            rs['rowSet'] = [row for row in rs['rowSet'] if row[1] == team_id]
+        return data
+    if endpoint == 'teamgamelog':
+        return team_game_log(team_id)
+    if endpoint == 'teamplayerdashboard':
+        return team_player_dashboard(team_id)
+    if endpoint == 'commonteamroster':
+        return common_team_roster(team_id)
+    if endpoint == 'boxscoretraditionalv2':
+        return boxscore(params.get('GameID'))
+    if endpoint == 'boxscoresummaryv2':
+        return boxscore_summary(params.get('GameID'))
+    if endpoint == 'playergamelog':
+        return player_gamelog(player_id=int(params.get('PlayerID') or 1628369))
+    if endpoint == 'playercareerstats':
+        return player_career(int(params.get('PlayerID') or 1628369))
+    if endpoint == 'teamdashboardbygeneralsplits':
+        return team_dashboard_totals(team_id)
+    raise KeyError(f"No synthetic response for endpoint {endpoint}")
+
+
+def synthetic_send(http, endpoint, parameters, **kwargs):
+    """upstream_replay transport signature: (body text, status, url)."""
+    body = json.dumps(synthetic_response(endpoint, parameters))
+    return body, 200, f"{http.base_url.format(endpoint=endpoint)}"
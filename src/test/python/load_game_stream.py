@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Load test for /games/stream: hundreds of SSE subscribers on one threaded
+worker, fed by scripted scoreboard updates. For each subscriber count it
+reports the server-side publish cost per update and how long the update
+took to reach every subscriber.
+
+    python src/test/python/load_game_stream.py [--subscribers 100 300 600] [--updates 20]
+"""
+
+import argparse
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import logging
+from werkzeug.serving import make_server
+
+import nba_service
+from game_stream import GameStream
+from scoreboard_poller import ScoreboardPoller
+
+
+def _team(team_id, name, code, score):
+    return {'teamId': team_id, 'teamName': name, 'teamCity': 'City', 'teamTricode': code, 'score': score}
+
+
+class ScriptedScoreboard:
+    """A 12-game night where every update changes the score of a few games."""
+
+    def __init__(self, games=12, seed=1):
+        self.rng = random.Random(seed)
+        self.games = [{
+            'gameId': f'00225000{i:02d}', 'gameStatus': 2, 'gameStatusText': 'Q1 12:00', 'period': 1,
+            'homeTeam': _team(1610612700 + i, f'Home{i}', f'H{i:02d}', 0),
+            'awayTeam': _team(1610612800 + i, f'Away{i}', f'A{i:02d}', 0)
+        } for i in range(games)]
+
+    def step(self):
+        for game in self.rng.sample(self.games, 3):
+            side = self.rng.choice(('homeTeam', 'awayTeam'))
+            game[side]['score'] += self.rng.choice((1, 2, 3))
+
+    def __call__(self):
+        return {'scoreboard': {'gameDate': '2026-01-15', 'games': [
+            {**g, 'homeTeam': dict(g['homeTeam']), 'awayTeam': dict(g['awayTeam'])} for g in self.games
+        ]}}
+
+
+class Subscriber(threading.Thread):
+    def __init__(self, port, received):
+        super().__init__(daemon=True)
+        self.port = port
+        self.received = received  # event id -> list of arrival times
+        self.ready = threading.Event()
+
+    def run(self):
+        sock = socket.create_connection(('127.0.0.1', self.port))
+        sock.sendall(b'GET /games/stream HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n')
+        reader = sock.makefile('rb')
+        for raw in reader:
+            line = raw.decode().rstrip('\r\n')
+            if line.startswith('id: '):
+                self.received.setdefault(line[4:], []).append(time.perf_counter())
+                self.ready.set()
+
+
+def run(subscriber_count, updates, interval):
+    scoreboard = ScriptedScoreboard()
+    stream = GameStream()
+    poller = ScoreboardPoller(scoreboard, nba_service._scoreboard_views, live_interval=3600, idle_interval=3600)
+    poller.add_listener(lambda snapshot: stream.publish(snapshot.views['games']['data']))
+    poller.start()
+    nba_service.scoreboard_poller = poller
+    nba_service.game_stream = stream
+
+    server = make_server('127.0.0.1', 0, nba_service.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    received = {}
+    subscribers = [Subscriber(server.server_port, received) for _ in range(subscriber_count)]
+    for subscriber in subscribers:
+        subscriber.start()
+    for subscriber in subscribers:
+        subscriber.ready.wait(10)
+
+    publish_ms = []
+    sent = {}
+    for _ in range(updates):
+        scoreboard.step()
+        events_before = stream.events
+        seconds_before = stream.publish_seconds
+        started = time.perf_counter()
+        poller.refresh()
+        if stream.events > events_before:
+            publish_ms.append((stream.publish_seconds - seconds_before) * 1000)
+            sent[stream.stats()['last_event_id']] = started
+        time.sleep(interval)
+    time.sleep(0.5)
+    server.shutdown()
+
+    fanout_ms = []
+    delivered = 0
+    for event_id, started in sent.items():
+        arrivals = received.get(event_id, [])
+        delivered += len(arrivals)
+        if arrivals:
+            fanout_ms.append((max(arrivals) - started) * 1000)
+    return {
+        'subscribers': subscriber_count,
+        'updates': len(sent),
+        'delivered': f"{delivered}/{len(sent) * subscriber_count}",
+        'publish_ms': statistics.median(publish_ms),
+        'fanout_p50_ms': statistics.median(fanout_ms),
+        'fanout_max_ms': max(fanout_ms),
+        'per_subscriber_us': statistics.median(fanout_ms) * 1000 / subscriber_count
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--subscribers', type=int, nargs='+', default=[100, 300, 600])
+    parser.add_argument('--updates', type=int, default=20)
+    parser.add_argument('--interval', type=float, default=0.2, help='Seconds between scoreboard updates.')
+    args = parser.parse_args()
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    print(f"{'subscribers':>11} {'delivered':>12} {'publish ms':>11} {'fan-out p50 ms':>15} "
+          f"{'fan-out max ms':>15} {'us/subscriber':>14}")
+    for count in args.subscribers:
+        r = run(count, args.updates, args.interval)
+        print(f"{r['subscribers']:>11} {r['delivered']:>12} {r['publish_ms']:>11.3f} {r['fanout_p50_ms']:>15.1f} "
+              f"{r['fanout_max_ms']:>15.1f} {r['per_subscriber_us']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Load test of nba_service under gunicorn, sweeping worker configurations.
+
+Each configuration starts `gunicorn nba_service:app` in a fresh process with
+its own cache directory and nba_api answered from replayed fixtures
+(upstream_replay, NBA_UPSTREAM_MODE=replay) after --latency-ms, so the
+production throttle, caches and stores run as deployed and only the network
+is stood in for. Clients replay a traffic mix of scoreboard polls, box
+scores, game logs, usage rates, team leaders and rankings, with ids drawn
+from a skewed distribution so hot teams and games repeat and the tail
+misses the caches. After --warmup seconds of unmeasured traffic, --duration
+seconds are measured and throughput, error rate and p50/p95/p99 reported.
+
+--shared-state runs every configuration with NBA_SHARED_STATE set, so its
+workers share one upstream budget and one cache (shared_state.py).
+
+Configurations are worker_class:key=value,... with w (workers), t (threads,
+gthread) and c (worker connections, gevent). Worker classes whose module is
+not installed (gevent) are reported as skipped.
+
+    python src/test/python/load_gunicorn.py
+    python src/test/python/load_gunicorn.py --configs sync:w=4 gthread:w=2,t=16 gevent:w=2,c=200 --clients 64
+    python src/test/python/load_gunicorn.py --fixtures DIR --by-route --json /tmp/sweep.json
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import conftest  # noqa: F401  (puts src/main/python on sys.path)
+import fixtures
+from upstream_replay import Recorder, installed
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'main', 'python')
+DEFAULT_CONFIGS = (
+    'sync:w=1', 'sync:w=4',
+    'gthread:w=1,t=8', 'gthread:w=2,t=8', 'gthread:w=4,t=4',
+    'gevent:w=1,c=100', 'gevent:w=2,c=100'
+)
+WORKER_MODULES = {'gevent': 'gevent', 'eventlet': 'eventlet', 'tornado': 'tornado'}
+
+TEAMS = sorted(fixtures.TEAM_IDS.values())
+PLAYERS = [1600000 + t * 100 + p for t in range(len(TEAMS)) for p in range(0, 13, 3)]  # in the league tables
+GAMES = [f"00225{i:05d}" for i in range(1, 121)]
+
+# (category, weight, path template, id pool)
+MIX = (
+    ('scoreboard', 30, '/games', None),
+    ('finals', 5, '/games/finals', None),
+    ('boxscore', 15, '/games/{}/boxscore', GAMES),
+    ('player_gamelog', 10, '/players/{}/gamelog', PLAYERS),
+    ('team_games', 5, '/teams/{}/games', TEAMS),
+    ('league_usage', 5, '/players/usage-rates', None),
+    ('player_usage', 7, '/players/{}/usage-rates', PLAYERS),
+    ('team_leaders', 13, '/teams/{}/leaders', TEAMS),
+    ('team_rankings', 10, '/team-rankings', None),
+)
+
+
+def all_paths():
+    for _, _, template, pool in MIX:
+        if pool is None:
+            yield template
+        else:
+            for item in pool:
+                yield template.format(item)
+
+
+class TrafficMix:
+    """Draws (category, path) pairs; ids follow a 1/rank (Zipf-like) popularity."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.weights = [weight for _, weight, _, _ in MIX]
+        self.id_weights = {category: [1.0 / (rank + 1) for rank in range(len(pool))]
+                           for category, _, _, pool in MIX if pool}
+
+    def next(self):
+        category, _, template, pool = self.rng.choices(MIX, self.weights)[0]
+        if pool is None:
+            return category, template
+        return category, template.format(self.rng.choices(pool, self.id_weights[category])[0])
+
+
+def parse_config(text):
+    worker_class, _, options = text.partition(':')
+    config = {'worker_class': worker_class, 'w': 1, 't': 1, 'c': 1000}
+    for option in filter(None, options.split(',')):
+        key, _, value = option.partition('=')
+        if key not in ('w', 't', 'c'):
+            raise ValueError(f"Unknown option {key!r} in {text!r} (expected w, t or c)")
+        config[key] = int(value)
+    return config
+
+
+def describe(config):
+    text = f"{config['worker_class']} w={config['w']}"
+    if config['worker_class'] == 'gthread':
+        text += f" t={config['t']}"
+    elif config['worker_class'] in WORKER_MODULES:
+        text += f" c={config['c']}"
+    return text
+
+
+def unavailable(config):
+    module = WORKER_MODULES.get(config['worker_class'])
+    if module and importlib.util.find_spec(module) is None:
+        return f"{module} not installed"
+    return None
+
+
+def seed_fixtures(directory, workdir):
+    """Record every path of the mix from the synthetic upstream, in process."""
+    from bench_routes import Service, clear_caches
+    service = Service(workdir, throttle=False)
+    try:
+        with installed(Recorder(directory, send=fixtures.synthetic_send)) as recorder:
+            service.start_poller()
+            for path in all_paths():
+                clear_caches()
+                status, _ = service.request('GET', path)
+                if status >= 500:
+                    print(f"Seeding {path} failed with {status}")
+        return recorder.recorded
+    finally:
+        service.stop()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class Gunicorn:
+    def __init__(self, config, fixture_dir, latency_ms, workdir, timeout, shared_state=False):
+        self.port = free_port()
+        os.makedirs(workdir, exist_ok=True)
+        env = dict(os.environ,
+                   NBA_UPSTREAM_MODE='replay',
+                   NBA_UPSTREAM_FIXTURES=fixture_dir,
+                   NBA_UPSTREAM_LATENCY_MS=str(latency_ms),
+                   NBA_CACHE_DIR=workdir,
+                   # Measures serving only; warmup would also rewrite the static standings file
+                   NBA_WARMUP='off')
+        env.pop('NBA_SHARED_STATE', None)
+        if shared_state:
+            env['NBA_SHARED_STATE'] = os.path.join(workdir, 'shared_state.sqlite3')
+        command = [sys.executable, '-m', 'gunicorn', 'nba_service:app',
+                   '--bind', f"127.0.0.1:{self.port}",
+                   '--worker-class', config['worker_class'],
+                   '--workers', str(config['w']),
+                   '--timeout', str(timeout),
+                   '--log-level', 'warning']
+        if config['worker_class'] == 'gthread':
+            command += ['--threads', str(config['t'])]
+        elif config['worker_class'] in WORKER_MODULES:
+            command += ['--worker-connections', str(config['c'])]
+        self.log_path = os.path.join(workdir, 'gunicorn.log')
+        self._log = open(self.log_path, 'w')
+        # Request log lines go to stdout; only gunicorn's own messages are kept
+        self.process = subprocess.Popen(command, cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL,
+                                        stderr=self._log)
+
+    def wait_healthy(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                status, _ = request(self.port, '/health', timeout=2)
+                if status == 200:
+                    return True
+            except OSError:
+                pass
+            time.sleep(0.1)
+        return False
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self._log.close()
+
+
+def request(port, path, timeout=60):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+        response = connection.getresponse()
+        response.read()
+        return response.status, None
+    finally:
+        connection.close()
+
+
+class Client(threading.Thread):
+    def __init__(self, port, seed, stop_at, results):
+        super().__init__(daemon=True)
+        self.port = port
+        self.mix = TrafficMix(seed)
+        self.stop_at = stop_at
+        self.results = results  # shared list of (category, ok, seconds); list.append is atomic
+
+    def run(self):
+        while time.monotonic() < self.stop_at:
+            category, path = self.mix.next()
+            started = time.perf_counter()
+            try:
+                status, _ = request(self.port, path)
+                ok = status < 500
+            except OSError:
+                ok = False
+            self.results.append((category, ok, time.perf_counter() - started))
+
+
+def drive(port, clients, seconds, seed):
+    results = []
+    stop_at = time.monotonic() + seconds
+    threads = [Client(port, seed + i, stop_at, results) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))]
+
+
+def summarize(samples, wall):
+    latencies = sorted(seconds for _, _, seconds in samples)
+    errors = sum(1 for _, ok, _ in samples if not ok)
+    return {
+        "requests": len(samples),
+        "throughput": round(len(samples) / wall, 1) if wall else 0.0,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2)
+    }
+
+
+def run_config(config, args, fixture_dir, workdir):
+    server = Gunicorn(config, fixture_dir, args.latency_ms, workdir, args.worker_timeout, args.shared_state)
+    try:
+        if not server.wait_healthy(args.start_timeout):
+            with open(server.log_path) as f:
+                tail = f.read()[-2000:]
+            return {"config": describe(config), "skipped": f"did not start:\n{tail}"}
+        drive(server.port, args.clients, args.warmup, args.seed + 1000)
+        samples, wall = drive(server.port, args.clients, args.duration, args.seed)
+    finally:
+        server.stop()
+    result = {"config": describe(config), **summarize(samples, wall)}
+    routes = {}
+    for sample in samples:
+        routes.setdefault(sample[0], []).append(sample)
+    result["routes"] = {category: summarize(route_samples, wall) for category, route_samples in sorted(routes.items())}
+    return result
+
+
+def report(results, by_route):
+    print(f"\n{'configuration':<22} {'requests':>9} {'req/s':>8} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for result in results:
+        if 'skipped' in result:
+            print(f"{result['config']:<22} skipped: {result['skipped']}")
+            continue
+        print(f"{result['config']:<22} {result['requests']:>9} {result['throughput']:>8.1f} "
+              f"{result['error_rate'] * 100:>7.2f}% {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+              f"{result['p99_ms']:>9.1f}")
+        if by_route:
+            for category, r in result['routes'].items():
+                print(f"  {category:<20} {r['requests']:>9} {r['throughput']:>8.1f} {r['error_rate'] * 100:>7.2f}% "
+                      f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--configs', nargs='+', default=list(DEFAULT_CONFIGS),
+                        help="worker_class:w=N[,t=N][,c=N] entries to sweep")
+    parser.add_argument('--fixtures', help="Replay fixtures covering the mix (default: synthetic, seeded into a temp dir)")
+    parser.add_argument('--latency-ms', type=float, default=40.0, help="Injected latency per upstream call")
+    parser.add_argument('--clients', type=int, default=32, help="Concurrent closed-loop clients")
+    parser.add_argument('--duration', type=float, default=30.0, help="Measured seconds per configuration")
+    parser.add_argument('--warmup', type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument('--worker-timeout', type=int, default=120, help="gunicorn --timeout")
+    parser.add_argument('--start-timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--shared-state', action='store_true', help="Share the upstream budget and caches across workers")
+    parser.add_argument('--by-route', action='store_true', help="Also report each traffic category")
+    parser.add_argument('--json', help="Write the results to this file")
+    args = parser.parse_args()
+
+    configs = [parse_config(text) for text in args.configs]
+    workdir = tempfile.mkdtemp(prefix='load_gunicorn_')
+    fixture_dir = args.fixtures
+    if not fixture_dir:
+        fixture_dir = os.path.join(workdir, 'fixtures')
+        print(f"Seeded {seed_fixtures(fixture_dir, os.path.join(workdir, 'seed'))} synthetic fixtures into {fixture_dir}")
+
+    results = []
+    for index, config in enumerate(configs):
+        reason = unavailable(config)
+        if reason:
+            results.append({"config": describe(config), "skipped": reason})
+            continue
+        print(f"Running {describe(config)}: {args.clients} clients, {args.warmup:g}s warmup + {args.duration:g}s")
+        results.append(run_config(config, args, os.path.abspath(fixture_dir), os.path.join(workdir, f"run{index}")))
+
+    report(results, args.by_route)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"clients": args.clients, "latency_ms": args.latency_ms, "duration": args.duration,
+                       "shared_state": args.shared_state, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
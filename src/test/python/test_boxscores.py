@@ -0,0 +1,151 @@
+import json
+import time
+
+import pytest
+
+import fixtures
+import nba_service
+from local_store import BoxscoreStore
+from response_cache import make_cache_key
+
+GAME = '0022500042'
+
+
+def scoreboard(status):
+    text = ('', '7:30 pm ET', 'Q4 0:41', 'Final')[status]
+    return {'scoreboard': {'gameDate': '2026-01-15', 'games': [
+        {'gameId': GAME, 'gameStatus': status, 'gameStatusText': text}
+    ]}}
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path):
+    state = {'box': fixtures.boxscore(GAME), 'status': 3, 'scoreboard': {'scoreboard': {'games': []}}, 'calls': [],
+             'fail': set(), 'delay': {}}
+
+    def fake_call(endpoint_cls, **params):
+        state['calls'].append(endpoint_cls.__name__)
+        time.sleep(state['delay'].get(params['game_id'], 0))
+        if params['game_id'] in state['fail']:
+            raise ConnectionError("Read timed out")
+        if endpoint_cls.__name__ == 'BoxScoreSummaryV2':
+            return fixtures.boxscore_summary(params['game_id'], state['status'])
+        return state['box']
+
+    def fake_scoreboard():
+        if state['scoreboard'] is None:
+            raise RuntimeError("Scoreboard unavailable: timed out")
+        return state['scoreboard']
+
+    monkeypatch.setattr(nba_service, '_call_upstream', fake_call)
+    monkeypatch.setattr(nba_service, 'get_live_scoreboard', fake_scoreboard)
+    monkeypatch.setattr(nba_service, 'boxscore_store', BoxscoreStore(str(tmp_path / 'boxscores.sqlite3')))
+    nba_service.upstream_cache.invalidate()
+    nba_service.boxscore_cache.invalidate()
+    yield state
+    nba_service.upstream_cache.invalidate()
+    nba_service.boxscore_cache.invalidate()
+
+
+def get_boxscore(game_id=GAME):
+    response = nba_service.app.test_client().get(f'/games/{game_id}/boxscore')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_stale_in_progress_box_score_is_not_stored_as_final(upstream):
+    q4, final = fixtures.boxscore(GAME, seed=1), fixtures.boxscore(GAME, seed=2)
+    # A Q4 box score was cached before the game ended and is now past its TTL, in the stale window
+    key = make_cache_key('BoxScoreTraditionalV2', {'game_id': GAME})
+    nba_service.upstream_cache.set(key, q4, ttl=0, stale_ttl=300)
+    upstream['scoreboard'] = scoreboard(3)
+    upstream['box'] = final
+
+    expected = nba_service._parse_boxscore(GAME, final)
+    assert get_boxscore() == expected
+    assert nba_service.boxscore_store.get(GAME) == expected
+
+
+def test_live_game_is_served_but_not_stored(upstream):
+    upstream['scoreboard'] = scoreboard(2)
+
+    assert get_boxscore()['count'] == 26
+    assert nba_service.boxscore_store.count() == 0
+    assert 'BoxScoreSummaryV2' not in upstream['calls']
+
+
+def test_scoreboard_outage_still_serves_the_box_score(upstream):
+    upstream['scoreboard'] = None
+
+    assert get_boxscore()['count'] == 26
+    assert nba_service.boxscore_store.count() == 0
+
+
+def test_earlier_games_are_stored_only_when_their_own_status_is_final(upstream):
+    upstream['status'] = 2
+    get_boxscore()
+    assert nba_service.boxscore_store.count() == 0
+
+    nba_service.upstream_cache.invalidate()
+    upstream['status'] = 3
+    get_boxscore()
+    assert nba_service.boxscore_store.get(GAME)['count'] == 26
+
+
+def test_stored_box_score_is_served_without_the_upstream(upstream):
+    first = get_boxscore()
+    calls = len(upstream['calls'])
+
+    nba_service.upstream_cache.invalidate()
+    nba_service.boxscore_cache.invalidate()  # as after a restart
+    upstream['scoreboard'] = None
+    assert get_boxscore() == first
+    assert len(upstream['calls']) == calls
+
+
+def post_boxscores(game_ids):
+    return nba_service.app.test_client().post('/games/boxscores', json={'game_ids': game_ids})
+
+
+def test_batch_streams_one_line_per_game_in_request_order(upstream):
+    game_ids = ['0022500001', '0022500002', '0022500003', '0022500004']
+    nba_service.boxscore_store.put('0022500003', {'game_id': '0022500003', 'players': [], 'teams': [], 'count': 0})
+    upstream['delay'] = {'0022500001': 0.2}  # finishes last
+    upstream['fail'] = {'0022500002'}
+
+    response = post_boxscores(game_ids + ['0022500001'])
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [line['game_id'] for line in lines] == game_ids
+    assert lines[0]['count'] == 26
+    assert lines[1]['players'] == [] and 'timed out' in lines[1]['error']
+    assert lines[2]['count'] == 0  # from the store
+    assert lines[3]['count'] == 26
+
+
+def test_batch_rejects_more_than_the_limit(upstream):
+    response = post_boxscores([f'00225{i:05d}' for i in range(nba_service.BOXSCORE_BATCH_LIMIT + 1)])
+    assert response.status_code == 400
+    assert 'At most' in response.get_json()['error']
+    assert upstream['calls'] == []
+
+    assert post_boxscores([]).status_code == 400
+
+
+def test_cold_final_game_calls_the_upstream_once(upstream):
+    upstream['scoreboard'] = scoreboard(3)
+    get_boxscore()
+    assert upstream['calls'] == ['BoxScoreTraditionalV2']
+    assert nba_service.boxscore_store.count() == 1
+
+    # An earlier game is not on today's scoreboard: its status takes one summary call
+    nba_service.boxscore_store.clear()
+    nba_service.boxscore_cache.invalidate()
+    nba_service.upstream_cache.invalidate()
+    upstream['calls'].clear()
+    upstream['scoreboard'] = {'scoreboard': {'games': []}}
+    get_boxscore()
+    assert upstream['calls'] == ['BoxScoreTraditionalV2', 'BoxScoreSummaryV2']
+    assert nba_service.boxscore_store.count() == 1
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import nba_service
+from local_store import CareerStore
+
+CAREER_HEADERS = ['PLAYER_ID', 'SEASON_ID', 'LEAGUE_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'PLAYER_AGE',
+                  'GP', 'GS', 'MIN', 'FGM', 'FGA', 'FTA', 'REB', 'AST', 'TOV', 'PTS']
+
+
+def _career(player_id):
+    current = nba_service._current_season_start_year()
+    rows = []
+    for year in range(current - 3, current + 1):
+        season = f'{year}-{(year + 1) % 100:02d}'
+        rows.append([player_id, season, '00', 1610612738, 'BOS', 24, 70, 70, 2400.0,
+                     600, 1200, 300, 500, 400, 150, 1700 + year % 10])
+    return {'resultSets': [{'name': 'SeasonTotalsRegularSeason', 'headers': CAREER_HEADERS, 'rowSet': rows}]}
+
+
+def _setup(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_call(endpoint_cls, **params):
+        calls.append(params['player_id'])
+        return _career(params['player_id'])
+
+    monkeypatch.setattr(nba_service, '_call_upstream', fake_call)
+    monkeypatch.setattr(nba_service, 'career_store', CareerStore(str(tmp_path / 'careers.sqlite3')))
+    nba_service.career_cache.invalidate()
+    return calls
+
+
+def test_completed_seasons_survive_restart(monkeypatch, tmp_path):
+    calls = _setup(monkeypatch, tmp_path)
+    current = nba_service._current_season_start_year()
+    last_season = f'{current - 1}-{current % 100:02d}'
+
+    first = nba_service._get_player_season_totals(201939, last_season)
+    nba_service.career_cache.invalidate()  # as after a restart
+    second = nba_service._get_player_season_totals(201939, last_season)
+
+    assert calls == [201939]
+    assert first == second
+    assert nba_service.career_store.count() == 3  # the current season is not stored
+
+
+def test_current_season_hits_upstream_once_per_ttl(monkeypatch, tmp_path):
+    calls = _setup(monkeypatch, tmp_path)
+    current = nba_service._current_season_start_year()
+    season = f'{current}-{(current + 1) % 100:02d}'
+
+    for _ in range(5):
+        totals = nba_service._get_player_season_totals(201939, season)
+
+    assert calls == [201939]
+    assert totals['gp'] == 70 and 'season_id' not in totals
+
+
+def test_completed_season_boundary():
+    assert nba_service._is_completed_season('2024-25', datetime(2025, 10, 1))
+    assert not nba_service._is_completed_season('2024-25', datetime(2025, 6, 30))
+    assert not nba_service._is_completed_season('2025-26', datetime(2025, 10, 1))
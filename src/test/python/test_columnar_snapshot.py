@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from columnar_snapshot import DictionaryColumn, SnapshotSource, load_snapshot, snapshot_for, write_snapshot
+
+CSV = (
+    "Rk,Player,Age,Team,Pos,G,FG%,PTS,Awards,active\r\n"
+    "1,Luka Dončić,25,DAL,PG,70,0.487,33.9,MVP-3,True\r\n"
+    "2,Nikola Jokić,29,DEN,C,79,0.583,26.4,MVP-1,True\r\n"
+    "3,LeBron James,39,LAL,PF,71,,25.7,,False\r\n"
+    "4,Kevin Durant,35,,PF,75,0.523,27.1,,True\r\n"
+)
+
+
+def write_csv(path, text=CSV):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    return str(path)
+
+
+def test_columns_are_typed_and_dictionary_encoded(tmp_path):
+    snapshot = load_snapshot(write_snapshot(write_csv(tmp_path / 'stats.csv'), str(tmp_path / 'stats.ncol')))
+
+    assert len(snapshot) == 4
+    assert snapshot.columns == ['Rk', 'Player', 'Age', 'Team', 'Pos', 'G', 'FG%', 'PTS', 'Awards', 'active']
+    assert snapshot['G'].dtype == np.int8
+    assert snapshot['PTS'].dtype == np.float32
+    assert snapshot['PTS'].tolist() == [np.float32(v) for v in (33.9, 26.4, 25.7, 27.1)]
+    assert np.isnan(snapshot['FG%'][2])
+    assert snapshot['active'].tolist() == [True, True, False, True]
+
+    team = snapshot['Team']
+    assert isinstance(team, DictionaryColumn)
+    assert team.to_list() == ['DAL', 'DEN', 'LAL', None]
+    assert team.codes[3] == -1
+    assert (snapshot['Pos'].codes == snapshot['Pos'].code_of('PF')).sum() == 2
+    assert snapshot['Player'][0] == 'Luka Dončić'
+
+    lebron = snapshot.records()[2]
+    assert (lebron['Player'], lebron['G'], lebron['FG%'], lebron['Awards'], lebron['active']) == (
+        'LeBron James', 71, None, None, False)
+
+
+def test_columns_are_views_of_the_mapping(tmp_path):
+    snapshot = load_snapshot(write_snapshot(write_csv(tmp_path / 'stats.csv'), str(tmp_path / 'stats.ncol')))
+
+    assert not snapshot['PTS'].flags.owndata
+    assert not snapshot['PTS'].flags.writeable
+    assert not snapshot['Team'].codes.flags.owndata
+    assert snapshot['PTS'].ctypes.data % 64 == 0
+
+    frame = snapshot.to_pandas()
+    expected = pd.read_csv(str(tmp_path / 'stats.csv'))
+    assert frame['Player'].tolist() == expected['Player'].tolist()
+    assert frame['G'].tolist() == expected['G'].tolist()
+
+
+def test_snapshots_are_keyed_on_the_source_hash(tmp_path):
+    csv_path = write_csv(tmp_path / 'stats.csv')
+    snapshot_dir = str(tmp_path / 'snapshots')
+    first = snapshot_for(csv_path, snapshot_dir)
+    assert snapshot_for(csv_path, snapshot_dir).path == first.path
+
+    write_csv(csv_path, CSV.replace('33.9', '34.0'))
+    second = snapshot_for(csv_path, snapshot_dir)
+    assert second.path != first.path
+    assert second['PTS'][0] == np.float32(34.0)
+    assert first['PTS'][0] == np.float32(33.9)  # still mapped after its file was removed
+    assert os.listdir(snapshot_dir) == [os.path.basename(second.path)]
+
+
+def test_source_reloads_only_when_the_content_changes(tmp_path):
+    csv_path = write_csv(tmp_path / 'stats.csv')
+    source = SnapshotSource(csv_path, str(tmp_path / 'snapshots'))
+    first = source.get()
+    assert source.get() is first
+
+    os.utime(csv_path, (2000, 2000))  # touched, same content
+    assert source.get() is first
+
+    write_csv(csv_path, CSV.replace('DAL', 'LAL'))
+    assert source.get()['Team'].to_list() == ['LAL', 'DEN', 'LAL', None]
+    assert source.loads == 2
@@ -0,0 +1,46 @@
+import nba_service
+from scoreboard_poller import ScoreboardPoller
+
+
+def _client(monkeypatch):
+    def fetch():
+        return {'scoreboard': {'gameDate': '2026-01-15', 'games': []}}
+
+    poller = ScoreboardPoller(fetch, nba_service._scoreboard_views)
+    poller.refresh()
+    poller._thread = object()  # already running; no background thread in tests
+    monkeypatch.setattr(nba_service, 'scoreboard_poller', poller)
+    return nba_service.app.test_client(), poller
+
+
+def test_etag_and_304_for_cached_payload(monkeypatch):
+    client, poller = _client(monkeypatch)
+    first = client.get('/games/finals')
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+
+    assert first.status_code == 200 and not etag.startswith('W/')
+    assert client.get('/games/finals', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/games/finals', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+    # A new poll with identical content keeps the validators; changed content does not match
+    poller.refresh()
+    again = client.get('/games/finals', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert client.get('/games', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_uncached_routes_are_hashed_per_response(monkeypatch):
+    client, _ = _client(monkeypatch)
+    first = client.get('/health')
+    second = client.get('/health', headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert second.status_code == 304 and second.data == b''
+
+
+def test_cached_value_encoded_once(monkeypatch):
+    client, _ = _client(monkeypatch)
+    misses = nba_service.payload_memo.misses
+    for _ in range(5):
+        client.get('/games')
+    assert nba_service.payload_memo.misses == misses + 1
@@ -0,0 +1,73 @@
+import json
+
+from game_stream import GameStream
+
+
+def _game(game_id, home, away, period=1, status='Q1 10:00'):
+    return {'id': game_id, 'home_team_score': home, 'visitor_team_score': away, 'period': period,
+            'status': status, 'home_team': {'abbreviation': 'BOS'}}
+
+
+def _events(chunks):
+    events = []
+    for chunk in chunks:
+        if chunk.startswith('id: '):
+            lines = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+            events.append((lines['id'], lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def _take(subscription, count):
+    return [next(subscription) for _ in range(count)]
+
+
+def test_snapshot_on_connect_then_changed_fields_only():
+    stream = GameStream(heartbeat=0.01)
+    stream.publish([_game('1', 0, 0), _game('2', 0, 0)])
+    subscription = stream.subscribe()
+    _, snapshot = _take(subscription, 2)
+
+    stream.publish([_game('1', 3, 0), _game('2', 0, 0)])
+    stream.publish([_game('1', 3, 0), _game('2', 0, 0)])  # unchanged: no event
+    stream.publish([_game('1', 3, 2, period=2, status='Q2 11:40'), _game('2', 0, 0)])
+    events = _events([snapshot] + _take(subscription, 2))
+
+    assert [event for _, event, _ in events] == ['snapshot', 'delta', 'delta']
+    assert len(events[0][2]['games']) == 2
+    assert events[1][2] == {'games': [{'id': '1', 'home_team_score': 3}]}
+    assert events[2][2] == {'games': [{'id': '1', 'visitor_team_score': 2, 'period': 2, 'status': 'Q2 11:40'}]}
+
+
+def test_resume_from_last_event_id():
+    stream = GameStream(heartbeat=0.01)
+    stream.publish([_game('1', 0, 0)])
+    seen = stream.publish([_game('1', 2, 0)])
+    stream.publish([_game('1', 4, 0)])
+    stream.publish([_game('1', 4, 3)])
+
+    resumed = _events(_take(stream.subscribe(f'{stream.epoch}-{seen}'), 3))
+    assert [data for _, _, data in resumed] == [
+        {'games': [{'id': '1', 'home_team_score': 4}]},
+        {'games': [{'id': '1', 'visitor_team_score': 3}]}
+    ]
+
+    # Ids from another process (or evicted from history) fall back to a snapshot
+    other = GameStream()  # another worker, started in the same second
+    assert other.epoch != stream.epoch
+    for stale in ('123-2', 'garbage', f'{other.epoch}-{seen}'):
+        _, event, data = _events(_take(stream.subscribe(stale), 2))[0]
+        assert event == 'snapshot' and data['games'][0]['visitor_team_score'] == 3
+
+
+def test_new_game_set_sends_snapshot_and_heartbeats_when_idle():
+    stream = GameStream(heartbeat=0.01)
+    stream.publish([_game('1', 0, 0)])
+    subscription = stream.subscribe()
+    _take(subscription, 2)
+
+    assert next(subscription) == ': keepalive\n\n'
+    stream.publish([_game('1', 0, 0), _game('2', 0, 0)])
+    _, event, data = _events([next(subscription)])[0]
+    assert event == 'snapshot' and len(data['games']) == 2
+    subscription.close()
+    assert stream.stats()['subscribers'] == 0
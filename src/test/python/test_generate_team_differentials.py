@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+import fixtures
+import generate_team_differentials as gtd
+import nba_service
+from rate_limiter import RateLimiter
+from upstream_replay import installed
+
+
+class Upstream:
+    """Synthetic upstream recording (endpoint, parameters) of every call."""
+
+    def __init__(self, played_since=None, league_down=False):
+        self.calls = []
+        self.played_since = played_since  # team ids a date-bounded league-wide finder returns
+        self.league_down = league_down  # the league-wide (not per-team) finder fails
+
+    def __call__(self, http, endpoint, parameters, **kwargs):
+        self.calls.append((endpoint.lower(), dict(parameters)))
+        if self.league_down and endpoint.lower() == 'leaguegamefinder' and not parameters.get('TeamID'):
+            raise ConnectionError("Read timed out")
+        data = fixtures.synthetic_response(endpoint, parameters)
+        if endpoint.lower() == 'leaguegamefinder' and parameters.get('DateFrom') and not parameters.get('TeamID'):
+            rs = data['resultSets'][0]
+            rs['rowSet'] = [row for row in rs['rowSet'] if row[1] in self.played_since]
+        return http.nba_response(response=json.dumps(data), status_code=200, url=endpoint)
+
+    def team_logs(self):
+        return {int(params['TeamID']) for endpoint, params in self.calls if endpoint == 'teamgamelog'}
+
+
+@pytest.fixture
+def output_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(gtd, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(gtd, "OUTPUT_FILE", str(tmp_path / "team_differentials.json"))
+    return tmp_path / "team_differentials.json"
+
+
+def run(mode, upstream):
+    with installed(upstream):
+        path = gtd.generate_team_differentials(mode=mode, limiter=RateLimiter(10000, burst=100))
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_league_mode_matches_per_team_builder(output_file):
+    # full: one TeamGameLog (no PLUS_MINUS, so the team's LeagueGameFinder
+    # fallback) per team; league: one league-wide LeagueGameFinder call
+    full_upstream = Upstream()
+    full = run("full", full_upstream)
+    league_upstream = Upstream()
+    league = run("league", league_upstream)
+
+    assert len(full_upstream.team_logs()) == 30
+    assert [endpoint for endpoint, _ in league_upstream.calls] == ["leaguegamefinder"]
+    assert len(full["teams"]) == 30
+    assert all(len(team["games"]) == gtd.GAMES_PER_TEAM for team in full["teams"].values())
+    full.pop("lastUpdated")
+    league.pop("lastUpdated")
+    assert league == full
+
+
+def test_league_mode_falls_back_to_per_team_fetches(output_file, monkeypatch):
+    full = run("full", Upstream())
+    upstream = Upstream(league_down=True)
+    league = run("league", upstream)
+
+    assert len(upstream.team_logs()) == 30
+    full.pop("lastUpdated")
+    league.pop("lastUpdated")
+    assert league == full
+
+    # The refresh route (league by default) still writes the file
+    monkeypatch.setattr(nba_service, "upstream_limiter", RateLimiter(10000, burst=100))
+    output_file.unlink()
+    with installed(Upstream(league_down=True)):
+        response = nba_service.app.test_client().post('/team-differentials/refresh')
+    assert response.status_code == 200
+    with open(output_file) as f:
+        assert len(json.load(f)["teams"]) == 30
+
+
+def test_incremental_refetches_only_teams_that_played(output_file):
+    run("full", Upstream())
+    with open(output_file) as f:
+        existing = json.load(f)
+    # Mark two teams' data so a refetch is distinguishable from a carry-over
+    existing["teams"]["BOS"]["games"] = existing["teams"]["LAL"]["games"] = [{"marker": True}]
+    with open(output_file, "w") as f:
+        json.dump(existing, f)
+
+    played = {fixtures.TEAM_IDS["LAL"], fixtures.TEAM_IDS["GSW"]}
+    upstream = Upstream(played_since=played)
+    output = run("incremental", upstream)
+
+    assert upstream.team_logs() == played
+    assert output["teams"]["BOS"] == existing["teams"]["BOS"]
+    assert output["teams"]["LAL"]["games"] != [{"marker": True}]
+    assert len(output["teams"]["LAL"]["games"]) == gtd.GAMES_PER_TEAM
+    untouched = [abbr for abbr, team in existing["teams"].items() if team["teamId"] not in played]
+    assert all(output["teams"][abbr] == existing["teams"][abbr] for abbr in untouched)
+    assert list(output["teams"]) == list(existing["teams"])
+
+    # The date-bounded finder is asked from the existing file's timestamp
+    dates = [params.get("DateFrom") for endpoint, params in upstream.calls
+             if endpoint == "leaguegamefinder" and not params.get("TeamID")]
+    assert len(dates) == 1 and dates[0]
+
+
+def test_league_builder_matches_per_team_frames():
+    df = fixtures.frame(fixtures.league_game_finder())
+    by_team = gtd._build_games_by_team(df)
+
+    assert set(by_team) == set(fixtures.TEAM_IDS.values())
+    for team_id in fixtures.TEAM_IDS.values():
+        assert by_team[team_id] == gtd._build_games_from_frame(df[df["TEAM_ID"] == team_id])
+
+
+def test_league_mode_makes_one_upstream_call(tmp_path, monkeypatch):
+    calls = []
+    df = fixtures.frame(fixtures.league_game_finder())
+
+    class LeagueGameFinder:
+        def __init__(self, **params):
+            calls.append(params)
+
+        def get_data_frames(self):
+            return [df]
+
+    monkeypatch.setattr(gtd.leaguegamefinder, "LeagueGameFinder", LeagueGameFinder)
+    monkeypatch.setattr(gtd, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(gtd, "OUTPUT_FILE", str(tmp_path / "team_differentials.json"))
+
+    gtd.generate_team_differentials(mode="league", limiter=RateLimiter(1000))
+
+    assert len(calls) == 1
+    with open(tmp_path / "team_differentials.json") as f:
+        output = json.load(f)
+    assert len(output["teams"]) == 30
+    bos = output["teams"]["BOS"]
+    assert bos["teamId"] == fixtures.TEAM_IDS["BOS"]
+    assert bos["games"] == gtd._build_games_from_frame(df[df["TEAM_ID"] == bos["teamId"]])
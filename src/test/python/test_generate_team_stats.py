@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+import fixtures
+import generate_team_stats as gts
+from upstream_replay import installed
+
+
+class Upstream:
+    """Synthetic upstream that counts calls per team and fails the (endpoint, team) pairs in fail."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.teams = []
+        self._lock = threading.Lock()
+
+    def __call__(self, http, endpoint, parameters, **kwargs):
+        team_id = int(parameters.get('TeamID') or 0)
+        with self._lock:
+            self.teams.append(team_id)
+        if (endpoint.lower(), team_id) in self.fail:
+            raise ConnectionError("Read timed out")
+        text, status, url = fixtures.synthetic_send(http, endpoint, parameters)
+        return http.nba_response(response=text, status_code=status, url=url)
+
+    def abbrs(self):
+        ids = {team_id: abbr for abbr, team_id in gts.NBA_TEAMS.items()}
+        return {ids[team_id] for team_id in self.teams}
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.setattr(gts, 'OUTPUT_DIR', str(tmp_path / 'static'))
+    monkeypatch.setattr(gts, 'MIN_REQUEST_INTERVAL', 0.0001)
+    checkpoint_dir = str(tmp_path / 'checkpoints')
+
+    def run(*argv, upstream=None):
+        upstream = upstream or Upstream()
+        monkeypatch.setattr(sys, 'argv', ['generate_team_stats.py', '--checkpoint-dir', checkpoint_dir, *argv])
+        with installed(upstream):
+            code = gts.main()
+        with open(tmp_path / 'static' / 'team_stats.json') as f:
+            return code, json.load(f), upstream
+
+    run.checkpoint_dir = checkpoint_dir
+    return run
+
+
+def test_pool_builds_every_team_and_clears_checkpoints(run):
+    code, output, upstream = run('--workers', '4')
+
+    assert code == 0
+    assert list(output) == list(gts.NBA_TEAMS)  # league order, whatever order the pool finished in
+    assert len(upstream.teams) == 3 * 30
+    lal = output['LAL']
+    assert len(lal['lastGames']) == 5
+    assert len(lal['roster']) == 5
+    assert lal['roster'] == sorted(lal['roster'], key=lambda p: p['ppg'], reverse=True)
+    assert [leader['category'] for leader in lal['leaders']] == ['Points', 'Rebounds', 'Assists']
+    assert os.listdir(run.checkpoint_dir) == []
+
+
+def test_failed_stage_keeps_partial_data_and_rerun_retries_only_that_team(run):
+    bos = gts.NBA_TEAMS['BOS']
+    code, output, _ = run(upstream=Upstream(fail={('commonteamroster', bos)}))
+
+    assert code == 1
+    assert output['BOS']['roster'] == [] and output['BOS']['leaders'] == []
+    assert len(output['BOS']['lastGames']) == 5  # what did load is kept
+    assert len(os.listdir(run.checkpoint_dir)) == 29
+
+    code, output, upstream = run()
+    assert code == 0
+    assert upstream.abbrs() == {'BOS'}
+    assert len(output['BOS']['roster']) == 5
+    assert os.listdir(run.checkpoint_dir) == []
+
+
+def test_teams_refreshes_a_subset_and_keeps_the_rest(run):
+    run()
+    code, output, upstream = run('--teams', 'lal, bos', upstream=Upstream(fail={('leaguegamefinder', gts.NBA_TEAMS['BOS'])}))
+
+    assert code == 1
+    assert upstream.abbrs() == {'LAL', 'BOS'}
+    assert len(output) == 30
+    assert output['BOS']['lastGames'] == []
+
+    with pytest.raises(SystemExit):
+        run('--teams', 'XYZ')
+
+
+def test_fresh_and_old_checkpoints_are_not_resumed(run):
+    os.makedirs(run.checkpoint_dir)
+    stale = {'lastGames': [], 'leaders': [], 'roster': [{'name': 'Stale'}]}
+    gts.save_checkpoint(run.checkpoint_dir, 'LAL', stale)
+
+    code, output, upstream = run('--fresh')
+    assert 'LAL' in upstream.abbrs()
+    assert output['LAL'] != stale
+
+    gts.save_checkpoint(run.checkpoint_dir, 'LAL', stale)
+    assert gts.load_checkpoints(run.checkpoint_dir, ['LAL']) == {'LAL': stale}
+    later = time.time() + gts.CHECKPOINT_MAX_AGE + 1
+    assert gts.load_checkpoints(run.checkpoint_dir, ['LAL'], now=later) == {}
+
+    with open(os.path.join(run.checkpoint_dir, 'BOS.json'), 'w') as f:
+        json.dump({'season': gts.SEASON, 'data': stale}, f)  # written before checkpoints were dated
+    assert gts.load_checkpoints(run.checkpoint_dir, ['BOS']) == {}
@@ -0,0 +1,90 @@
+import csv
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts'))
+import load_player_directory as loader
+from rate_limiter import RateLimiter
+
+
+def player(player_id, team_id=1610612747, active=True):
+    return {
+        "nba_player_id": player_id, "first_name": "P", "last_name": str(player_id), "full_name": f"P {player_id}",
+        "team_id": team_id, "team_abbr": "LAL", "position": "", "bio": "",
+        "headshot_url": "", "active": active
+    }
+
+
+class FakeInfo:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def __call__(self, player_id):
+        with self._lock:
+            self.calls.append(player_id)
+        if player_id in self.fail:
+            raise ConnectionError("timed out")
+        return {"position": "G", "bio": f"bio {player_id}"}
+
+
+def fast_limiter():
+    return RateLimiter(10000.0, burst=100)
+
+
+def test_rerun_resumes_from_the_checkpoint(tmp_path):
+    path = str(tmp_path / 'players.csv.checkpoint.jsonl')
+    fetch = FakeInfo(fail={3})
+    players = [player(i) for i in range(1, 6)]
+    failed = loader.enrich(players, fast_limiter(), loader.Checkpoint(path, '2024-25').load(), workers=3, fetch=fetch)
+    assert [p["nba_player_id"] for p in failed] == [3]
+    assert fetch.calls.count(3) == loader.ENRICH_ATTEMPTS
+    assert players[0]["bio"] == "bio 1"
+
+    fetch = FakeInfo()
+    players = [player(i) for i in range(1, 6)]
+    failed = loader.enrich(players, fast_limiter(), loader.Checkpoint(path, '2024-25').load(), workers=3, fetch=fetch)
+    assert failed == []
+    assert fetch.calls == [3]
+    assert [p["position"] for p in players] == ["G"] * 5
+
+
+def test_checkpoint_entries_are_refetched_after_a_trade_or_for_another_season(tmp_path):
+    path = str(tmp_path / 'checkpoint.jsonl')
+    loader.enrich([player(1), player(2)], fast_limiter(), loader.Checkpoint(path, '2024-25').load(), fetch=FakeInfo())
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"player_id": 9, "roster')  # torn by a crash
+
+    fetch = FakeInfo()
+    loader.enrich([player(1), player(2, team_id=1610612744)], fast_limiter(),
+                  loader.Checkpoint(path, '2024-25').load(), fetch=fetch)
+    assert fetch.calls == [2]
+    assert sorted(loader.Checkpoint(path, '2024-25').load().entries) == [1, 2]
+
+    fetch = FakeInfo()
+    loader.enrich([player(1)], fast_limiter(), loader.Checkpoint(path, '2025-26').load(), fetch=fetch)
+    assert fetch.calls == [1]
+
+
+def test_incremental_enriches_only_new_players_and_team_changes(tmp_path):
+    output = str(tmp_path / 'players.csv')
+    existing = [player(1), player(2), player(3, active=False)]
+    for row in existing:
+        row.update(position="F", bio=f"old {row['nba_player_id']}")
+    loader.write_csv(output, existing)
+
+    current = [player(1), player(2, team_id=1610612744), player(3, active=False), player(4)]
+    to_enrich = loader.plan_incremental(current, loader.load_existing(output))
+    assert [p["nba_player_id"] for p in to_enrich] == [2, 4]
+    assert current[0]["bio"] == "old 1"
+    assert current[1]["bio"] == "old 2"  # kept unless the refetch succeeds
+
+    loader.enrich(to_enrich, fast_limiter(), loader.Checkpoint(str(tmp_path / 'cp.jsonl'), '2024-25'), fetch=FakeInfo())
+    loader.write_csv(output, current)
+    with open(output, newline='', encoding='utf-8') as f:
+        rows = {row["nba_player_id"]: row for row in csv.DictReader(f)}
+    assert rows["2"]["bio"] == "bio 2" and rows["2"]["team_id"] == "1610612744"
+    assert rows["3"]["bio"] == "old 3" and rows["3"]["active"] == "False"
+    assert rows["4"]["position"] == "G"
@@ -0,0 +1,85 @@
+import json
+import sys
+
+import pytest
+
+import local_store
+from local_store import BoxscoreStore, CareerStore
+
+PAYLOAD = {"game_id": "0022500001", "players": [{"player_id": 1, "pts": 30}], "teams": [], "count": 1}
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'boxscores.sqlite3'), str(tmp_path / 'careers.sqlite3')
+
+
+def run_cli(monkeypatch, capsys, paths, *argv):
+    monkeypatch.setattr(sys, 'argv', ['local_store.py', '--db', paths[0], '--career-db', paths[1], *argv])
+    code = local_store.main()
+    return code, capsys.readouterr().out
+
+
+def test_boxscore_store_round_trip_and_eviction(paths):
+    store = BoxscoreStore(paths[0])
+    store.put('0022500001', PAYLOAD)
+    store.put('0022500002', dict(PAYLOAD, game_id='0022500002'))
+
+    assert BoxscoreStore(paths[0]).get('0022500001') == PAYLOAD  # survives reopening
+    assert store.get('0022500009') is None
+    assert store.count() == 2
+    assert sorted(game_id for game_id, _, _ in store.entries()) == ['0022500001', '0022500002']
+    assert len(store.entries(limit=1)) == 1
+
+    assert store.delete('0022500001')
+    assert not store.delete('0022500001')
+    assert store.clear() == 1
+    assert store.count() == 0
+
+
+def test_career_store_keeps_seasons_per_player(paths):
+    store = CareerStore(paths[1])
+    store.put_seasons(201939, {'2022-23': {'pts': 1700}, '2023-24': {'pts': 1800}})
+    store.put_seasons(2544, {'2023-24': {'pts': 1600}})
+
+    assert store.get(201939, '2023-24') == {'pts': 1800}
+    assert store.get(201939, '2024-25') is None
+    assert store.count() == 3
+    assert store.delete(201939) == 2
+    assert store.count() == 1
+
+
+def test_cli_list_show_and_stats(monkeypatch, capsys, paths):
+    BoxscoreStore(paths[0]).put('0022500001', PAYLOAD)
+    CareerStore(paths[1]).put_seasons(2544, {'2023-24': {'pts': 1600}})
+
+    code, out = run_cli(monkeypatch, capsys, paths, 'list')
+    assert code == 0 and out.startswith('0022500001  ')
+
+    code, out = run_cli(monkeypatch, capsys, paths, 'show', '0022500001')
+    assert code == 0 and json.loads(out) == PAYLOAD
+    code, out = run_cli(monkeypatch, capsys, paths, 'show', '0022500009')
+    assert code == 1 and 'No stored box score' in out
+
+    code, out = run_cli(monkeypatch, capsys, paths, 'stats')
+    assert code == 0
+    assert out.splitlines()[0].startswith('1 box scores in ')
+    assert out.splitlines()[1].startswith('1 player seasons in ')
+
+
+def test_cli_evict(monkeypatch, capsys, paths):
+    store = BoxscoreStore(paths[0])
+    for game_id in ('0022500001', '0022500002', '0022500003'):
+        store.put(game_id, dict(PAYLOAD, game_id=game_id))
+    CareerStore(paths[1]).put_seasons(2544, {'2022-23': {'pts': 1500}, '2023-24': {'pts': 1600}})
+
+    code, out = run_cli(monkeypatch, capsys, paths, 'evict', '0022500001', '0022500009')
+    assert code == 0 and out.splitlines() == ['0022500001: evicted', '0022500009: not stored']
+    assert run_cli(monkeypatch, capsys, paths, 'evict')[0] == 1
+    code, out = run_cli(monkeypatch, capsys, paths, 'evict', '--all')
+    assert out.strip() == 'Evicted 2 box scores'
+    assert store.count() == 0
+
+    code, out = run_cli(monkeypatch, capsys, paths, 'evict-career', '2544')
+    assert out.strip() == '2544: evicted 2 seasons'
+    assert CareerStore(paths[1]).count() == 0
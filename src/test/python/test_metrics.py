@@ -0,0 +1,78 @@
+import metrics
+import nba_service
+from metrics import Registry, track_job
+from response_cache import ResponseCache
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, '/games')
+
+    lines = registry.render().splitlines()
+
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/games",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/games",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/games",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/games"} 4.05' in lines
+    assert 'latency_seconds_count{route="/games"} 4' in lines
+
+
+def test_metrics_endpoint_reports_routes_upstream_and_caches(monkeypatch):
+    class LeagueStandings:
+        def __init__(self, **params):
+            pass
+
+        def get_dict(self):
+            return {'resultSets': []}
+
+    class Broken(LeagueStandings):
+        def get_dict(self):
+            raise RuntimeError('upstream down')
+
+    monkeypatch.setattr(nba_service.upstream_limiter, 'acquire', lambda key=None, timeout=None: 0.25)
+    nba_service._call_upstream(LeagueStandings, season='2025-26')
+    try:
+        nba_service._call_upstream(Broken)
+    except RuntimeError:
+        pass
+    cache = ResponseCache('metrics_test_cache')
+    cache.get_or_load('key', lambda: 1)
+    cache.get_or_load('key', lambda: 1)
+
+    client = nba_service.app.test_client()
+    client.get('/health')
+    client.get('/no-such-route')
+    response = client.get('/metrics')
+    body = response.get_data(as_text=True)
+
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    assert 'nba_http_requests_total{route="/health",method="GET",status="200"}' in body
+    assert 'nba_http_requests_total{route="unmatched",method="GET",status="404"}' in body
+    assert 'nba_upstream_requests_total{endpoint="LeagueStandings",outcome="success"}' in body
+    assert 'nba_upstream_requests_total{endpoint="Broken",outcome="error"} 1' in body
+    assert 'nba_upstream_throttle_wait_seconds_bucket{endpoint="LeagueStandings",le="0.25"}' in body
+    assert 'nba_cache_hits_total{cache="metrics_test_cache"} 1' in body
+    assert 'nba_cache_misses_total{cache="metrics_test_cache"} 1' in body
+    assert 'nba_cache_evictions_total{cache="team_rankings"}' in body
+
+
+def test_track_job_records_outcome():
+    @track_job('test_job')
+    def job(result):
+        return result
+
+    job(True)
+    job(False)
+
+    assert metrics.job_runs.value('test_job', 'success') == 1
+    assert metrics.job_runs.value('test_job', 'failure') == 1
+    assert metrics.job_duration.count('test_job') == 2
+
+
+def test_request_timing_wraps_the_metrics_hook():
+    # after_request hooks run last-registered first: the request log must be written after metrics recorded
+    hooks = [hook.__name__ for hook in nba_service.app.after_request_funcs[None]]
+    assert hooks.index('_finish_request_timing') < hooks.index('_record_request')
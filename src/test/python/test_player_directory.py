@@ -0,0 +1,136 @@
+import csv
+import os
+
+import pytest
+
+import nba_service
+import player_directory
+from player_directory import PlayerDirectory, fold, load_index
+
+HEADER = ['nba_player_id', 'first_name', 'last_name', 'full_name', 'team_id', 'team_abbr', 'position', 'bio',
+          'headshot_url', 'active']
+ROWS = [
+    (1629029, 'Luka', 'Dončić', 'Luka Dončić', 1610612747, 'LAL', 'G', '', '', 'True'),
+    (203999, 'Nikola', 'Jokić', 'Nikola Jokić', 1610612743, 'DEN', 'C', '', '', 'True'),
+    (2544, 'LeBron', 'James', 'LeBron James', 1610612747, 'LAL', 'F', '', '', 'True'),
+    (76375, 'Dave', 'Jamerson', 'Dave Jamerson', 0, '', '', '', '', 'False'),
+    (406, 'Shaquille', "O'Neal", "Shaquille O'Neal", 0, '', '', '', '', 'False'),
+    (200782, 'P.J.', 'Tucker', 'P.J. Tucker', 0, '', '', '', '', 'False'),
+    (201142, 'Kevin', 'Durant', 'Kevin Durant', 1610612756, 'PHX', 'F', '', '', 'True'),
+]
+
+
+def write_directory(path, rows=ROWS):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\r\n')
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return load_index(write_directory(tmp_path / 'players.csv'))
+
+
+def names(results):
+    return [player['full_name'] for player, _, _ in results]
+
+
+def test_fold_strips_diacritics_and_apostrophes():
+    assert fold('Dončić') == 'doncic'
+    assert fold('Jokić') == 'jokic'
+    assert fold("O'Neal") == 'oneal'
+
+
+def test_prefix_search_on_first_and_last_name(index):
+    assert names(index.search('jam', fuzzy=False)) == ['LeBron James', 'Dave Jamerson']
+    assert names(index.search('leb jam')) == ['LeBron James']
+    assert names(index.search('kev')) == ['Kevin Durant']
+
+
+def test_exact_last_name_ranks_before_longer_prefixes(index):
+    assert names(index.search('james', fuzzy=False)) == ['LeBron James']
+    assert names(index.search('jamerson', fuzzy=False)) == ['Dave Jamerson']
+
+
+def test_search_ignores_diacritics_and_punctuation(index):
+    assert names(index.search('Doncic')) == ['Luka Dončić']
+    assert names(index.search('dončić')) == ['Luka Dončić']
+    assert names(index.search('oneal')) == ["Shaquille O'Neal"]
+    assert names(index.search('pj tuck')) == ['P.J. Tucker']
+
+
+def test_fuzzy_search_finds_misspellings(index):
+    results = index.search('nikola jokci')
+    assert names(results) == ['Nikola Jokić']
+    assert results[0][1] == 'fuzzy'
+    assert 0.3 <= results[0][2] < 1
+    assert index.search('jokci', fuzzy=False) == []
+
+
+def test_filters_by_active_flag_and_team(index):
+    assert names(index.search('', team='LAL')) == ['Luka Dončić', 'LeBron James']
+    assert names(index.search('', team='1610612743')) == ['Nikola Jokić']
+    assert names(index.search('ja', active=False)) == ['Dave Jamerson']
+    assert names(index.search('d', active=True, team='PHX')) == ['Kevin Durant']
+
+
+def test_directory_reloads_when_the_csv_changes(tmp_path):
+    path = write_directory(tmp_path / 'players.csv')
+    now = [1000.0]
+    directory = PlayerDirectory(path, clock=lambda: now[0])
+    assert len(directory.index()) == len(ROWS)
+
+    write_directory(path, ROWS[:2])
+    os.utime(path, (2000, 2000))
+    assert len(directory.index()) == len(ROWS)  # not rechecked yet
+    now[0] += 60
+    assert len(directory.index()) == 2
+    assert directory.stats()['loads'] == 2
+
+
+def test_failed_reload_keeps_the_previous_index(tmp_path, monkeypatch):
+    errors = []
+    monkeypatch.setattr(player_directory, 'log_error', lambda message, exc=None: errors.append((message, exc)))
+    path = write_directory(tmp_path / 'players.csv')
+    now = [1000.0]
+    directory = PlayerDirectory(path, clock=lambda: now[0])
+    directory.index()
+
+    os.remove(path)
+    now[0] += 60
+    assert len(directory.index()) == len(ROWS)
+    assert directory.last_error
+    assert [message for message, _ in errors] == ["Player directory reload failed, keeping the previous index"]
+    assert isinstance(errors[0][1], OSError)
+
+
+def test_search_route(tmp_path, monkeypatch):
+    monkeypatch.setattr(nba_service, 'player_directory', PlayerDirectory(write_directory(tmp_path / 'players.csv')))
+    client = nba_service.app.test_client()
+
+    body = client.get('/players/search?q=doncic').get_json()
+    assert body['count'] == 1
+    assert body['players'][0]['id'] == 1629029
+    assert body['players'][0]['match'] == 'prefix'
+
+    body = client.get('/players/search?team=LAL&active=true&limit=1').get_json()
+    assert [p['full_name'] for p in body['players']] == ['Luka Dončić']
+
+    assert client.get('/players/search').status_code == 400
+
+
+def test_directory_reads_the_columnar_snapshot(tmp_path):
+    path = write_directory(tmp_path / 'players.csv')
+    snapshot_dir = tmp_path / 'snapshots'
+    directory = PlayerDirectory(path, snapshot_dir=str(snapshot_dir))
+
+    assert directory.index().players == load_index(path).players
+    assert len(os.listdir(snapshot_dir)) == 1
+    assert [p['full_name'] for p, _, _ in directory.search('doncic')] == ['Luka Dončić']
+
+    write_directory(path, ROWS[:2])
+    directory.load()
+    assert len(directory.index()) == 2
+    assert len(os.listdir(snapshot_dir)) == 1  # the snapshot of the old contents is replaced
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from rate_limiter import RateLimiter
+
+RATE = 200.0
+BURST = 5
+THREADS = 50
+CALLS_PER_THREAD = 4
+
+
+def _max_calls_in_window(timestamps, window):
+    timestamps = sorted(timestamps)
+    best = 0
+    start = 0
+    for end, ts in enumerate(timestamps):
+        while ts - timestamps[start] >= window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+def test_fifty_threads_never_exceed_rate():
+    limiter = RateLimiter(RATE, burst=BURST)
+    fired = []
+    waits = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(THREADS)
+
+    def worker():
+        barrier.wait()
+        for _ in range(CALLS_PER_THREAD):
+            waited = limiter.acquire("ScoreBoard")
+            with lock:
+                fired.append(time.monotonic())
+                waits.append(waited)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = THREADS * CALLS_PER_THREAD
+    assert len(fired) == total
+    for window in (0.05, 0.25, 0.5):
+        # One extra call of slack for scheduler jitter when a sleeper wakes late.
+        assert _max_calls_in_window(fired, window) <= BURST + RATE * window + 1
+
+    elapsed = max(fired) - min(fired)
+    assert elapsed >= (total - BURST) / RATE * 0.95
+
+    stats = limiter.stats()
+    assert stats["calls"] == total
+    assert stats["waiting"] == 0
+    assert stats["throttled"] == total - BURST
+    assert abs(stats["total_wait_seconds"] - sum(waits)) < 0.01
+
+
+def test_slots_are_handed_out_in_request_order():
+    now = [0.0]
+    limiter = RateLimiter(10.0, burst=2, clock=lambda: now[0], sleep=lambda seconds: None)
+    waits = [limiter.acquire() for _ in range(5)]
+    assert waits == pytest.approx([0.0, 0.0, 0.1, 0.2, 0.3])
+
+
+def test_timeout_rejects_without_consuming_a_slot():
+    now = [0.0]
+    limiter = RateLimiter(1.0, clock=lambda: now[0], sleep=lambda seconds: None)
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.acquire(timeout=0.5) is None
+    now[0] = 1.0
+    assert limiter.try_acquire()
+    assert limiter.stats()["rejected"] == 2
+
+
+def test_endpoint_budget_is_enforced_on_top_of_shared_budget():
+    now = [0.0]
+    limiter = RateLimiter(100.0, burst=10, endpoint_budgets={"PlayerCareerStats": (1.0, 1)},
+                          clock=lambda: now[0], sleep=lambda seconds: None)
+    assert limiter.acquire("PlayerCareerStats") == 0.0
+    assert limiter.acquire("PlayerCareerStats") == pytest.approx(1.0)
+    assert limiter.acquire("ScoreBoard") == 0.0
+    assert limiter.stats()["by_endpoint"]["PlayerCareerStats"]["calls"] == 2
@@ -0,0 +1,89 @@
+import json
+import logging
+
+import nba_service
+import request_timing
+from request_timing import RequestTiming, span
+
+
+class _Lines(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage()))
+
+
+def _capture_logs(monkeypatch):
+    handler = _Lines()
+    request_timing.logger.addHandler(handler)
+    monkeypatch.setattr(request_timing.logger, 'handlers', [handler])
+    return handler.records
+
+
+def test_nested_spans_record_exclusive_time(monkeypatch):
+    ticks = iter([0.0, 1.0, 1.5, 3.5, 4.0])  # timing start, compute in, upstream in/out, compute out
+    monkeypatch.setattr(request_timing.time, 'perf_counter', lambda: next(ticks))
+    timing = RequestTiming()
+    token = request_timing._current.set(timing)
+    try:
+        with span('compute'):
+            with span('upstream'):
+                pass
+    finally:
+        request_timing._current.reset(token)
+
+    assert timing.phases == {'compute': 1.0, 'upstream': 2.0}
+
+
+def test_span_outside_request_records_nothing():
+    @span('compute')
+    def work():
+        return 42
+
+    assert work() == 42
+    assert request_timing.current_timing() is None
+
+
+def _leaders_data():
+    headers = ['PLAYER_NAME', 'GP', 'PTS', 'REB', 'AST', 'STL', 'BLK']
+    rows = [['Jayson Tatum', 10, 280, 85, 50, 10, 6], ['Jaylen Brown', 10, 240, 60, 35, 12, 4]]
+    return {'resultSets': [{'name': 'PlayersSeasonTotals', 'headers': headers, 'rowSet': rows}]}
+
+
+def test_request_gets_server_timing_and_one_log_line(monkeypatch):
+    records = _capture_logs(monkeypatch)
+    monkeypatch.setattr(nba_service, '_call_upstream', lambda cls, **params: _leaders_data())
+    nba_service.upstream_cache.invalidate()
+
+    response = nba_service.app.test_client().get('/teams/1610612738/leaders')
+
+    assert response.status_code == 200
+    phases = [part.split(';')[0] for part in response.headers['Server-Timing'].split(', ')]
+    assert phases == ['upstream', 'parse', 'compute', 'serialize', 'total']
+    assert len(records) == 1
+    record = records[0]
+    assert record['route'] == '/teams/<int:team_id>/leaders' and record['status'] == 200
+    assert set(record['phases_ms']) == {'upstream', 'parse', 'compute', 'serialize'}
+    assert record['duration_ms'] >= sum(record['phases_ms'].values()) - 0.1
+
+
+def test_handled_error_goes_into_the_request_log_line(monkeypatch):
+    records = _capture_logs(monkeypatch)
+
+    def broken(cls, **params):
+        raise RuntimeError('stats.nba.com timed out')
+
+    monkeypatch.setattr(nba_service, '_call_upstream', broken)
+    nba_service.upstream_cache.invalidate()
+
+    response = nba_service.app.test_client().get('/teams/1610612738/leaders')
+
+    assert response.status_code == 500
+    assert len(records) == 1
+    error = records[0]['errors'][0]
+    assert records[0]['level'] == 'error'
+    assert error['message'] == 'Error fetching team leaders'
+    assert error['error'] == 'RuntimeError: stats.nba.com timed out'
+    assert 'Traceback' in error['traceback']
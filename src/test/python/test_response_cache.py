@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+import fixtures
+from response_cache import ResponseCache, _estimate_size, make_cache_key
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_entries_expire_after_their_ttl():
+    clock = Clock()
+    cache = ResponseCache('test', default_ttl=60, clock=clock)
+    cache.set('standings', {'BOS': 1})
+    cache.set('scores', {'BOS': 101}, ttl=5)
+
+    clock.now += 5
+    assert cache.get('scores') is None
+    assert cache.get('standings') == {'BOS': 1}
+    clock.now += 55
+    assert cache.get('standings') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes():
+    cache = ResponseCache('test', max_bytes=300, sizeof=lambda value: 100)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, key)
+    cache.get('a')  # now more recent than b
+    cache.set('d', 'd')
+
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in ('a', 'c', 'd')] == ['a', 'c', 'd']
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 300
+
+
+def test_stale_hit_returns_at_once_and_refreshes_once_in_the_background():
+    clock = Clock()
+    cache = ResponseCache('test', default_ttl=60, stale_ttl=300, clock=clock)
+    cache.set('rankings', 'old')
+    clock.now += 61
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return 'new'
+
+    # Every caller in the stale window gets the old value while the refresh is in flight
+    assert [cache.get_or_load('rankings', loader) for _ in range(5)] == ['old'] * 5
+    release.set()
+    wait_for(lambda: cache.get('rankings') == 'new')
+    assert len(calls) == 1
+    assert cache.stats()['stale_hits'] == 5
+
+
+def test_failed_refresh_is_counted_and_retried_on_the_next_stale_hit():
+    clock = Clock()
+    cache = ResponseCache('test', default_ttl=60, stale_ttl=300, clock=clock)
+    cache.set('rankings', 'old')
+    clock.now += 61
+
+    def fail():
+        raise ConnectionError("timed out")
+
+    assert cache.get_or_load('rankings', fail) == 'old'
+    wait_for(lambda: cache.stats()['refresh_errors'] == 1)
+    wait_for(lambda: not cache._entries['rankings'].refreshing)
+
+    assert cache.get_or_load('rankings', lambda: 'new') == 'old'
+    wait_for(lambda: cache.get('rankings') == 'new')
+    assert cache.stats()['refresh_errors'] == 1
+
+
+def test_entry_past_its_stale_window_is_loaded_inline():
+    clock = Clock()
+    cache = ResponseCache('test', default_ttl=60, stale_ttl=300, clock=clock)
+    cache.set('rankings', 'old')
+    clock.now += 361
+
+    assert cache.get_or_load('rankings', lambda: 'new') == 'new'
+    assert cache.stats()['stale_hits'] == 0
+
+
+def test_size_estimate_tracks_the_encoded_size():
+    for value in (fixtures.league_player_gamelog(players_per_team=2, games=40), fixtures.boxscore('0022500001'),
+                  fixtures.live_scoreboard(), {'teams': [1, 2, 3]}, 'LAL'):
+        encoded = len(json.dumps(value, default=str))
+        assert abs(_estimate_size(value) - encoded) <= encoded * 0.1
+
+
+def test_cache_key_ignores_parameter_order_and_none():
+    assert make_cache_key('TeamGameLog', {'team_id': 1610612747, 'season': '2025-26', 'date_from': None}) == \
+        make_cache_key('TeamGameLog', {'season': '2025-26', 'team_id': '1610612747'})
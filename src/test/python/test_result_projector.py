@@ -0,0 +1,74 @@
+import fixtures
+import nba_service
+from result_projector import Field, compile_projector, find_result_set, project_result_set
+
+SCHEMA = (
+    Field('player_id', 'PLAYER_ID'),
+    Field('min', 'MIN', nba_service._parse_minutes),
+    Field('pts', 'PTS'),
+    Field('plus_minus', 'PLUS_MINUS', default=0),
+)
+HEADERS = ['PLAYER_ID', 'PLAYER_NAME', 'MIN', 'PTS']
+ROWS = [[2544, 'LeBron James', '35:30', 28], [1629029, 'Luka Dončić', None, 0], [203999, 'Nikola Jokić', 33.5, 31]]
+
+
+def test_records_and_columns_coerce_and_default_missing_headers():
+    projector = compile_projector(SCHEMA, HEADERS)
+
+    assert projector.missing == ('PLUS_MINUS',)
+    assert projector.records(ROWS) == [
+        {'player_id': 2544, 'min': 35.5, 'pts': 28, 'plus_minus': 0},
+        {'player_id': 1629029, 'min': None, 'pts': 0, 'plus_minus': 0},
+        {'player_id': 203999, 'min': 33.5, 'pts': 31, 'plus_minus': 0},
+    ]
+    assert projector.records(ROWS, limit=1) == projector.records(ROWS)[:1]
+    assert projector.columns(ROWS) == {
+        'player_id': [2544, 1629029, 203999], 'min': [35.5, None, 33.5], 'pts': [28, 0, 31], 'plus_minus': [0, 0, 0]
+    }
+
+
+def test_parse_minutes():
+    assert nba_service._parse_minutes('12:45') == 12.75
+    assert nba_service._parse_minutes('PT12M') is None
+    assert nba_service._parse_minutes('24') == 24.0
+    assert nba_service._parse_minutes('1:xx') is None
+
+
+def test_projector_is_reused_per_schema_and_header_signature():
+    projector = compile_projector(SCHEMA, HEADERS)
+
+    assert compile_projector(SCHEMA, tuple(HEADERS)) is projector
+    assert compile_projector(SCHEMA, HEADERS + ['PLUS_MINUS']) is not projector
+    assert compile_projector(SCHEMA[:2], HEADERS) is not projector
+    # Same columns in another order are projected by position, not by the cached layout
+    reordered = compile_projector(SCHEMA, ['PTS', 'MIN', 'PLAYER_ID'])
+    assert reordered.records([[28, '35:30', 2544]]) == [{'player_id': 2544, 'min': 35.5, 'pts': 28, 'plus_minus': 0}]
+
+
+def test_result_sets_are_found_by_name_or_substring():
+    data = {'resultSets': [
+        {'name': 'OverallTeamPlayerDashboard', 'headers': HEADERS, 'rowSet': ROWS[:1]},
+        {'name': 'PlayersSeasonTotals', 'headers': HEADERS, 'rowSet': ROWS},
+    ]}
+
+    assert find_result_set(data)['name'] == 'OverallTeamPlayerDashboard'
+    assert find_result_set(data, name='PlayersSeasonTotals')['rowSet'] == ROWS
+    assert find_result_set(data, contains='Players')['name'] == 'PlayersSeasonTotals'
+    assert find_result_set(data, name='Players') is None
+    assert find_result_set({}, name='PlayersSeasonTotals') is None
+
+    assert len(project_result_set(data, SCHEMA, name='PlayersSeasonTotals')) == 3
+    assert project_result_set(data, SCHEMA, name='TeamStats') == []
+
+
+def test_box_score_projection_matches_the_row_by_row_parse():
+    data = fixtures.boxscore('0022500001')
+    rs = find_result_set(data, name='PlayerStats')
+    players = project_result_set(data, nba_service.BOXSCORE_PLAYER_SCHEMA, name='PlayerStats')
+
+    assert len(players) == len(rs['rowSet'])
+    for row, player in zip(rs['rowSet'], players):
+        by_column = dict(zip(rs['headers'], row))
+        assert player['player_id'] == by_column['PLAYER_ID']
+        assert player['min'] == nba_service._parse_minutes(by_column['MIN'])
+        assert player['tov'] == by_column['TO']
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+import nba_service
+from scoreboard_poller import IDLE_INTERVAL, LIVE_INTERVAL, ScoreboardPoller, next_interval
+
+NOW = datetime(2026, 1, 15, 20, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _game(game_id, status, text, home_score=0, away_score=0, start='2026-01-16T00:30:00Z'):
+    def team(team_id, name, code, score):
+        return {'teamId': team_id, 'teamName': name, 'teamCity': 'City', 'teamTricode': code, 'score': score}
+    return {
+        'gameId': game_id, 'gameStatus': status, 'gameStatusText': text, 'period': 0 if status == 1 else 4,
+        'gameTimeUTC': start, 'homeTeam': team(1610612738, 'Celtics', 'BOS', home_score),
+        'awayTeam': team(1610612747, 'Lakers', 'LAL', away_score)
+    }
+
+
+def _scoreboard(*games):
+    return {'scoreboard': {'gameDate': '2026-01-15', 'games': list(games)}}
+
+
+def test_interval_follows_game_state():
+    assert next_interval(_scoreboard(_game('1', 2, 'Q3 5:00')), NOW) == LIVE_INTERVAL
+    assert next_interval(_scoreboard(_game('1', 3, 'Final')), NOW) == IDLE_INTERVAL
+    assert next_interval(_scoreboard(), NOW) == IDLE_INTERVAL
+    # Tip-off in 4.5 hours: sleep the idle interval; in 2 minutes: wake at tip-off
+    assert next_interval(_scoreboard(_game('1', 1, '7:30 pm ET')), NOW) == IDLE_INTERVAL
+    assert next_interval(_scoreboard(_game('1', 1, '3:02 pm ET', start='2026-01-15T20:02:00Z')), NOW) == 120
+
+
+def test_failed_poll_keeps_snapshot_and_backs_off():
+    responses = [_scoreboard(_game('1', 2, 'Q1')), RuntimeError('down'), RuntimeError('down')]
+
+    def fetch():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    poller = ScoreboardPoller(fetch, clock=lambda: NOW)
+    poller.refresh()
+    first = poller._snapshot
+    assert [poller.refresh(), poller.refresh()] == [LIVE_INTERVAL, 2 * LIVE_INTERVAL]
+    assert poller._snapshot is first
+    assert poller.errors == 2
+
+
+def test_routes_serve_snapshot_without_upstream_calls(monkeypatch):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return _scoreboard(_game('0022500001', 3, 'Final', 110, 99), _game('0022500002', 2, 'Q2 1:00', 40, 38))
+
+    poller = ScoreboardPoller(fetch, nba_service._scoreboard_views)
+    poller.refresh()
+    poller._thread = object()  # already running; no background thread in tests
+    monkeypatch.setattr(nba_service, 'scoreboard_poller', poller)
+    client = nba_service.app.test_client()
+
+    for _ in range(20):
+        games = client.get('/games').get_json()
+        finals = client.get('/games/finals').get_json()
+
+    assert len(calls) == 1
+    assert [g['home_team_score'] for g in games['data']] == [110, 40]
+    assert finals['count'] == 1 and finals['games'][0]['game_id'] == '0022500001'
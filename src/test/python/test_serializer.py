@@ -0,0 +1,55 @@
+import gzip
+import json
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import fixtures
+import nba_service
+import serializer
+from team_rankings import build_team_rankings
+
+
+def _rankings():
+    return build_team_rankings(fixtures.frame(fixtures.league_dash_team_stats('Base')),
+                               fixtures.frame(fixtures.league_dash_team_stats('Opponent')))
+
+
+@pytest.mark.skipif(serializer.orjson is None, reason='orjson not installed')
+def test_orjson_and_stdlib_encode_the_same_document():
+    value = {'teams': _rankings(), 'when': datetime(2026, 1, 15), 'n': np.int64(3), 'x': np.float64(1.5),
+             'nan': float('nan'), 'inf': np.float64('inf'), 'pcts': [0.5, float('nan')], 'y': np.float32('nan')}
+    fast = serializer.OrjsonSerializer().dumps(value)
+    slow = serializer.StdlibSerializer().dumps(value)
+    assert json.loads(fast) == json.loads(slow)
+    assert list(json.loads(fast)) == sorted(value)
+    assert b'NaN' not in slow and b'Infinity' not in slow
+    assert json.loads(slow)['pcts'] == [0.5, None]
+    assert json.loads(slow)['y'] is None
+
+
+def test_cached_payload_compressed_once_with_its_own_etag(monkeypatch):
+    monkeypatch.setattr(nba_service.team_rankings_cache, 'get_or_load', lambda key, loader: cached)
+    cached = {'season': '2025-26', 'teams': _rankings()}
+    client = nba_service.app.test_client()
+
+    plain = client.get('/team-rankings')
+    zipped = client.get('/team-rankings', headers={'Accept-Encoding': 'gzip, deflate'})
+    deflated = client.get('/team-rankings', headers={'Accept-Encoding': 'deflate'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zlib.decompress(deflated.data) == plain.data
+    assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+
+    again = client.get('/team-rankings', headers={'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_small_bodies_are_not_compressed():
+    response = nba_service.app.test_client().get('/health', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,100 @@
+import multiprocessing
+import threading
+import time
+
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from shared_state import SharedState, open_shared_state
+
+
+def _acquire_many(path, calls, times):
+    limiter = RateLimiter(20.0, backend=SharedState(path))
+    for _ in range(calls):
+        limiter.acquire()
+        times.append(time.time())
+
+
+def test_rate_limit_is_enforced_across_processes(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    state = SharedState(path)
+    context = multiprocessing.get_context('fork')
+    started = time.time()
+    with context.Manager() as manager:
+        times = manager.list()
+        workers = [context.Process(target=_acquire_many, args=(path, 5, times)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        times = sorted(times)
+
+    assert len(times) == 15
+    # 20 calls/s host-wide: the bucket handed out 15 slots 50 ms apart (3
+    # separate limiters would have reserved only 5 each), and every caller
+    # waited for its slot. Scheduling jitter only ever pushes slots later.
+    (tat,), = state._conn().execute("SELECT tat FROM buckets").fetchall()
+    assert tat - started >= 15 * 0.05
+    assert times[-1] >= tat - 0.05 - 0.01
+
+
+def test_value_loaded_by_one_process_serves_the_others(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    first = ResponseCache('rankings', backend=SharedState(path))
+    second = ResponseCache('rankings', backend=SharedState(path))
+
+    assert first.get_or_load('2025-26', lambda: {'teams': {1610612738: 'BOS'}}) == {'teams': {1610612738: 'BOS'}}
+
+    def fail():
+        raise AssertionError("second process must not reach the upstream")
+
+    assert second.get_or_load('2025-26', fail) == {'teams': {1610612738: 'BOS'}}
+    assert second.get('2025-26') == {'teams': {1610612738: 'BOS'}}
+    assert second.stats()['shared_hits'] == 1
+    assert second.stats()['misses'] == 0
+
+
+def test_concurrent_miss_waits_for_the_lease_holder(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    leader = ResponseCache('usage', backend=SharedState(path))
+    follower = ResponseCache('usage', backend=SharedState(path))
+    loading = threading.Event()
+    release = threading.Event()
+    follower_loads = []
+
+    def slow_load():
+        loading.set()
+        release.wait(5)
+        return {'season': '2025-26'}
+
+    leader_thread = threading.Thread(target=leader.get_or_load, args=('2025-26', slow_load))
+    leader_thread.start()
+    loading.wait(5)
+    result = []
+    follower_thread = threading.Thread(
+        target=lambda: result.append(follower.get_or_load('2025-26', lambda: follower_loads.append(1) or {})))
+    follower_thread.start()
+    time.sleep(0.2)
+    release.set()
+    leader_thread.join(5)
+    follower_thread.join(5)
+
+    assert result == [{'season': '2025-26'}]
+    assert follower_loads == []
+
+
+def test_invalidate_clears_the_shared_copy(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    first = ResponseCache('totals', backend=SharedState(path))
+    second = ResponseCache('totals', backend=SharedState(path))
+    first.set('1610612738_2025-26', {'fga': 7000})
+
+    first.invalidate('1610612738_2025-26')
+
+    assert second.get('1610612738_2025-26') is None
+
+
+def test_open_shared_state_is_off_unless_configured(tmp_path):
+    assert open_shared_state({}) is None
+    assert open_shared_state({'NBA_SHARED_STATE': 'off'}) is None
+    state = open_shared_state({'NBA_SHARED_STATE': str(tmp_path / 'state.sqlite3')})
+    assert state.stats()['entries'] == 0
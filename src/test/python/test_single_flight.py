@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+CALLERS = 8
+
+
+def run_concurrently(flight, key, fn):
+    """Start CALLERS threads on flight.do(key, fn) and wait until all but the leader are waiting on it."""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while flight.stats()['coalesced'] < CALLERS - 1:
+        assert time.time() < deadline, "callers were not coalesced"
+        time.sleep(0.005)
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight('test')
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {'game_id': '0022500001'}
+
+    threads, results, errors = run_concurrently(flight, 'boxscore', fetch)
+    assert flight.stats()['in_flight'] == 1
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert errors == []
+    assert len(results) == CALLERS
+    assert all(result is results[0] for result in results)
+    stats = flight.stats()
+    assert (stats['executions'], stats['coalesced'], stats['in_flight']) == (1, CALLERS - 1, 0)
+    assert stats['max_waiters'] == CALLERS - 1
+
+
+def test_exception_reaches_every_waiter_and_the_key_is_released():
+    flight = SingleFlight('test')
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ConnectionError("timed out")
+
+    threads, results, errors = run_concurrently(flight, 'boxscore', fail)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == []
+    assert len(errors) == CALLERS
+    assert all(isinstance(e, ConnectionError) for e in errors)
+
+    # The failure is not cached: the next caller runs its own fetch
+    assert flight.do('boxscore', lambda: 'ok') == 'ok'
+    assert flight.stats()['executions'] == 2
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight('test')
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('a', lambda: 2) == 2  # sequential calls each run
+    with pytest.raises(ValueError):
+        flight.do('b', lambda: int('x'))
+    assert flight.stats()['executions'] == 3
+    assert flight.stats()['coalesced'] == 0
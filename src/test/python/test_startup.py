@@ -0,0 +1,136 @@
+import json
+import os
+import subprocess
+import sys
+
+import nba_service
+from lazy_import import lazy_module
+from warmup import DONE, FAILED, PENDING, Warmup
+
+
+def test_service_import_defers_heavy_modules():
+    code = ("import sys, nba_service; "
+            "print(sorted(m for m in ('pandas', 'numpy', 'nba_api.stats.endpoints') if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], cwd=nba_service.os.path.dirname(nba_service.__file__),
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
+
+
+def test_lazy_module_imports_on_first_use():
+    module = lazy_module('json')
+    assert module.dumps([1]) == '[1]'
+    assert module.loaded
+    module.example_attr = 1  # forwarded to the real module (monkeypatch relies on this)
+    import json
+    assert json.example_attr == 1
+    del module.example_attr
+    assert not hasattr(json, 'example_attr')
+
+
+def test_warmup_records_each_job():
+    warmup = Warmup(retry_delays=())
+    ran = []
+    warmup.add('first', lambda: ran.append('first'))
+    warmup.add('broken', lambda: 1 / 0)
+    warmup.add('last', lambda: ran.append('last'))
+    assert not warmup.finished()
+    assert warmup.status()['jobs']['first']['state'] == PENDING
+
+    warmup.run()
+
+    jobs = warmup.status()['jobs']
+    assert ran == ['first', 'last']
+    assert [jobs[name]['state'] for name in ('first', 'broken', 'last')] == [DONE, FAILED, DONE]
+    assert 'division by zero' in jobs['broken']['error']
+    assert warmup.finished()
+    assert warmup.status()['failed'] == ['broken']
+    assert not warmup.status()['ready']
+
+
+def test_warmup_retries_failed_jobs():
+    attempts = []
+    slept = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("upstream timed out")
+
+    warmup = Warmup(sleep=slept.append, retry_delays=(5, 30, 120))
+    warmup.add('ok', lambda: None)
+    warmup.add('flaky', flaky)
+    warmup.run()
+
+    job = warmup.status()['jobs']['flaky']
+    assert slept == [5, 30]
+    assert (job['state'], job['attempts'], job['error']) == (DONE, 3, None)
+    assert warmup.status()['jobs']['ok']['attempts'] == 1
+    assert warmup.status()['ready']
+
+
+def test_health_is_live_while_ready_waits_for_warmup(monkeypatch):
+    warmup = Warmup()
+    warmup.add('slow', lambda: None)
+    monkeypatch.setattr(nba_service, 'warmup', warmup)
+    client = nba_service.app.test_client()
+
+    assert client.get('/health').get_json() == {"status": "up"}
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'warming'
+
+    warmup.run()
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.get_json()['jobs']['slow']['state'] == DONE
+
+
+def test_ready_reports_failed_warmup_as_not_ready(monkeypatch):
+    warmup = Warmup(retry_delays=())
+    warmup.add('ok', lambda: None)
+    warmup.add('standings', lambda: 1 / 0)
+    monkeypatch.setattr(nba_service, 'warmup', warmup)
+    warmup.run()
+
+    response = nba_service.app.test_client().get('/ready')
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'failed'
+    assert response.get_json()['failed'] == ['standings']
+
+
+# What a gunicorn worker does: import nba_service (never run as __main__) and serve app
+GUNICORN_WORKER = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+import nba_service
+import fixtures
+from rate_limiter import RateLimiter
+from upstream_replay import Recorder, install
+
+install(Recorder(sys.argv[2], send=fixtures.synthetic_send))
+nba_service.STATIC_DATA_DIR = sys.argv[2]
+nba_service.upstream_limiter = RateLimiter(10000, burst=10000)
+client = nba_service.app.test_client()
+codes = []
+deadline = time.time() + 60
+while time.time() < deadline:
+    response = client.get('/ready')
+    codes.append(response.status_code)
+    if response.status_code == 200:
+        break
+    time.sleep(0.1)
+print(json.dumps({"first": codes[0], "last": codes[-1], "body": response.get_json()}))
+"""
+
+
+def test_ready_is_reached_when_imported_by_a_wsgi_server(tmp_path):
+    env = dict(os.environ, NBA_WARMUP='on', NBA_CACHE_DIR=str(tmp_path))
+    env.pop('NBA_SHARED_STATE', None)
+    env.pop('NBA_UPSTREAM_MODE', None)
+    out = subprocess.run([sys.executable, '-c', GUNICORN_WORKER, os.path.dirname(os.path.abspath(__file__)),
+                          str(tmp_path)], cwd=os.path.dirname(nba_service.__file__), env=env,
+                         capture_output=True, text=True, check=True, timeout=120).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    assert result["first"] == 503
+    assert result["last"] == 200, result["body"]
+    assert {job["state"] for job in result["body"]["jobs"].values()} == {DONE}
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import fixtures
+from bench_team_rankings import legacy_team_rankings
+from team_rankings import build_team_rankings, rank_min
+
+
+def _frames(teams=None):
+    return (fixtures.frame(fixtures.league_dash_team_stats('Base', teams=teams)),
+            fixtures.frame(fixtures.league_dash_team_stats('Opponent', teams=teams)))
+
+
+@pytest.mark.parametrize('teams', [None, 300])
+def test_matches_legacy_builder(teams):
+    df_base, df_opp = _frames(teams)
+    assert build_team_rankings(df_base, df_opp) == legacy_team_rankings(df_base, df_opp)
+
+
+def test_rounding_ties_match_legacy_builder():
+    # round() and np.round disagree on these (25.15 -> 25.1 vs 25.2)
+    df_base, df_opp = _frames()
+    df_base.loc[0:3, 'PTS'] = [25.15, 112.25, 2.675, 110.35]
+    df_base.loc[0:3, 'FG_PCT'] = [0.46151, 0.4615, 0.47249, 0.2515]
+    df_opp.loc[0:1, 'PTS'] = [108.45, 0.15]
+    assert build_team_rankings(df_base, df_opp) == legacy_team_rankings(df_base, df_opp)
+
+
+def test_ties_share_the_best_rank():
+    values = np.array([110.0, 115.0, 110.0, np.nan, 120.0])
+    assert rank_min(values, ascending=False).tolist() == [3, 2, 3, 0, 1]
+    assert rank_min(values, ascending=True).tolist() == [1, 3, 1, 0, 4]
+
+
+def test_team_missing_from_opponent_frame():
+    df_base, df_opp = _frames()
+    df_opp = df_opp[df_opp['TEAM_ABBREVIATION'] != 'BOS']
+    bos = build_team_rankings(df_base, df_opp)['BOS']
+    assert bos['defense']['oppg'] == 0.0
+    assert bos['defense']['oppgRank'] == '-'
+    assert bos['offense']['ppgRank'] != '-'
+
+
+def test_missing_stat_column_raises():
+    df_base, df_opp = _frames()
+    with pytest.raises(ValueError, match='base stat columns'):
+        build_team_rankings(df_base.drop(columns=['TOV']), df_opp)
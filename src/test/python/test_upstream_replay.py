@@ -0,0 +1,82 @@
+import os
+
+import pytest
+from nba_api.stats.endpoints import leaguestandings, teamgamelog
+
+import fixtures
+import upstream_replay
+from upstream_replay import FixtureMissing, Recorder, Replayer, fixture_path, installed
+
+
+def _standings():
+    return leaguestandings.LeagueStandings(season='2025-26', season_type='Regular Season')
+
+
+def test_recorded_responses_replay_without_the_recorder(tmp_path):
+    with installed(Recorder(str(tmp_path), send=fixtures.synthetic_send)) as recorder:
+        recorded = _standings().get_dict()
+    assert recorder.recorded == 1
+
+    replayer = Replayer(str(tmp_path))
+    with installed(replayer):
+        replayed = _standings().get_dict()
+
+    assert replayed == recorded
+    assert replayer.stats() == {"fixtures_loaded": 1, "hits": 1, "misses": 0}
+
+
+def test_date_window_does_not_change_the_fixture_key(tmp_path):
+    base = 'https://stats.nba.com/stats/{endpoint}'
+    params = {'TeamID': 1610612738, 'Season': '2025-26', 'DateFrom': '01/01/2026'}
+    moved = dict(params, DateFrom='02/01/2026', DateTo='02/07/2026')
+
+    assert fixture_path(str(tmp_path), base, 'teamgamelog', params) == \
+        fixture_path(str(tmp_path), base, 'teamgamelog', moved)
+    assert fixture_path(str(tmp_path), base, 'teamgamelog', params) != \
+        fixture_path(str(tmp_path), base, 'teamgamelog', dict(params, TeamID=1610612747))
+
+
+def test_unrecorded_request_raises_fixture_missing(tmp_path):
+    replayer = Replayer(str(tmp_path))
+    with installed(replayer):
+        with pytest.raises(FixtureMissing):
+            teamgamelog.TeamGameLog(team_id=1610612738, season='2025-26')
+    assert replayer.stats()["misses"] == 1
+
+
+def test_replay_injects_latency_per_endpoint(tmp_path):
+    with installed(Recorder(str(tmp_path), send=fixtures.synthetic_send)):
+        _standings()
+    slept = []
+    replayer = Replayer(str(tmp_path), latency={'leaguestandings': 0.05, '*': 0.5}, sleep=slept.append)
+
+    with installed(replayer):
+        _standings()
+
+    assert slept == [0.05]
+
+
+def test_uninstall_restores_the_network_transport(tmp_path):
+    from nba_api.library.http import NBAHTTP
+    original = NBAHTTP.send_api_request
+    with installed(Replayer(str(tmp_path))):
+        assert NBAHTTP.send_api_request is not original
+    assert NBAHTTP.send_api_request is original
+
+
+def test_install_from_env(tmp_path):
+    assert upstream_replay.install_from_env({}) is None
+    transport = upstream_replay.install_from_env({
+        'NBA_UPSTREAM_MODE': 'replay',
+        'NBA_UPSTREAM_FIXTURES': str(tmp_path),
+        'NBA_UPSTREAM_LATENCY_MS': '20'
+    })
+    try:
+        assert isinstance(transport, Replayer)
+        assert transport.latency == pytest.approx(0.02)
+        assert transport.directory == str(tmp_path)
+    finally:
+        upstream_replay.uninstall()
+    with pytest.raises(ValueError):
+        upstream_replay.install_from_env({'NBA_UPSTREAM_MODE': 'live'})
+    assert not os.listdir(tmp_path)
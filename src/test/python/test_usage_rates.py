@@ -0,0 +1,47 @@
+import fixtures
+import nba_service
+from result_projector import project_result_set
+
+
+def _serve(monkeypatch, player_data, team_data):
+    calls = []
+
+    def fake_fetch(endpoint_cls, **params):
+        calls.append(endpoint_cls.__name__)
+        return player_data if endpoint_cls.__name__ == 'LeagueDashPlayerStats' else team_data
+
+    monkeypatch.setattr(nba_service, '_fetch_upstream', fake_fetch)
+    nba_service.usage_rates_cache.invalidate()
+    return calls
+
+
+def test_league_rates_match_scalar_formula(monkeypatch):
+    player_data, team_data = fixtures.league_player_totals()
+    _serve(monkeypatch, player_data, team_data)
+
+    rates = nba_service._build_league_usage_rates('2025-26')['by_player']
+    teams = {row['team_id']: row for row in project_result_set(team_data, nba_service.LEAGUE_TEAM_TOTALS_SCHEMA)}
+    players = project_result_set(player_data, nba_service.LEAGUE_PLAYER_TOTALS_SCHEMA)
+
+    assert len(rates) == len(players)
+    for player in players:
+        expected = nba_service._calculate_usage_rates(player, teams[player['team_id']])
+        got = rates[player['player_id']]
+        assert {key: got[key] for key in expected} == expected
+        assert got['data_source'] == 'season_totals'
+
+
+def test_single_player_lookup_uses_league_table(monkeypatch):
+    player_data, team_data = fixtures.league_player_totals()
+    calls = _serve(monkeypatch, player_data, team_data)
+    client = nba_service.app.test_client()
+    player_id = player_data['resultSets'][0]['rowSet'][0][0]
+
+    league = client.get('/players/usage-rates?season=2025-26').get_json()
+    first = client.get(f'/players/{player_id}/usage-rates?season=2025-26').get_json()
+    second = client.get(f'/players/{player_id + 1}/usage-rates?season=2025-26').get_json()
+
+    assert league['count'] == len(player_data['resultSets'][0]['rowSet'])
+    assert calls == ['LeagueDashPlayerStats', 'LeagueDashTeamStats']
+    assert first['usg_pct'] == league['players'][0]['usg_pct']
+    assert second['player_id'] == player_id + 1